@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Atomic Writes
+The automated pipeline's outputs (post.json, post pages, the shared stylesheet, blog
+data, indexes, image derivatives) and its caches and checkpoints are written through
+here: to a temp file in the target's directory, then renamed over the target, so
+readers never see a partial file and a crash never leaves one behind
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# mkstemp creates 0600 files; outputs are served or shared, so always readable
+FILE_MODE = 0o644
+
+def atomic_write(path, write, binary=False):
+    """Write through `write(f)` to a temp file and rename it over `path`"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            write(f)
+        os.chmod(tmp_path, FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def atomic_write_text(path, text):
+    """Atomically replace `path` with `text`"""
+    atomic_write(path, lambda f: f.write(text))
+
+def atomic_write_json(path, data, trailing_newline=False, **dump_options):
+    """Atomically replace `path` with `data` as JSON (options go to json.dump)"""
+    def write(f):
+        json.dump(data, f, **dump_options)
+        if trailing_newline:
+            f.write('\n')
+    atomic_write(path, write)
@@ -5,48 +5,220 @@ Uses OAUTH token to directly call Claude Code for complete automation
 """
 
 import os
+import inspect
 import json
 import re
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
 
+from atomic_write import atomic_write_json, atomic_write_text
+from batch_events import JsonlEventWriter, parse_events_arg
+from blog_data_store import BlogDataStore, make_entry
+from blog_search_index import BlogSearchIndex, post_term_scores
+from blog_templates import get_template, template_sources
+from build_manifest import BuildManifest, hash_file, hash_text
+from claude_backends import (DEFAULT_BACKEND, DEFAULT_SDK_MODEL, BackendPool, ClaudeBackendError,
+                             ClaudeBackendTimeout, ClaudeResponseAborted, parse_backend_arg)
+from claude_call_policy import (MAX_TIMEOUT, MIN_TIMEOUT, TIMEOUT_GROWTH, LatencyHistory, PostCheckpoints,
+                                RetryPolicy)
+from claude_response_cache import ClaudeResponseCache
+from image_derivatives import FORMAT_MIME_TYPES, ImageDerivatives, largest, srcset
+from json_extract import extract_json
+from response_repair import (JSONPatchError, ResponseRepairer, apply_json_patch, outline_json, parse_patch,
+                             patch_summary)
+from slug_index import SlugIndex, slugs_similar
+from streaming_json import StreamingJSONScanner
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Processor used by --rebuild-html worker processes (one per worker)
+_pool_processor = None
+
+def _init_pool_worker():
+    """Create the processor a render/refresh worker process reuses for every post"""
+    global _pool_processor
+    _pool_processor = AutomatedClaudeProcessor(verbose=False, use_cache=False, require_token=False)
+
+def _explorer_summary_worker(post_file):
+    """Reduce one post.json to its explorer entry and search terms inside a worker process"""
+    try:
+        return _pool_processor.read_explorer_summary(post_file)
+    except Exception as e:
+        print(f"   ⚠️  Error reading {post_file}: {e}")
+        return None
+
+def _render_post_worker(post_file):
+    """Render one post.json to blog/post-<slug>.html inside a worker process"""
+    render_start = time.perf_counter()
+    try:
+        with open(post_file, 'r', encoding='utf-8') as f:
+            structured_data = json.load(f)
+        html_file = _pool_processor.write_html_blog_post(structured_data)
+        return {
+            'post_json': post_file,
+            'html': html_file,
+            'bytes': html_file.stat().st_size,
+            'seconds': time.perf_counter() - render_start,
+            'error': None
+        }
+    except Exception as e:
+        return {'post_json': post_file, 'html': None, 'bytes': 0,
+                'seconds': time.perf_counter() - render_start, 'error': str(e)}
+
+def parse_repair_args(argv):
+    """Return (stream, local_repair) from --stream / --no-local-repair; exits if they conflict
+
+    Local repair fixes everything the streaming checks look for, so --stream
+    would never stop a response unless local repair is turned off.
+    """
+    stream = '--stream' in argv
+    local_repair = '--no-local-repair' not in argv
+    if stream and local_repair:
+        print("❌ --stream needs --no-local-repair: local repair fixes every issue the streaming checks look for")
+        sys.exit(2)
+    return stream, local_repair
+
 class AutomatedClaudeProcessor:
-    def __init__(self, verbose=True, auto_update=False):
+    def __init__(self, verbose=True, auto_update=False, use_cache=True, incremental=False,
+                 require_token=True, events=None, backend=DEFAULT_BACKEND, stream=False,
+                 local_repair=True, retries=3, journal=None):
         """Initialize the automated processor
         
         Args:
             verbose: Show detailed timing information
             auto_update: Automatically update existing posts without prompting
+            use_cache: Reuse cached Claude responses for identical prompts and resume
+                unfinished posts from their checkpoints (both are written either way)
+            incremental: Skip posts whose raw input and outputs are already up to date
+            require_token: Exit if CLAUDE_CODE_OAUTH_TOKEN is missing (not needed for render-only modes)
+            events: Optional JsonlEventWriter that receives structured progress events
+            backend: How prompts reach Claude - 'cli' (one `claude -p` per call),
+                'cli-stream' (a warm `claude` session per worker) or 'sdk' (anthropic client)
+            stream: Check Claude's response while it streams and stop it as soon as
+                a validation rule (publish date, required sections) is broken
+                (needs local_repair=False, which otherwise fixes these issues)
+            local_repair: Fix mechanical validation issues (publish date, signature
+                image, video sections) without another Claude call
+            retries: Attempts per Claude call; transient failures are retried with
+                jittered exponential backoff (1 disables retries)
+            journal: Optional BatchJournal that records how far each post got
         """
         self.verbose = verbose
         self.auto_update = auto_update
+        self.incremental = incremental
+        if stream and local_repair:
+            # Local repair fixes everything the streaming checks look for, so they'd never stop anything
+            raise ValueError("stream=True needs local_repair=False")
+        self.stream = stream
+        self.repairer = ResponseRepairer(verbose=verbose) if local_repair else None
+        self._template_hash = None
+        self._pipeline_hash = None
+        self._stylesheet_href = None
+        self._critical_css = None
+        self.events = events
+        self.journal = journal
+        self._event_context = threading.local()  # post/iteration of the current worker thread
+        self._post_deadline = threading.local()  # per-post time budget of the current worker thread
+        self._post_backend = threading.local()   # Claude backend checked out by the current worker thread
+        self.claude_timeout = None  # Fixed seconds per Claude call (None: from prompt length and past latencies)
+        self.retry = RetryPolicy(attempts=retries)
+        self.model = os.getenv('ANTHROPIC_MODEL', '')
+        self._cli_version = None
         self.max_iterations = 3  # Maximum iterations for Claude to get it right
         self.start_time = time.time()
         self.content_dir = Path(__file__).parent
         self.raw_input_dir = self.content_dir / "raw-input"
         self.output_dir = self.content_dir / "blog" / "published"
         
+        # Serializes duplicate checks and writes to published/, blog/ and
+        # blog-data.js when several posts are processed concurrently
+        self._write_lock = threading.RLock()
+        
         # Ensure directories exist
         self.raw_input_dir.mkdir(exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # On-disk cache of Claude responses (content/.cache/claude-responses)
+        # (still written with use_cache off, so a resumed batch never repeats a finished call)
+        self.use_cache = use_cache
+        self.response_cache = ClaudeResponseCache(self.content_dir / ".cache" / "claude-responses")
+        
+        # Recent Claude call latencies per backend, used to size call timeouts
+        self.latency = LatencyHistory(self.content_dir / ".cache" / "claude-latency.json")
+        
+        # Extracted data, prompt and post JSON of posts that haven't finished (content/.cache/checkpoints)
+        self.checkpoints = PostCheckpoints(self.content_dir / ".cache" / "checkpoints")
+        
+        # Blog explorer data (content/blog/blog-index.json), compiled into blog-data.js
+        # and the paginated listing shards in assets/data/blog/
+        self.blog_data_file = self.content_dir.parent / "assets" / "js" / "blog-data.js"
+        self.blog_data = BlogDataStore(self.content_dir / "blog" / "blog-index.json", self.blog_data_file,
+                                       self.content_dir.parent / "assets" / "data" / "blog")
+        
+        # Inverted index behind the listing's search box
+        self.search_index_file = self.content_dir.parent / "assets" / "data" / "blog" / "search-index.json"
+        self.search_index = BlogSearchIndex(self.search_index_file)
+        
+        # Resized WebP/AVIF copies of blog images (skipped when Pillow isn't installed)
+        self.image_derivatives = ImageDerivatives(self.content_dir.parent / "assets" / "images" / "blog" / "derivatives")
+        
+        # Index of existing slugs for duplicate detection (content/.cache/slug-index.json)
+        self.slug_index = SlugIndex(self.output_dir, self.blog_data_file,
+                                    self.content_dir / ".cache" / "slug-index.json",
+                                    blog_data_store=self.blog_data)
+        
+        # Content hashes of every built post (raw input -> post.json -> HTML)
+        self.build_manifest = BuildManifest(self.content_dir / "blog" / "build-manifest.json",
+                                            self.content_dir.parent)
+        
         # Check for OAUTH token
         self.oauth_token = os.getenv('CLAUDE_CODE_OAUTH_TOKEN')
-        if not self.oauth_token:
+        self.backend = backend
+        self.backends = BackendPool(backend, env={**os.environ, 'CLAUDE_CODE_OAUTH_TOKEN': self.oauth_token or ''},
+                                    model=self.model)
+        if not require_token:
+            return
+        if backend == 'sdk':
+            try:
+                self.backends.release(self.backends.acquire())
+            except ClaudeBackendError as e:
+                print(f"❌ Cannot use the sdk backend: {e}")
+                sys.exit(1)
+            print(f"🔑 Using the Anthropic API ({self.model or DEFAULT_SDK_MODEL})")
+        elif not self.oauth_token:
             print("❌ CLAUDE_CODE_OAUTH_TOKEN environment variable not set!")
             print("   Please set it with: export CLAUDE_CODE_OAUTH_TOKEN='your-token-here'")
             sys.exit(1)
         else:
             print(f"🔑 OAUTH token found: {self.oauth_token[:20]}..." if len(self.oauth_token) > 20 else "🔑 OAUTH token found (short)")
     
-    def log_time(self, message, start_time=None):
-        """Log a message with timestamp and duration"""
-        if not self.verbose:
+    def emit_event(self, event, **fields):
+        """Send a structured event (tagged with the current post) to the event stream"""
+        if self.events is None:
             return
+        context = {k: v for k, v in vars(self._event_context).items() if v is not None}
+        self.events.emit(event, **{**context, **fields})
+    
+    def record_state(self, state):
+        """Note the current post's progress (calling, validated, saved, ...) in the batch journal"""
+        post = getattr(self._event_context, 'post', None)
+        if self.journal is not None and post:
+            self.journal.record(post, state)
+    
+    def log_time(self, message, start_time=None, step=None):
+        """Log a message with timestamp and duration
+        
+        When `step` is given the duration is also emitted as a 'step' event.
+        """
         current_time = time.time()
+        if step and start_time:
+            self.emit_event('step', step=step, duration=round(current_time - start_time, 4), message=message)
+        if not self.verbose:
+            return current_time
         timestamp = datetime.now().strftime('%H:%M:%S')
         if start_time:
             duration = current_time - start_time
@@ -118,7 +290,6 @@ class AutomatedClaudeProcessor:
                     print(f"📅 Using as-is: {publish_date}")
                 else:
                     print(f"⚠️  Unrecognized date format: {date_str}, using today's date")
-                    publish_date = datetime.now().strftime('%Y-%m-%d')
             else:
                 print("⚠️  No publish date found in assets section")
         
@@ -131,7 +302,8 @@ class AutomatedClaudeProcessor:
             'title': title,
             'main_content': main_content,
             'assets': assets,
-            'publish_date': publish_date or datetime.now().strftime('%Y-%m-%d')
+            'publish_date': publish_date or datetime.now().strftime('%Y-%m-%d'),
+            'publish_date_given': publish_date is not None
         }
     
     def create_processing_prompt(self, extracted_data):
@@ -260,94 +432,276 @@ Please respond with ONLY the JSON structure, no additional text or formatting.""
 
         return prompt
     
-    def call_claude_code(self, prompt):
-        """Call Claude Code programmatically using OAUTH token"""
+    def get_cli_version(self):
+        """Return the Claude CLI version string (queried once per process)"""
+        if self._cli_version is None:
+            try:
+                result = subprocess.run(['claude', '--version'], capture_output=True, text=True, timeout=30)
+                self._cli_version = result.stdout.strip() if result.returncode == 0 else ''
+            except (OSError, subprocess.TimeoutExpired):
+                self._cli_version = ''
+        return self._cli_version
+    
+    def cache_identity(self):
+        """(version, model) that cached responses are keyed on for the active backend"""
+        if self.backend == 'sdk':
+            return 'anthropic-sdk', self.model or DEFAULT_SDK_MODEL
+        return self.get_cli_version(), self.model
+    
+    def get_cached_response(self, prompt):
+        """Look up a previous (response, parsed JSON) pair for this exact prompt"""
+        if not self.use_cache:
+            return None, None
+        key = ClaudeResponseCache.make_key(prompt, *self.cache_identity())
+        entry = self.response_cache.get(key)
+        if not entry or not entry.get('parsed'):
+            return None, None
+        print(f"⚡ Using cached Claude response ({key[:12]})")
+        return entry['response'], entry['parsed']
+    
+    def cache_response(self, prompt, response, parsed):
+        """Store a successfully parsed Claude response for this prompt"""
+        version, model = self.cache_identity()
+        key = ClaudeResponseCache.make_key(prompt, version, model)
         try:
-            api_start = time.time()
-            print("🤖 Calling Claude Code API...")
-            print(f"📝 Prompt length: {len(prompt)} characters")
-            
-            # Use subprocess to call claude CLI with the prompt
-            cmd = ['claude', '-p', prompt]
-            print(f"🚀 Executing command: {' '.join(cmd[:2])} [prompt...]")
-            self.log_time("Claude API call started")
-            
-            result = subprocess.run(cmd, 
-            env={**os.environ, 'CLAUDE_CODE_OAUTH_TOKEN': self.oauth_token},
-            capture_output=True, 
-            text=True, 
-            timeout=120
-            )
-            
-            if result.returncode != 0:
-                print(f"❌ Claude Code call failed (return code: {result.returncode})")
-                print(f"Error output: {result.stderr}")
-                return None
-            
-            response = result.stdout.strip()
-            api_duration = time.time() - api_start
-            print("✅ Claude Code response received")
-            self.log_time(f"Claude API call completed", api_start)
-            print(f"🔍 Response length: {len(response)} characters")
-            
-            if not response:
-                print("⚠️  Response is empty after stripping whitespace")
-                print(f"Raw stdout: '{result.stdout}'")
-                print(f"Raw stderr: '{result.stderr}'")
-                return None
-                
-            return response
-            
-        except subprocess.TimeoutExpired:
-            api_duration = time.time() - api_start
-            print(f"❌ Claude Code call timed out after {api_duration:.1f} seconds")
-            return None
-        except FileNotFoundError:
-            print("❌ Claude CLI not found. Please ensure Claude Code is installed and in PATH")
-            return None
+            self.response_cache.put(key, response, parsed, version, model)
         except Exception as e:
-            print(f"❌ Error calling Claude Code: {e}")
+            print(f"⚠️  Could not write response cache: {e}")
+    
+    def remaining_post_time(self):
+        """Seconds left in the current post's time budget (None if unlimited)"""
+        deadline = getattr(self._post_deadline, 'value', None)
+        if deadline is None:
+            return None
+        return deadline - time.time()
+    
+    def start_post_budget(self, prompt):
+        """Set the current post's automatic time budget (process_file(timeout='auto')) from its prompt"""
+        if not getattr(self._post_deadline, 'auto', False):
+            return
+        budget = self.latency.post_budget(self._post_backend.value.name, len(prompt))
+        self._post_deadline.budget = budget
+        self._post_deadline.value = self._post_deadline.started + budget
+        print(f"⏱️  Time budget for this post: {budget:.0f} seconds")
+    
+    def last_post_budget(self):
+        """Time budget in seconds of the post this worker thread last processed (None if unlimited)"""
+        return getattr(self._post_deadline, 'budget', None)
+    
+    def claude_call_timeout(self, backend_name, prompt):
+        """Seconds allowed for one Claude call with this prompt"""
+        if self.claude_timeout:
+            return self.claude_timeout
+        return self.latency.timeout_for(backend_name, len(prompt))
+    
+    def call_claude_code(self, prompt, on_text=None):
+        """Call Claude Code programmatically using OAUTH token
+        
+        Transient failures (timeouts, dropped sessions, rate limits, server
+        errors, empty responses) are retried with jittered exponential backoff
+        while the post's time budget allows. A call that timed out is retried
+        with a longer timeout.
+        
+        on_text: Optional callback fed the response as it streams; if it returns
+            issues the response is cut short and ClaudeResponseAborted is raised
+        """
+        # The worker's checked-out backend (a warm session keeps this post's repair iterations)
+        backend = getattr(self._post_backend, 'value', None)
+        own_backend = backend is None
+        if own_backend:
+            backend = self.backends.acquire()
+        try:
+            timeout = self.claude_call_timeout(backend.name, prompt)
+            for attempt in range(1, self.retry.attempts + 1):
+                remaining = self.remaining_post_time()
+                call_timeout = timeout if remaining is None else min(timeout, remaining)
+                if call_timeout <= 0:
+                    print("❌ Post time budget exhausted - not calling Claude Code")
+                    return None
+                
+                api_start = time.time()
+                try:
+                    response = self._call_backend(backend, prompt, call_timeout, on_text)
+                    self.latency.record(backend.name, len(prompt), time.time() - api_start)
+                    if response:
+                        return response
+                    error = 'empty response'
+                except ClaudeResponseAborted as e:
+                    self.log_time(f"Claude response stopped after {len(e.partial)} characters", api_start,
+                                  step='claude_call')
+                    raise
+                except ClaudeBackendTimeout:
+                    api_duration = time.time() - api_start
+                    print(f"❌ Claude Code call timed out after {api_duration:.1f} seconds")
+                    # Only a full-length timeout says something about how long this prompt takes
+                    if call_timeout == timeout:
+                        self.latency.record(backend.name, len(prompt), api_duration, timed_out=True)
+                    timeout = min(MAX_TIMEOUT, timeout * TIMEOUT_GROWTH)
+                    error = 'timeout'
+                except ClaudeBackendError as e:
+                    print(f"❌ Claude Code call failed: {e}")
+                    if not e.transient:
+                        return None
+                    error = str(e)
+                except FileNotFoundError:
+                    print("❌ Claude CLI not found. Please ensure Claude Code is installed and in PATH")
+                    return None
+                except Exception as e:
+                    print(f"❌ Error calling Claude Code: {e}")
+                    return None
+                
+                if attempt == self.retry.attempts:
+                    break
+                delay = self.retry.delay(attempt)
+                remaining = self.remaining_post_time()
+                if remaining is not None and remaining - delay < MIN_TIMEOUT:
+                    print("⏰ Not enough of the post's time budget left to retry")
+                    break
+                print(f"🔁 Retrying in {delay:.1f}s (attempt {attempt + 1} of {self.retry.attempts}, "
+                      f"timeout {timeout:.0f}s)...")
+                self.emit_event('claude_retry', attempt=attempt + 1, delay=round(delay, 3), error=error)
+                time.sleep(delay)
             return None
+        finally:
+            if own_backend:
+                self.backends.release(backend)
+    
+    def _call_backend(self, backend, prompt, timeout, on_text):
+        """One Claude call; returns the stripped response ('' when it came back empty)"""
+        api_start = time.time()
+        print("🤖 Calling Claude Code API...")
+        print(f"📝 Prompt length: {len(prompt)} characters")
+        print(f"🚀 Sending prompt via the {backend.name} backend (timeout {timeout:.0f}s)")
+        self.log_time("Claude API call started")
+        
+        raw_response = backend.complete(prompt, timeout, on_text=on_text)
+        
+        response = raw_response.strip()
+        print("✅ Claude Code response received")
+        self.log_time(f"Claude API call completed", api_start, step='claude_call')
+        print(f"🔍 Response length: {len(response)} characters")
+        
+        if not response:
+            print("⚠️  Response is empty after stripping whitespace")
+            print(f"Raw output: '{raw_response}'")
+        return response
     
     def validate_claude_response(self, structured_data, extracted_data):
         """
         Validate that Claude followed all instructions correctly
         Returns: (is_valid: bool, issues: list[str])
         """
+        sections = structured_data.get('content', {}).get('sections', [])
+        issues = self.section_issues(sections, extracted_data, verbose=self.verbose)
+        issues += self.publish_date_issues(structured_data.get('metadata', {}).get('publishDate'),
+                                           extracted_data)
+        return len(issues) == 0, issues
+    
+    def section_issues(self, sections, extracted_data, verbose=False):
+        """Required sections (in-love-and-unity image, videos) missing from `sections`"""
         issues = []
         
         # Check if in-love-and-unity image should be included
         if 'images' in extracted_data['assets'] and extracted_data['assets']['images']:
             images = extracted_data['assets']['images']
-            if self.verbose:
+            if verbose:
                 print(f"   🖼️  Other images found: {images}")
             if 'in-love-and-unity.jpg' in images or 'in-love-and-unity.png' in images:
                 # Check if in-love-and-unity image is included in sections
                 has_unity_image = any(
                     section.get('type') == 'image' and 
                     section.get('content', {}).get('src', '').find('in-love-and-unity') != -1
-                    for section in structured_data.get('content', {}).get('sections', [])
+                    for section in sections
                 )
-                if self.verbose:
+                if verbose:
                     print(f"   ✨ In-love-and-unity image included: {has_unity_image}")
                 if not has_unity_image:
                     issues.append("Missing required 'in-love-and-unity' signature image")
         
         # Check if videos were included when provided
         if 'videos' in extracted_data['assets'] and extracted_data['assets']['videos']:
-            video_sections = [section for section in structured_data.get('content', {}).get('sections', []) 
-                            if section.get('type') == 'video']
+            video_sections = [section for section in sections if section.get('type') == 'video']
             if not video_sections:
                 issues.append("Missing required video sections from provided assets")
         
-        # Check if publish date was used correctly
+        return issues
+    
+    def publish_date_issues(self, actual_date, extracted_data):
+        """Check if publish date was used correctly"""
         expected_date = extracted_data['publish_date']
-        actual_date = structured_data.get('metadata', {}).get('publishDate')
         if actual_date != expected_date:
-            issues.append(f"Incorrect publish date: expected {expected_date}, got {actual_date}")
+            return [f"Incorrect publish date: expected {expected_date}, got {actual_date}"]
+        return []
+    
+    def stream_checker(self, extracted_data):
+        """Return an on_text callback that runs the cheap validation checks mid-stream
         
-        return len(issues) == 0, issues
+        publishDate is checked as soon as its value is complete and the required
+        sections as soon as the sections array closes; the callback returns the
+        issues found so far (an empty list while everything looks fine).
+        """
+        issues = []
+        sections = {}  # index -> the fields section_issues() looks at
+        
+        def on_value(path, value):
+            if path == ('metadata', 'publishDate'):
+                issues.extend(self.publish_date_issues(value, extracted_data))
+            elif len(path) >= 4 and path[:2] == ('content', 'sections') and isinstance(path[2], int):
+                section = sections.setdefault(path[2], {'content': {}})
+                if path[3:] == ('type',):
+                    section['type'] = value
+                elif path[3:] == ('content', 'src'):
+                    section['content']['src'] = value
+        
+        def on_close(path, kind):
+            if path == ('content', 'sections'):
+                issues.extend(self.section_issues([sections[i] for i in sorted(sections)], extracted_data))
+        
+        scanner = StreamingJSONScanner(on_value, on_close)
+        
+        def on_text(chunk):
+            scanner.feed(chunk)
+            return issues
+        
+        return on_text
 
+    def create_restart_prompt(self, prompt, issues, extracted_data):
+        """Re-send the original prompt after a streamed response was stopped early"""
+        issues_text = '\n'.join([f"- {issue}" for issue in issues])
+        
+        return f"""{prompt}
+
+## Previous Attempt Rejected
+A previous answer to this request was stopped because of:
+{issues_text}
+
+Make sure the publish date is exactly {extracted_data['publish_date']} and that every required asset section is included."""
+    
+    def create_patch_prompt(self, structured_data, issues, extracted_data):
+        """Ask Claude for JSON Patch operations fixing only the remaining issues
+        
+        Claude sees the metadata and an outline of the sections instead of the
+        whole post, and answers with the changes rather than a regenerated post.
+        """
+        issues_text = '\n'.join([f"- {issue}" for issue in issues])
+        
+        return f"""Please fix the following issues in a blog post JSON document:
+
+## Issues Found:
+{issues_text}
+
+## Current Document (metadata and section outline; section text is abbreviated):
+{outline_json(structured_data)}
+
+## Available Assets:
+{json.dumps(extracted_data['assets'], indent=2)}
+
+Reply with ONLY a JSON object holding RFC 6902 JSON Patch operations against the full document, for example:
+{{"patch": [{{"op": "replace", "path": "/metadata/publishDate", "value": "{extracted_data['publish_date']}"}},
+           {{"op": "add", "path": "/content/sections/0", "value": {{"type": "video", "content": {{"url": "..."}}, "order": 0}}}}]}}
+
+Section paths use the indexes from the outline (/content/sections/<index>). Change only what the issues require; do not resend unchanged content."""
+    
     def create_iteration_prompt(self, original_response, issues, extracted_data):
         """Create a prompt for Claude to fix identified issues"""
         issues_text = '\n'.join([f"- {issue}" for issue in issues])
@@ -372,28 +726,11 @@ Return only the corrected JSON response."""
 
     def extract_json_from_response(self, response):
         """Extract JSON from Claude's response"""
-        try:
-            # First try to parse the entire response as JSON
-            return json.loads(response)
-        except json.JSONDecodeError:
-            # Try to extract JSON from code blocks or find JSON pattern
-            json_patterns = [
-                r'```json\s*(\{.*?\})\s*```',
-                r'```\s*(\{.*?\})\s*```',
-                r'(\{.*?\})'
-            ]
-            
-            for pattern in json_patterns:
-                match = re.search(pattern, response, re.DOTALL)
-                if match:
-                    try:
-                        return json.loads(match.group(1))
-                    except json.JSONDecodeError:
-                        continue
-            
+        structured_data = extract_json(response)
+        if structured_data is None:
             print("❌ Could not extract valid JSON from Claude's response")
             print("Raw response:", response[:500] + "..." if len(response) > 500 else response)
-            return None
+        return structured_data
     
     def save_structured_post(self, structured_data, base_filename):
         """Save the structured blog post to the appropriate directory"""
@@ -404,12 +741,11 @@ Return only the corrected JSON response."""
             # Create directory name with date prefix
             dir_name = f"{publish_date}_{slug}"
             post_dir = self.output_dir / dir_name
-            post_dir.mkdir(parents=True, exist_ok=True)
             
             # Save post.json
             post_file = post_dir / "post.json"
-            with open(post_file, 'w', encoding='utf-8') as f:
-                json.dump(structured_data, f, indent=2, ensure_ascii=False)
+            atomic_write_json(post_file, structured_data, indent=2, ensure_ascii=False)
+            self.slug_index.add_post_dir(dir_name)
             
             print(f"✅ Blog post JSON saved: {post_file}")
             return post_file
@@ -421,6 +757,28 @@ Return only the corrected JSON response."""
             print(f"❌ Error saving blog post: {e}")
             return None
     
+    def load_template(self, name):
+        """Read a file from content/templates"""
+        with open(TEMPLATES_DIR / name, 'r', encoding='utf-8') as f:
+            return f.read()
+    
+    def publish_blog_post_stylesheet(self):
+        """Write the shared, fingerprinted blog post stylesheet and return its URL from blog/
+        
+        The file name carries a hash of its contents (assets/css/blog-post.<hash>.css)
+        so browsers can cache it indefinitely across every post page.
+        """
+        if self._stylesheet_href is None:
+            css = self.load_template("blog-post.css")
+            fingerprint = hash_text(css)[:10]
+            css_dir = self.content_dir.parent / "assets" / "css"
+            css_file = css_dir / f"blog-post.{fingerprint}.css"
+            with self._write_lock:
+                if hash_file(css_file) != hash_text(css):
+                    atomic_write_text(css_file, css)
+            self._stylesheet_href = f"../assets/css/{css_file.name}"
+        return self._stylesheet_href
+    
     def generate_html_from_json(self, structured_data):
         """Generate beautiful HTML blog post from JSON structure"""
         try:
@@ -428,14 +786,17 @@ Return only the corrected JSON response."""
             content = structured_data['content']
             author = structured_data['author']
             
+            # Shared stylesheet is linked; only above-the-fold rules are inlined
+            stylesheet_href = self.publish_blog_post_stylesheet()
+            if self._critical_css is None:
+                self._critical_css = '\n'.join(f'        {line}' if line else ''
+                                               for line in self.load_template("blog-post-critical.css").splitlines())
+            critical_css = self._critical_css
+            
             # Generate tags HTML
             tags_html = '\n'.join([f'                        <span class="tag">{tag}</span>' 
                                   for tag in metadata['tags']])
             
-            # Check if we need to add a featured video section at the top
-            featured_video_html = ""
-            has_video = False
-            
             # Check if there are video sections in the content (Claude creates these now)
             video_sections = [section for section in content.get('sections', []) 
                             if section.get('type') == 'video' and 
@@ -444,635 +805,35 @@ Return only the corrected JSON response."""
                             not section['content']['url'].startswith('**')]
             
             if video_sections:
-                has_video = True
                 # Find the featured video (should be order: 0 or the first one)
                 featured_video = min(video_sections, key=lambda x: x.get('order', 999))
                 video_url = featured_video['content']['url']
-                
-                # Convert YouTube URL to embed format
-                if 'youtube.com/watch?v=' in video_url:
-                    video_id = video_url.split('watch?v=')[1].split('&')[0]
-                    embed_url = f"https://www.youtube.com/embed/{video_id}"
-                elif 'youtu.be/' in video_url:
-                    video_id = video_url.split('youtu.be/')[1].split('?')[0]
-                    embed_url = f"https://www.youtube.com/embed/{video_id}"
-                else:
-                    embed_url = video_url
-                
-                featured_video_html = f"""
-                <!-- Featured Video -->
-                <section class="featured-video">
-                    <div class="container">
-                        <div class="video-container">
-                            <div class="video-embed">
-                                <iframe src="{embed_url}" frameborder="0" allowfullscreen allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture"></iframe>
-                            </div>
-                        </div>
-                    </div>
-                </section>
-"""
+                featured_video_html = get_template('featured-video.html').render(
+                    embed_url=self._video_embed_url(video_url))
                 
                 # Remove the featured video from content sections to avoid duplication
                 content['sections'] = [section for section in content.get('sections', []) 
                                      if not (section.get('type') == 'video' and 
                                            section.get('content', {}).get('url') == video_url)]
-            
-            # If no video, add a placeholder
-            if not has_video:
-                featured_video_html = f"""
-                <!-- Featured Video Placeholder -->
-                <section class="featured-video">
-                    <div class="container">
-                        <div class="video-container">
-                            <div class="video-placeholder">
-                                <div class="placeholder-content">
-                                    <div class="placeholder-icon">🎬</div>
-                                    <h3 class="placeholder-title">Featured Video Coming Soon</h3>
-                                    <p class="placeholder-text">We're working on creating an engaging video for this post. Check back soon!</p>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </section>
-"""
+            else:
+                # If no video, add a placeholder
+                featured_video_html = get_template('featured-video-placeholder.html').render()
             
             # Generate content sections HTML
-            sections_html = ""
-            for section in content['sections']:
-                if section['type'] == 'intro':
-                    sections_html += f"""
-                <div class="intro-section">
-                    <div class="intro-text">
-                        {section['content']['text']}
-                    </div>
-                </div>
-"""
-                elif section['type'] == 'text':
-                    title = section.get('title', '')
-                    title_html = f'<h2 class="section-title">{title}</h2>' if title else ''
-                    
-                    paragraphs = section['content']['paragraphs']
-                    paragraphs_html = '\n'.join([f'                        <p>{para}</p>' 
-                                               for para in paragraphs])
-                    
-                    sections_html += f"""
-                <div class="content-section">
-                    {title_html}
-                    <div class="content-text">
-{paragraphs_html}
-                    </div>
-                </div>
-"""
-                elif section['type'] == 'quote':
-                    quote_text = section['content']['text']
-                    sections_html += f"""
-                <div class="quote-section">
-                    <div class="quote-text">
-                        "{quote_text}"
-                    </div>
-                </div>
-"""
-                elif section['type'] == 'image':
-                    # Handle both 'src' and 'url' fields for backward compatibility
-                    image_url = section['content'].get('src') or section['content'].get('url')
-                    if image_url:
-                        # Handle different image paths
-                        if not image_url.startswith(('http://', 'https://', '/')):
-                            # Check if it's the in-love-and-unity image (special case)
-                            if 'in-love-and-unity' in image_url:
-                                image_url = f"../assets/images/profiles/in-love-and-unity.png"
-                            else:
-                                image_url = f"../assets/images/blog/{image_url}"
-                        
-                        alt_text = section['content'].get('alt', metadata['title'])
-                        caption = section['content'].get('caption', '')
-                        
-                        sections_html += f"""
-                <div class="image-section">
-                    <div class="content-image">
-                        <img src="{image_url}" alt="{alt_text}" class="section-img">
-                        {f'<p class="image-caption">{caption}</p>' if caption else ''}
-                    </div>
-                </div>
-"""
-                elif section['type'] == 'video':
-                    video_url = section['content'].get('url', '')
-                    video_title = section['content'].get('title', '')
-                    video_description = section['content'].get('description', '')
-                    
-                    # Convert YouTube URL to embed format
-                    if 'youtube.com/watch?v=' in video_url:
-                        video_id = video_url.split('watch?v=')[1].split('&')[0]
-                        embed_url = f"https://www.youtube.com/embed/{video_id}"
-                    elif 'youtu.be/' in video_url:
-                        video_id = video_url.split('youtu.be/')[1].split('?')[0]
-                        embed_url = f"https://www.youtube.com/embed/{video_id}"
-                    else:
-                        embed_url = video_url  # Use as-is for other video platforms
-                    
-                    sections_html += f"""
-                <div class="video-section">
-                    {f'<h3 class="video-title">{video_title}</h3>' if video_title else ''}
-                    <div class="video-embed">
-                        <iframe src="{embed_url}" frameborder="0" allowfullscreen></iframe>
-                    </div>
-                    {f'<p class="video-description">{video_description}</p>' if video_description else ''}
-                </div>
-"""
+            section_parts = [self._render_section(section, metadata) for section in content['sections']]
             
-            # Generate HTML template
-            html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{metadata['title']} | Asabaal Ventures Blog</title>
-    <meta name="description" content="{metadata['excerpt']}">
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Arial', sans-serif;
-            background: linear-gradient(135deg, #0f0f23 0%, #1a1a3e 25%, #2d1b69 50%, #4c1d95 75%, #6b21a8 100%);
-            color: #ffffff;
-            min-height: 100vh;
-            overflow-x: hidden;
-            padding-top: 70px;
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 0 20px;
-        }}
-
-        /* Header Styles */
-        .header {{
-            position: fixed;
-            top: 0;
-            left: 0;
-            right: 0;
-            background: rgba(15, 15, 35, 0.95);
-            backdrop-filter: blur(10px);
-            padding: 20px 0;
-            z-index: 1000;
-            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-        }}
-        
-        .nav {{
-            display: flex;
-            justify-content: flex-end;
-            align-items: center;
-        }}
-        
-        .nav-links {{
-            display: flex;
-            gap: 30px;
-            list-style: none;
-            margin: 0;
-            padding: 0;
-        }}
-        
-        .nav-links a {{
-            color: #e5e7eb;
-            text-decoration: none;
-            transition: color 0.3s ease;
-            font-weight: 500;
-        }}
-        
-        .nav-links a:hover {{
-            color: #fbbf24;
-        }}
-
-        /* Post Header */
-        .post-header {{
-            padding: 100px 0 60px;
-            text-align: center;
-            position: relative;
-            background: radial-gradient(circle at 50% 50%, rgba(251, 191, 36, 0.15) 0%, transparent 70%);
-        }}
-
-
-        .back-link {{
-            position: absolute;
-            top: 120px;
-            left: 20px;
-            color: #06b6d4;
-            text-decoration: none;
-            font-weight: 500;
-            transition: color 0.3s ease;
-        }}
-
-        .back-link:hover {{
-            color: #fbbf24;
-        }}
-
-        .post-title {{
-            font-size: 3.5rem;
-            font-weight: 900;
-            margin-bottom: 25px;
-            background: linear-gradient(45deg, #fbbf24, #f472b6, #8b5cf6);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-            line-height: 1.1;
-            max-width: 900px;
-            margin-left: auto;
-            margin-right: auto;
-        }}
-
-        .post-meta {{
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            gap: 20px;
-            margin-bottom: 40px;
-            flex-wrap: wrap;
-        }}
-
-        .post-date {{
-            background: linear-gradient(45deg, #8b5cf6, #ec4899);
-            color: white;
-            padding: 8px 20px;
-            border-radius: 25px;
-            font-weight: bold;
-            font-size: 0.9rem;
-        }}
-
-        .post-tags {{
-            display: flex;
-            gap: 10px;
-            flex-wrap: wrap;
-        }}
-
-        .tag {{
-            background: rgba(255, 255, 255, 0.1);
-            color: #d1d5db;
-            padding: 6px 15px;
-            border-radius: 20px;
-            font-size: 0.8rem;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-        }}
-
-        .post-subtitle {{
-            font-size: 1.3rem;
-            color: #d1d5db;
-            max-width: 700px;
-            margin: 0 auto;
-            line-height: 1.6;
-        }}
-
-        /* Featured Video */
-        .featured-video {{
-            padding: 60px 0;
-            background: rgba(0, 0, 0, 0.2);
-        }}
-
-        .video-container {{
-            max-width: 900px;
-            margin: 0 auto;
-        }}
-
-        .featured-video .video-embed {{
-            position: relative;
-            width: 100%;
-            height: 0;
-            padding-bottom: 56.25%; /* 16:9 aspect ratio */
-            border-radius: 20px;
-            overflow: hidden;
-            box-shadow: 0 25px 50px -12px rgba(0, 0, 0, 0.5);
-        }}
-
-        .featured-video .video-embed iframe {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-        }}
-
-        /* Video Placeholder */
-        .video-placeholder {{
-            background: linear-gradient(135deg, rgba(15, 15, 35, 0.9), rgba(45, 27, 105, 0.8));
-            border: 2px dashed rgba(251, 191, 36, 0.3);
-            border-radius: 20px;
-            padding: 60px 40px;
-            text-align: center;
-            backdrop-filter: blur(10px);
-        }}
-
-        .placeholder-content {{
-            max-width: 400px;
-            margin: 0 auto;
-        }}
-
-        .placeholder-icon {{
-            font-size: 4rem;
-            margin-bottom: 20px;
-            filter: grayscale(30%);
-        }}
-
-        .placeholder-title {{
-            color: #fbbf24;
-            font-size: 1.8rem;
-            font-weight: 700;
-            margin-bottom: 15px;
-        }}
-
-        .placeholder-text {{
-            color: #d1d5db;
-            font-size: 1.1rem;
-            line-height: 1.6;
-            opacity: 0.8;
-        }}
-
-
-        /* Post Content */
-        .post-content {{
-            padding: 80px 0;
-            background: linear-gradient(rgba(15, 15, 35, 0.85), rgba(45, 27, 105, 0.9)), url('../assets/images/blog/{metadata['coverImage']}');
-            background-size: cover;
-            background-position: center;
-            background-attachment: fixed;
-            position: relative;
-        }}
-
-        .post-content::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: rgba(0, 0, 0, 0.4);
-            pointer-events: none;
-        }}
-
-        .content-wrapper {{
-            max-width: 800px;
-            margin: 0 auto;
-            position: relative;
-            z-index: 2;
-        }}
-
-        .intro-section {{
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-left: 4px solid #fbbf24;
-            padding: 30px;
-            margin-bottom: 60px;
-            border-radius: 10px;
-            font-style: italic;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-        }}
-
-        .intro-text {{
-            font-size: 1.3rem;
-            color: #e5e7eb;
-            line-height: 1.7;
-        }}
-
-        .content-section {{
-            margin-bottom: 60px;
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(10px);
-            padding: 30px;
-            border-radius: 15px;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-        }}
-
-        .section-title {{
-            font-size: 2rem;
-            color: #fbbf24;
-            margin-bottom: 25px;
-            font-weight: 700;
-        }}
-
-        .content-text {{
-            font-size: 1.2rem;
-            line-height: 1.8;
-            color: #e5e7eb;
-            margin-bottom: 30px;
-        }}
-
-        .content-text p {{
-            margin-bottom: 20px;
-        }}
-
-        .quote-section {{
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(15px);
-            border-left: 4px solid #fbbf24;
-            padding: 40px;
-            margin: 40px 0;
-            border-radius: 15px;
-            font-style: italic;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            box-shadow: 0 10px 30px -5px rgba(0, 0, 0, 0.3);
-        }}
-
-        .quote-text {{
-            font-size: 1.4rem;
-            color: #d1d5db;
-            margin-bottom: 15px;
-        }}
-
-        .image-section {{
-            margin: 40px 0;
-        }}
-
-        .content-image {{
-            text-align: center;
-        }}
-
-        .section-img {{
-            max-width: 100%;
-            height: auto;
-            border-radius: 15px;
-            box-shadow: 0 15px 35px -10px rgba(139, 92, 246, 0.3);
-        }}
-
-        /* Special styling for in-love-and-unity image */
-        .section-img[src*="in-love-and-unity"] {{
-            max-width: 300px;
-            margin: 0 auto;
-            display: block;
-        }}
-
-        .image-caption {{
-            text-align: center;
-            color: #9ca3af;
-            font-size: 0.9rem;
-            margin-top: 15px;
-            font-style: italic;
-        }}
-
-        .video-section {{
-            margin: 40px 0;
-            text-align: center;
-        }}
-
-        .video-embed {{
-            position: relative;
-            width: 100%;
-            height: 0;
-            padding-bottom: 56.25%; /* 16:9 aspect ratio */
-            border-radius: 15px;
-            overflow: hidden;
-            box-shadow: 0 15px 35px -10px rgba(139, 92, 246, 0.3);
-        }}
-
-        .video-embed iframe {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-        }}
-
-        .video-title {{
-            color: #fbbf24;
-            font-size: 1.2rem;
-            margin-bottom: 10px;
-            font-weight: 600;
-        }}
-
-        .video-description {{
-            color: #9ca3af;
-            font-size: 0.9rem;
-            margin-top: 15px;
-        }}
-
-        /* Author Section */
-        .author-section {{
-            padding: 60px 0;
-            background: rgba(0, 0, 0, 0.4);
-            text-align: center;
-        }}
-
-        .author-signature {{
-            font-size: 1.1rem;
-            color: #d1d5db;
-            max-width: 600px;
-            margin: 0 auto;
-            line-height: 1.6;
-        }}
-
-        /* Navigation */
-        .post-navigation {{
-            padding: 60px 0;
-            background: rgba(0, 0, 0, 0.4);
-            border-top: 1px solid rgba(255, 255, 255, 0.1);
-        }}
-
-        .nav-content {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            flex-wrap: wrap;
-            gap: 20px;
-        }}
-
-        .nav-button {{
-            background: linear-gradient(45deg, #8b5cf6, #06b6d4);
-            color: white;
-            padding: 12px 25px;
-            border: none;
-            border-radius: 50px;
-            font-weight: bold;
-            text-decoration: none;
-            transition: transform 0.3s ease;
-        }}
-
-        .nav-button:hover {{
-            transform: scale(1.05);
-        }}
-
-        /* Responsive */
-        @media (max-width: 768px) {{
-            .post-title {{ font-size: 2.5rem; }}
-            .back-link {{ position: static; margin-bottom: 20px; display: inline-block; }}
-            .post-meta {{ flex-direction: column; gap: 15px; }}
-            .nav-content {{ flex-direction: column; text-align: center; }}
-            .nav-links {{ gap: 15px; font-size: 0.9rem; }}
-            .post-content {{ background-attachment: scroll; }}
-        }}
-    </style>
-</head>
-<body>
-    <!-- Header -->
-    <header class="header">
-        <div class="container">
-            <nav class="nav">
-                <ul class="nav-links">
-                    <li><a href="../index.html">Home</a></li>
-                    <li><a href="../vision_2054_page.html">Vision 2054</a></li>
-                    <li><a href="../index.html#videos">Videos</a></li>
-                    <li><a href="../unity-remix-contest.html">Contest</a></li>
-                    <li><a href="../blog.html">Blog</a></li>
-                    <li><a href="#contact">Connect</a></li>
-                </ul>
-            </nav>
-        </div>
-    </header>
-
-    <!-- Post Header -->
-    <section class="post-header">
-        <div class="container">
-            <a href="../blog.html" class="back-link">← Back to Blog</a>
-            <h1 class="post-title">{metadata['title']}</h1>
-            <div class="post-meta">
-                <span class="post-date">{metadata['publishDate']}</span>
-                <div class="post-tags">
-{tags_html}
-                </div>
-            </div>
-            <p class="post-subtitle">
-                {metadata['excerpt']}
-            </p>
-        </div>
-    </section>
-{featured_video_html}
-    <!-- Post Content -->
-    <section class="post-content">
-        <div class="container">
-            <div class="content-wrapper">
-{sections_html}
-            </div>
-        </div>
-    </section>
-
-    <!-- Author Section -->
-    <section class="author-section">
-        <div class="container">
-            <div class="author-signature">
-                {author['signature']}
-            </div>
-        </div>
-    </section>
-
-    <!-- Post Navigation -->
-    <section class="post-navigation">
-        <div class="container">
-            <div class="nav-content">
-                <div class="prev-post">
-                    <!-- Previous post link will be added dynamically -->
-                </div>
-                <a href="../blog.html" class="nav-button">All Posts</a>
-                <div class="next-post">
-                    <!-- Next post link will be added dynamically -->
-                </div>
-            </div>
-        </div>
-    </section>
-</body>
-</html>"""
-            
-            return html_content
+            return get_template('page.html').render(
+                title=metadata['title'],
+                excerpt=metadata['excerpt'],
+                critical_css=critical_css,
+                cover_css=self._cover_css(metadata['coverImage']),
+                stylesheet_href=stylesheet_href,
+                publish_date=metadata['publishDate'],
+                tags_html=tags_html,
+                featured_video_html=featured_video_html,
+                sections_html=''.join(section_parts),
+                signature=author['signature']
+            )
             
         except KeyError as e:
             print(f"❌ Missing required field for HTML generation: {e}")
@@ -1081,24 +842,129 @@ Return only the corrected JSON response."""
             print(f"❌ Error generating HTML: {e}")
             return None
     
+    def _image_variants(self, image_url):
+        """Derivatives of a local image referenced from blog/ (None for remote images)"""
+        if not image_url.startswith('../assets/images/'):
+            return None
+        return self.image_derivatives.ensure(self.content_dir.parent / image_url[len('../'):])
+    
+    def _cover_css(self, cover_image):
+        """Background rule for the cover image, one breakpoint per derivative width"""
+        cover_style = get_template('cover-style.html')
+        image_url = f"../assets/images/blog/{cover_image}"
+        variants = self._image_variants(image_url)
+        if not variants:
+            return cover_style.render(background_image=f"url('{image_url}')")
+        
+        url_prefix = "../assets/images/blog/derivatives/"
+        fallback = variants['fallback']
+        rules = []
+        previous_width = None
+        for index, (width, file_name) in enumerate(variants['formats'][fallback]):
+            # Plain url() first; browsers without image-set() type() support ignore the second rule
+            image_set = ', '.join(
+                f"url('{url_prefix}{variants['formats'][format_name][index][1]}') type('{FORMAT_MIME_TYPES[format_name]}')"
+                for format_name in self.image_derivatives.formats + [fallback])
+            rule = (cover_style.render(background_image=f"url('{url_prefix}{file_name}')")
+                    + cover_style.render(background_image=f"image-set({image_set})"))
+            if previous_width is not None:
+                rule = f"\n        @media (min-width: {previous_width + 1}px) {{{rule}\n        }}"
+            rules.append(rule)
+            previous_width = width
+        return ''.join(rules)
+    
+    def _video_embed_url(self, video_url):
+        """Convert YouTube watch/short URLs to embed URLs (others are used as-is)"""
+        if 'youtube.com/watch?v=' in video_url:
+            video_id = video_url.split('watch?v=')[1].split('&')[0]
+            return f"https://www.youtube.com/embed/{video_id}"
+        if 'youtu.be/' in video_url:
+            video_id = video_url.split('youtu.be/')[1].split('?')[0]
+            return f"https://www.youtube.com/embed/{video_id}"
+        return video_url
+    
+    def _render_section(self, section, metadata):
+        """Render one content section through its template ('' for unknown types)"""
+        section_type = section['type']
+        if section_type == 'intro':
+            return get_template('intro.html').render(text=section['content']['text'])
+        
+        if section_type == 'text':
+            title = section.get('title', '')
+            paragraphs_html = '\n'.join([f'                        <p>{para}</p>' 
+                                         for para in section['content']['paragraphs']])
+            return get_template('text.html').render(
+                title_html=f'<h2 class="section-title">{title}</h2>' if title else '',
+                paragraphs_html=paragraphs_html)
+        
+        if section_type == 'quote':
+            return get_template('quote.html').render(quote_text=section['content']['text'])
+        
+        if section_type == 'image':
+            # Handle both 'src' and 'url' fields for backward compatibility
+            image_url = section['content'].get('src') or section['content'].get('url')
+            if not image_url:
+                return ''
+            # Handle different image paths
+            if not image_url.startswith(('http://', 'https://', '/')):
+                # Check if it's the in-love-and-unity image (special case)
+                if 'in-love-and-unity' in image_url:
+                    image_url = "../assets/images/profiles/in-love-and-unity.png"
+                else:
+                    image_url = f"../assets/images/blog/{image_url}"
+            caption = section['content'].get('caption', '')
+            variants = self._image_variants(image_url)
+            if variants:
+                url_prefix = "../assets/images/blog/derivatives/"
+                fallback = variants['fallback']
+                # The in-love-and-unity image is capped at 300px by the stylesheet
+                sizes = "300px" if 'in-love-and-unity' in image_url else "(max-width: 900px) 100vw, 900px"
+                sources_html = '\n'.join(
+                    f'                            <source type="{FORMAT_MIME_TYPES[format_name]}" '
+                    f'srcset="{srcset(variants, format_name, url_prefix)}" sizes="{sizes}">'
+                    for format_name in self.image_derivatives.formats)
+                src_width, src_name = largest(variants, fallback, max_width=960)
+                return get_template('image-responsive.html').render(
+                    sources_html=sources_html,
+                    image_url=url_prefix + src_name,
+                    srcset=srcset(variants, fallback, url_prefix),
+                    sizes=sizes,
+                    width=src_width,
+                    height=round(variants['height'] * src_width / variants['width']),
+                    alt_text=section['content'].get('alt', metadata['title']),
+                    caption_html=f'<p class="image-caption">{caption}</p>' if caption else '')
+            return get_template('image.html').render(
+                image_url=image_url,
+                alt_text=section['content'].get('alt', metadata['title']),
+                caption_html=f'<p class="image-caption">{caption}</p>' if caption else '')
+        
+        if section_type == 'video':
+            video_title = section['content'].get('title', '')
+            video_description = section['content'].get('description', '')
+            return get_template('video.html').render(
+                embed_url=self._video_embed_url(section['content'].get('url', '')),
+                title_html=f'<h3 class="video-title">{video_title}</h3>' if video_title else '',
+                description_html=f'<p class="video-description">{video_description}</p>' if video_description else '')
+        
+        return ''
+    
+    def write_html_blog_post(self, structured_data):
+        """Render the HTML blog post and write it to blog/post-<slug>.html"""
+        html_content = self.generate_html_from_json(structured_data)
+        if not html_content:
+            raise ValueError("HTML generation failed")
+        
+        slug = structured_data['metadata']['slug']
+        
+        # Save HTML file directly in blog directory
+        html_file = self.content_dir.parent / "blog" / f"post-{slug}.html"
+        atomic_write_text(html_file, html_content)
+        return html_file
+    
     def save_html_blog_post(self, structured_data, base_filename):
         """Generate and save the HTML blog post"""
         try:
-            # Generate HTML content
-            html_content = self.generate_html_from_json(structured_data)
-            if not html_content:
-                return None
-            
-            slug = structured_data['metadata']['slug']
-            
-            # Save HTML file directly in blog directory
-            blog_dir = self.content_dir.parent / "blog"
-            blog_dir.mkdir(exist_ok=True)
-            
-            html_file = blog_dir / f"post-{slug}.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
+            html_file = self.write_html_blog_post(structured_data)
             print(f"✅ HTML blog post saved: {html_file}")
             return html_file
             
@@ -1106,65 +972,38 @@ Return only the corrected JSON response."""
             print(f"❌ Error saving HTML blog post: {e}")
             return None
     
+    def blog_data_image_fields(self, structured_data):
+        """srcset fields for the cover image in blog-data.js (empty without derivatives)"""
+        cover_image = structured_data['metadata'].get('coverImage')
+        if not cover_image:
+            return {}
+        variants = self.image_derivatives.ensure(self.content_dir.parent / "assets" / "images" / "blog" / cover_image)
+        if not variants:
+            return {}
+        url_prefix = "assets/images/blog/derivatives/"
+        return {
+            'imageSrcset': srcset(variants, variants['fallback'], url_prefix),
+            'imageSources': [{'type': FORMAT_MIME_TYPES[format_name],
+                              'srcset': srcset(variants, format_name, url_prefix)}
+                             for format_name in self.image_derivatives.formats]
+        }
+    
     def update_blog_data_js(self, structured_data):
-        """Update the blog-data.js file to include the new blog post"""
+        """Upsert the post into the blog data store and regenerate blog-data.js"""
         try:
-            blog_data_file = self.content_dir.parent / "assets" / "js" / "blog-data.js"
-            
-            # Read existing blog data
-            with open(blog_data_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract existing blog posts array
-            import re
-            array_match = re.search(r'const blogPostsData = \[(.*?)\];', content, re.DOTALL)
-            if not array_match:
-                print("❌ Could not find blogPostsData array in blog-data.js")
-                return False
-            
-            # Create new blog post entry
-            metadata = structured_data['metadata']
-            
-            # Check for existing entries with same slug FIRST
-            existing_slug_pattern = f'slug: "{metadata["slug"]}"'
-            if existing_slug_pattern in content:
-                print(f"⚠️  Found existing entry with slug '{metadata['slug']}' in blog-data.js")
-                print("   Skipping blog-data.js update to avoid duplicates")
-                return True  # Return True since this isn't an error, just preventing duplicates
-            
-            # Get the highest existing ID
-            id_matches = re.findall(r'id:\s*(\d+)', content)
-            max_id = max([int(id_match) for id_match in id_matches]) if id_matches else 0
-            new_id = max_id + 1
-            
-            # Format tags for JavaScript
-            tags_js = ', '.join([f'"{tag}"' for tag in metadata['tags']])
-            
-            new_post_entry = f'''    {{
-        id: {new_id},
-        title: "{metadata['title']}",
-        excerpt: "{metadata['excerpt']}",
-        image: "assets/images/blog/{metadata['coverImage']}",
-        date: "{metadata['publishDate']}",
-        slug: "{metadata['slug']}",
-        tags: [{tags_js}],
-        content: {{
-            subtitle: "{metadata['excerpt']}",
-            intro: "{structured_data['content']['sections'][0]['content']['text'] if structured_data['content']['sections'] else ''}",
-            sections: []
-        }}
-    }},'''
+            slug = structured_data['metadata']['slug']
+            entry = make_entry(structured_data, responsive_image=self.blog_data_image_fields(structured_data))
+            created = self.blog_data.upsert(entry)
+            if not created:
+                print(f"🔄 Updating existing entry with slug '{slug}' in blog-data.js")
             
-            # Insert the new post at the beginning of the array (after the opening bracket)
-            array_start = content.find('const blogPostsData = [') + len('const blogPostsData = [')
-            new_content = (content[:array_start] + '\n' + new_post_entry + 
-                         content[array_start:])
+            self.blog_data.save()
+            self.slug_index.add_blog_data_slug(slug)
             
-            # Write back to file
-            with open(blog_data_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            self.search_index.load().add(structured_data, entry)
+            self.search_index.save()
             
-            print(f"✅ Blog data updated: {blog_data_file}")
+            print(f"✅ Blog data updated: {self.blog_data_file}")
             return True
             
         except Exception as e:
@@ -1181,31 +1020,12 @@ Return only the corrected JSON response."""
             if expected_path.exists():
                 return {'exists': True, 'path': expected_path, 'type': 'exact_match'}
             
-            # Check for similar slugs (in case of slight variations)
-            for dir_path in self.output_dir.iterdir():
-                if dir_path.is_dir():
-                    dir_name = dir_path.name
-                    # Extract slug from directory name (format: YYYY-MM-DD_slug)
-                    if '_' in dir_name:
-                        existing_slug = '_'.join(dir_name.split('_')[1:])
-                        # Check for similarity (same words, different formatting)
-                        if self._slugs_similar(slug, existing_slug):
-                            return {'exists': True, 'path': dir_path, 'type': 'similar_match'}
-            
-            # Check in blog-data.js for entries
-            blog_data_file = self.content_dir.parent / "assets" / "js" / "blog-data.js"
-            if blog_data_file.exists():
-                with open(blog_data_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if f'slug: "{slug}"' in content:
-                        return {'exists': True, 'path': blog_data_file, 'type': 'blog_data_exact_match'}
-                    
-                    # Also check for similar slugs in blog data
-                    import re
-                    existing_slugs = re.findall(r'slug: "([^"]+)"', content)
-                    for existing_slug in existing_slugs:
-                        if self._slugs_similar(slug, existing_slug):
-                            return {'exists': True, 'path': blog_data_file, 'type': 'blog_data_similar_match'}
+            # Similar slugs (same words, different formatting) in published/ and blog-data.js
+            match_type, match = self.slug_index.find(slug)
+            if match_type == 'similar_match':
+                return {'exists': True, 'path': self.output_dir / match, 'type': match_type}
+            if match_type:
+                return {'exists': True, 'path': self.blog_data_file, 'type': match_type}
             
             return {'exists': False}
             
@@ -1215,29 +1035,52 @@ Return only the corrected JSON response."""
     
     def _slugs_similar(self, slug1, slug2):
         """Check if two slugs are similar (same core words)"""
-        # Normalize slugs: remove extra hyphens, convert underscores
-        def normalize_slug(slug):
-            return slug.replace('_', '-').replace('--', '-').strip('-').lower()
-        
-        norm_slug1 = normalize_slug(slug1)
-        norm_slug2 = normalize_slug(slug2)
-        
-        # Check if they're the same after normalization
-        if norm_slug1 == norm_slug2:
-            return True
-        
-        # Check if the core words are the same (allowing for minor variations)
-        words1 = set(norm_slug1.split('-'))
-        words2 = set(norm_slug2.split('-'))
-        
-        # If more than 70% of words overlap, consider them similar
-        if len(words1.intersection(words2)) / max(len(words1), len(words2)) > 0.7:
-            return True
+        return slugs_similar(slug1, slug2)
+    
+    def process_file(self, filename_or_path, timeout=None):
+        """Fully automated processing of a raw input file
         
-        return False
+        Args:
+            filename_or_path: Raw-input markdown file (bare names are looked up in raw-input/)
+            timeout: Optional time budget in seconds for the whole post; Claude
+                calls are cut short so the post finishes (or fails) within it.
+                'auto' sizes it from the prompt length and past call latencies
+        """
+        self._post_deadline.started = time.time()
+        self._post_deadline.auto = timeout == 'auto'
+        self._post_deadline.budget = timeout if timeout != 'auto' else None
+        self._post_deadline.value = time.time() + timeout if timeout and timeout != 'auto' else None
+        self._event_context.post = Path(filename_or_path).name
+        self._event_context.iteration = None
+        self.emit_event('post_start')
+        post_start = time.time()
+        result = None
+        error = None
+        backend = None
+        try:
+            backend = self.backends.acquire()
+            backend.start_post()
+            self._post_backend.value = backend
+            result = self._process_file(filename_or_path)
+            return result
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            if result:
+                status = result.get('action') or ('success' if result.get('html') else 'failed')
+            else:
+                status = 'failed'
+            self.emit_event('post_end', status=status, duration=round(time.time() - post_start, 4),
+                            error=error)
+            self._event_context.post = None
+            self._post_deadline.value = None
+            self._post_backend.value = None
+            if backend is not None:
+                self.backends.release(backend)
     
-    def process_file(self, filename_or_path):
-        """Fully automated processing of a raw input file"""
+    def _process_file(self, filename_or_path):
+        """Run the extract -> Claude -> validate -> save -> HTML -> blog-data pipeline"""
         process_start = time.time()
         
         # Handle both relative filenames and absolute/relative paths
@@ -1256,84 +1099,233 @@ Return only the corrected JSON response."""
         self.log_time(f"Starting processing for {file_path.name}")
         print("=" * 60)
         
-        # Step 1: Extract content and assets
-        print("\n📖 Step 1: Extracting content and assets...")
-        step_start = time.time()
-        extracted_data = self.extract_content_and_assets(file_path)
-        self.log_time("Content extraction complete", step_start)
+        # A previous run of this post that didn't finish left its progress behind
+        source_hash = hash_file(file_path)
+        checkpoint = None
+        if self.use_cache:
+            checkpoint = self.checkpoints.get(file_path.name, source_hash, self.pipeline_hash())
+        
+        if checkpoint:
+            print(f"\n♻️  Resuming from checkpoint ({checkpoint['stage']} step done) - skipping extraction and prompt")
+            self.emit_event('checkpoint_resume', stage=checkpoint['stage'])
+            extracted_data = checkpoint['extracted_data']
+            prompt = checkpoint['prompt']
+        else:
+            # Step 1: Extract content and assets
+            print("\n📖 Step 1: Extracting content and assets...")
+            step_start = time.time()
+            extracted_data = self.extract_content_and_assets(file_path)
+            if not extracted_data['publish_date_given']:
+                # Keep the date of the first run, or the prompt (and its hash) would change every day
+                pinned_date = (self.build_manifest.get(file_path.name) or {}).get('publish_date')
+                if pinned_date:
+                    print(f"📅 Using the publish date pinned when the post was first processed: {pinned_date}")
+                    extracted_data['publish_date'] = pinned_date
+            self.log_time("Content extraction complete", step_start, step='extract')
+            
+            # Step 2: Create processing prompt
+            print("\n📝 Step 2: Creating processing prompt...")
+            step_start = time.time()
+            prompt = self.create_processing_prompt(extracted_data)
+            self.log_time("Prompt creation complete", step_start, step='prompt')
         print(f"   Title: {extracted_data['title']}")
         print(f"   Assets: {len(extracted_data.get('assets', {}))}")
         print(f"   Content length: {len(extracted_data['main_content'])} chars")
         
-        # Step 2: Create processing prompt
-        print("\n📝 Step 2: Creating processing prompt...")
-        step_start = time.time()
-        prompt = self.create_processing_prompt(extracted_data)
-        self.log_time("Prompt creation complete", step_start)
+        prompt_hash = hash_text(prompt)
+        resumed_post = checkpoint.get('structured_data') if checkpoint else None
+        # A checkpointed post stopped part-way through publishing, so it is never up to date
+        if self.incremental and not resumed_post:
+            build_action, entry = self.build_manifest.check(
+                file_path.name, source_hash, prompt_hash, self.html_template_hash())
+            if build_action != BuildManifest.PROCESS:
+                # Nothing for Claude to do, so a checkpoint left by an earlier run is never resumed
+                self.checkpoints.clear(file_path.name)
+            if build_action == BuildManifest.UP_TO_DATE:
+                print("\n✅ Up to date - raw input, post.json and HTML unchanged. Skipping.")
+                return {
+                    'action': 'up_to_date',
+                    'json': self.content_dir.parent / entry['post_json'],
+                    'html': self.content_dir.parent / entry['html'],
+                    'blog_data_updated': False
+                }
+            if build_action == BuildManifest.RENDER:
+                print("\n🎨 post.json or HTML template changed - re-rendering HTML only (no Claude call)")
+                with self._write_lock:
+                    return self.rerender_from_manifest(file_path, entry)
+        
+        if not checkpoint:
+            self.save_checkpoint(file_path, source_hash, 'prompt', extracted_data, prompt)
+        self.start_post_budget(prompt)
+        if resumed_post:
+            print("\n♻️  Step 3: Claude already answered - using the checkpointed post JSON")
+            structured_data = resumed_post
+        else:
+            self.record_state('calling')
+            structured_data = self.run_claude_iterations(prompt, extracted_data)
+            if not structured_data:
+                return None
+            self.save_checkpoint(file_path, source_hash, 'claude', extracted_data, prompt, structured_data)
+            self.record_state('validated')
+        
+        # Steps 5-8 touch shared files, so only one post publishes at a time
+        with self._write_lock:
+            result = self.publish_structured_post(structured_data, file_path, process_start,
+                                                  source_hash, prompt_hash)
+        if result:
+            self.checkpoints.clear(file_path.name)
+        return result
+    
+    def pipeline_hash(self):
+        """Hash of the extract and prompt code, so checkpoints from older code aren't reused"""
+        if self._pipeline_hash is None:
+            self._pipeline_hash = hash_text(inspect.getsource(type(self).extract_content_and_assets)
+                                            + inspect.getsource(type(self).create_processing_prompt))
+        return self._pipeline_hash
+    
+    def save_checkpoint(self, file_path, source_hash, stage, extracted_data, prompt, structured_data=None):
+        """Record a post's progress so a rerun after a failure resumes from here"""
+        try:
+            self.checkpoints.put(file_path.name, source_hash=source_hash, pipeline_hash=self.pipeline_hash(),
+                                 stage=stage, extracted_data=extracted_data, prompt=prompt,
+                                 structured_data=structured_data)
+        except OSError as e:
+            print(f"⚠️  Could not write checkpoint: {e}")
+    
+    def run_claude_iterations(self, prompt, extracted_data):
+        """Step 3: call Claude, then validate and repair for up to max_iterations rounds
         
-        # Step 3: Call Claude Code with iteration
+        Returns the post JSON (the last result if issues remain), or None.
+        """
         print("\n🤖 Step 3: Calling Claude Code for processing...")
         print("   ⏳ This may take 30-120 seconds depending on content complexity...")
         step_start = time.time()
         
         structured_data = None
         current_prompt = prompt
+        patch_base = None    # Post JSON the current prompt asks Claude to patch (None for full prompts)
+        patch_failed = False
+        aborted_issues = []  # Everything early-stopped responses got wrong, repeated in each restart
         
         for iteration in range(1, self.max_iterations + 1):
+            self._event_context.iteration = iteration
             if iteration > 1:
                 print(f"\n🔄 Iteration {iteration}: Fixing identified issues...")
             
-            response = self.call_claude_code(current_prompt)
-            if not response:
-                print("❌ Failed to get response from Claude Code")
-                return None
-            
-            # Step 4: Extract JSON from response
-            if iteration == 1:
-                print("\n🔍 Step 4: Extracting JSON from response...")
-            structured_data = self.extract_json_from_response(response)
+            response, parsed = self.get_cached_response(current_prompt)
+            if response:
+                self.emit_event('cache_hit')
+            else:
+                # The last attempt always runs to completion so there is a result to fall back on
+                on_text = None
+                if self.stream and patch_base is None and iteration < self.max_iterations:
+                    on_text = self.stream_checker(extracted_data)
+                try:
+                    response = self.call_claude_code(current_prompt, on_text=on_text)
+                except ClaudeResponseAborted as e:
+                    print(f"✋ Stopped Claude's response early (iteration {iteration}):")
+                    for issue in e.issues:
+                        print(f"   - {issue}")
+                    self.emit_event('stream_abort', issues=e.issues, chars=len(e.partial))
+                    aborted_issues += [issue for issue in e.issues if issue not in aborted_issues]
+                    current_prompt = self.create_restart_prompt(prompt, aborted_issues, extracted_data)
+                    continue
+                if not response:
+                    print("❌ Failed to get response from Claude Code")
+                    if structured_data is None:
+                        return None
+                    # A repair round failing still leaves the previous iteration's post
+                    print("⚠️  Proceeding with the result of the previous iteration.")
+                    break
+                
+                # Step 4: Extract JSON from response
+                if iteration == 1:
+                    print("\n🔍 Step 4: Extracting JSON from response...")
+                parse_start = time.time()
+                parsed = self.extract_json_from_response(response)
+                self.log_time("JSON extraction complete", parse_start, step='json_parse')
+                
+                if not parsed and patch_base is None:
+                    print("❌ Failed to extract valid JSON from response")
+                    if iteration == self.max_iterations:
+                        return None
+                    continue
+                
+                if parsed:
+                    self.cache_response(current_prompt, response, parsed)
             
-            if not structured_data:
-                print("❌ Failed to extract valid JSON from response")
-                if iteration == self.max_iterations:
-                    return None
-                continue
+            if patch_base is None:
+                structured_data = parsed
+            else:
+                # A repair iteration answers with JSON Patch operations, not a whole post
+                try:
+                    operations = parse_patch(parsed)
+                    structured_data = apply_json_patch(patch_base, operations)
+                    print(f"🩹 Applied Claude's patch: {patch_summary(operations)}")
+                    patch_failed = False
+                except JSONPatchError as e:
+                    print(f"⚠️  Could not apply Claude's patch: {e}")
+                    structured_data = patch_base
+                    patch_failed = True
             
             # Step 4.5: Validate response
             if self.verbose:
                 print(f"   🔍 Validating Claude response (iteration {iteration})...")
                 print(f"   📋 Available assets: {extracted_data['assets']}")
+            validate_start = time.time()
             is_valid, issues = self.validate_claude_response(structured_data, extracted_data)
+            self.log_time("Validation complete", validate_start, step='validate')
+            self.emit_event('validation', valid=is_valid, issues=issues)
+            
+            if not is_valid:
+                print(f"⚠️  Validation issues found (iteration {iteration}):")
+                for issue in issues:
+                    print(f"   - {issue}")
+                
+                # Step 4.6: Fix mechanical issues locally (no Claude call)
+                if self.repairer:
+                    repair_start = time.time()
+                    structured_data, fixes = self.repairer.repair(structured_data, extracted_data)
+                    if fixes:
+                        is_valid, issues = self.validate_claude_response(structured_data, extracted_data)
+                        self.log_time(f"Fixed {len(fixes)} issue(s) locally", repair_start, step='local_repair')
+                        self.emit_event('local_repair', fixes=fixes, remaining=issues)
             
             if is_valid:
                 if iteration > 1:
                     print(f"✅ Issues resolved after {iteration} iterations")
                 break
             else:
-                print(f"⚠️  Validation issues found (iteration {iteration}):")
-                for issue in issues:
-                    print(f"   - {issue}")
-                
                 if iteration == self.max_iterations:
                     print(f"⚠️  Max iterations ({self.max_iterations}) reached. Proceeding with current result.")
                     break
                 
-                # Create iteration prompt for next attempt
-                current_prompt = self.create_iteration_prompt(response, issues, extracted_data)
+                # Ask Claude for a patch covering only what is left, unless its last patch didn't apply
+                if patch_failed:
+                    current_prompt = self.create_iteration_prompt(
+                        json.dumps(structured_data, indent=2, ensure_ascii=False), issues, extracted_data)
+                    patch_base = None
+                else:
+                    current_prompt = self.create_patch_prompt(structured_data, issues, extracted_data)
+                    patch_base = structured_data
         
-        self.log_time("Claude Code processing complete", step_start)
+        self._event_context.iteration = None
+        self.log_time("Claude Code processing complete", step_start, step='claude_total')
         
         if not structured_data:
             print("❌ Failed to extract valid JSON from response")
-            return None
-        
+        return structured_data
+    
+    def publish_structured_post(self, structured_data, file_path, process_start,
+                                source_hash=None, prompt_hash=None):
+        """Run the duplicate check, save JSON/HTML and update the blog explorer"""
         # Step 5: Check for existing posts (duplicate detection)
         print("\n🔍 Step 5: Checking for existing posts...")
         step_start = time.time()
         slug = structured_data['metadata']['slug']
         publish_date = structured_data['metadata']['publishDate']
         existing_check = self.check_existing_post(slug, publish_date)
-        self.log_time("Duplicate check complete", step_start)
+        self.log_time("Duplicate check complete", step_start, step='duplicate_check')
         
         if existing_check['exists']:
             print(f"📝 Found existing post: {existing_check['type']}")
@@ -1366,27 +1358,35 @@ Return only the corrected JSON response."""
         step_start = time.time()
         base_filename = file_path.stem
         post_file = self.save_structured_post(structured_data, base_filename)
-        self.log_time("JSON save complete", step_start)
+        self.log_time("JSON save complete", step_start, step='save')
         
         if not post_file:
             print("❌ Failed to save JSON structure")
             return None
+        self.record_state('saved')
         
         # Step 7: Generate and save HTML blog post
         print("\n🎨 Step 7: Generating beautiful HTML blog post...")
         step_start = time.time()
         html_file = self.save_html_blog_post(structured_data, base_filename)
-        self.log_time("HTML generation complete", step_start)
+        self.log_time("HTML generation complete", step_start, step='html')
         
         if not html_file:
             print("⚠️  JSON saved but HTML generation failed")
             return {'json': post_file, 'html': None}
         
+        self.build_manifest.record(file_path.name, source_hash, prompt_hash,
+                                   post_file, html_file, self.html_template_hash(),
+                                   publish_date=structured_data['metadata']['publishDate'])
+        self.record_state('rendered')
+        
         # Step 8: Update blog explorer data
         print("\n📋 Step 8: Adding post to blog explorer...")
         step_start = time.time()
         blog_data_updated = self.update_blog_data_js(structured_data)
-        self.log_time("Blog explorer update complete", step_start)
+        self.log_time("Blog explorer update complete", step_start, step='blog_data')
+        if blog_data_updated:
+            self.record_state('indexed')
         
         print("\n" + "=" * 60)
         total_time = time.time() - process_start
@@ -1403,99 +1403,160 @@ Return only the corrected JSON response."""
             'html': html_file, 
             'blog_data_updated': blog_data_updated
         }
+    
+    def html_template_hash(self):
+        """Hash of the HTML generator, so template edits invalidate rendered pages"""
+        if self._template_hash is None:
+            template_source = (inspect.getsource(type(self).generate_html_from_json)
+                               + inspect.getsource(type(self)._render_section)
+                               + inspect.getsource(type(self)._cover_css)
+                               + template_sources())
+            for name in ("blog-post.css", "blog-post-critical.css"):
+                template_source += self.load_template(name)
+            # Pages change when image derivatives become available (or a new encoder does)
+            template_source += repr((self.image_derivatives.enabled, self.image_derivatives.formats))
+            self._template_hash = hash_text(template_source)
+        return self._template_hash
+    
+    def rerender_from_manifest(self, file_path, entry):
+        """Re-render a post's HTML from its existing post.json without calling Claude"""
+        post_file = self.content_dir.parent / entry['post_json']
+        try:
+            with open(post_file, 'r', encoding='utf-8') as f:
+                structured_data = json.load(f)
+        except Exception as e:
+            print(f"❌ Error reading {post_file}: {e}")
+            return None
         
-        return None
+        step_start = time.time()
+        html_file = self.save_html_blog_post(structured_data, file_path.stem)
+        self.log_time("HTML re-render complete", step_start, step='html')
+        if not html_file:
+            return {'json': post_file, 'html': None}
+        
+        self.build_manifest.record(file_path.name, post_json=post_file, html=html_file,
+                                   template_hash=self.html_template_hash())
+        self.record_state('rendered')
+        return {'action': 'rendered', 'json': post_file, 'html': html_file, 'blog_data_updated': False}
     
-    def refresh_blog_explorer(self):
-        """Rebuild the entire blog-data.js from all published posts"""
+    def rebuild_all_html(self, jobs=None):
+        """Re-render every blog/post-*.html from the existing post.json files
+
+        Render-only: no Claude calls and no OAuth token needed. Pages are
+        rendered in parallel worker processes.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        print("🎨 Rebuilding HTML for all published posts...")
+        rebuild_start = time.time()
+        post_files = sorted(self.output_dir.glob("*/post.json"))
+        if not post_files:
+            print("❌ No published posts found!")
+            return False
+        
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_pool_worker) as executor:
+            results = list(executor.map(_render_post_worker, post_files))
+        
+        # Keep the build manifest in step with the re-rendered pages
+        post_json_sources = {}
+        for source_name, entry in self.build_manifest.entries.items():
+            post_json_sources.setdefault(entry.get('post_json'), []).append(source_name)
+        
+        failed = 0
+        for result in results:
+            post_dir = result['post_json'].parent.name
+            if result['error']:
+                failed += 1
+                print(f"   ❌ {post_dir}: {result['error']}")
+                continue
+            print(f"   ✅ {result['html'].name} ({result['seconds']*1000:.1f} ms, {result['bytes']/1024:.1f} KB)")
+            for source_name in post_json_sources.get(self.build_manifest.relative_path(result['post_json']), []):
+                self.build_manifest.record(source_name, post_json=result['post_json'], html=result['html'],
+                                           template_hash=self.html_template_hash())
+        
+        rendered = [r for r in results if not r['error']]
+        total_time = time.time() - rebuild_start
+        if rendered:
+            render_times = [r['seconds'] for r in rendered]
+            print(f"\n⏱️  Rendered {len(rendered)} pages in {total_time:.2f}s "
+                  f"(avg {sum(render_times)/len(render_times)*1000:.1f} ms/page, "
+                  f"slowest {max(render_times)*1000:.1f} ms)")
+            
+            # Bytes per page view: the shared stylesheet is only downloaded once
+            stylesheet_file = self.content_dir.parent / "blog" / self.publish_blog_post_stylesheet()
+            css_kb = stylesheet_file.resolve().stat().st_size / 1024
+            page_kb = sum(r['bytes'] for r in rendered) / len(rendered) / 1024
+            print(f"📦 Shared stylesheet: {stylesheet_file.name} ({css_kb:.1f} KB, cached after first page view)")
+            print(f"📦 Per page view: {page_kb + css_kb:.1f} KB first page, {page_kb:.1f} KB after "
+                  f"(vs ~{page_kb + css_kb:.1f} KB every page with fully inlined CSS)")
+        if failed:
+            print(f"❌ {failed} pages failed to render")
+        return failed == 0
+    
+    def read_explorer_summary(self, post_file):
+        """Parse one post.json and keep only what the explorer needs
+        
+        Returns the blog-data entry (metadata plus a 200-character intro) and the
+        post's search term scores; the full post body is dropped on return.
+        """
+        with open(post_file, 'r', encoding='utf-8') as f:
+            post_data = json.load(f)
+        return {
+            'entry': make_entry(post_data, responsive_image=self.blog_data_image_fields(post_data)),
+            'scores': post_term_scores(post_data)
+        }
+    
+    def refresh_blog_explorer(self, jobs=None):
+        """Rebuild the entire blog-data.js from all published posts
+        
+        post.json files are parsed in a process pool and reduced to their explorer
+        entry right away, so memory use doesn't grow with the size of post bodies.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        refresh_start = time.time()
         try:
             print("🔄 Refreshing blog explorer from all published posts...")
             
             # Find all published post directories
-            published_posts = []
+            post_files = []
             if self.output_dir.exists():
-                for post_dir in self.output_dir.iterdir():
-                    if post_dir.is_dir() and (post_dir / "post.json").exists():
-                        try:
-                            with open(post_dir / "post.json", 'r', encoding='utf-8') as f:
-                                post_data = json.loads(f.read())
-                                published_posts.append(post_data)
-                                print(f"   📄 Found: {post_data['metadata']['title']}")
-                        except Exception as e:
-                            print(f"   ⚠️  Error reading {post_dir}/post.json: {e}")
+                post_files = sorted(post_dir / "post.json" for post_dir in self.output_dir.iterdir()
+                                    if post_dir.is_dir() and (post_dir / "post.json").exists())
+            
+            jobs = jobs or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_pool_worker) as executor:
+                summaries = [summary for summary in executor.map(_explorer_summary_worker, post_files, chunksize=8)
+                             if summary]
+            for summary in summaries:
+                print(f"   📄 Found: {summary['entry']['title']}")
             
-            if not published_posts:
+            if not summaries:
                 print("❌ No published posts found!")
                 return False
             
-            # Sort posts by date (newest first)
-            published_posts.sort(key=lambda x: x['metadata']['publishDate'], reverse=True)
+            # Sort posts by date (newest first); ids follow that order
+            summaries.sort(key=lambda summary: summary['entry']['date'], reverse=True)
+            for i, summary in enumerate(summaries, 1):
+                summary['entry']['id'] = i
             
-            # Generate blog data entries
-            blog_entries = []
-            for i, post_data in enumerate(published_posts, 1):
-                metadata = post_data['metadata']
-                content = post_data.get('content', {})
-                
-                # Get first section intro or first paragraph
-                intro = ""
-                if 'sections' in content and content['sections']:
-                    first_section = content['sections'][0]
-                    if first_section.get('type') == 'intro':
-                        intro = first_section['content']['text']
-                    elif first_section.get('type') == 'text' and 'paragraphs' in first_section.get('content', {}):
-                        intro = first_section['content']['paragraphs'][0]
-                
-                # Format tags for JavaScript
-                tags_js = ', '.join([f'"{tag}"' for tag in metadata['tags']])
-                
-                # Escape quotes and newlines for JavaScript
-                def js_escape(text):
-                    if not text:
-                        return ""
-                    return text.replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
-                
-                title_escaped = js_escape(metadata['title'])
-                excerpt_escaped = js_escape(metadata['excerpt'])
-                intro_escaped = js_escape(intro[:200] + ('...' if len(intro) > 200 else ''))
-                
-                entry = f'''    {{
-        id: {i},
-        title: "{title_escaped}",
-        excerpt: "{excerpt_escaped}",
-        image: "assets/images/blog/{metadata['coverImage']}",
-        date: "{metadata['publishDate']}",
-        slug: "{metadata['slug']}",
-        tags: [{tags_js}],
-        content: {{
-            subtitle: "{excerpt_escaped}",
-            intro: "{intro_escaped}",
-            sections: []
-        }}
-    }}'''
-                blog_entries.append(entry)
-            
-            # Create the complete blog-data.js content
-            entries_joined = ',\n'.join(blog_entries)
-            blog_data_content = f'''// Blog Posts Data Structure
-// This file contains blog posts data for the multisensory blog experience
-// Updated automatically by the Claude Blog Processor
-
-const blogPostsData = [
-{entries_joined}
-];
-
-// Export for use in other files
-if (typeof module !== 'undefined' && module.exports) {{
-    module.exports = blogPostsData;
-}}'''
+            # Rebuild the blog data store and stream out blog-data.js
+            self.blog_data.replace_all([summary['entry'] for summary in summaries])
+            self.blog_data.save()
+            self.slug_index.rebuild()
             
-            # Write the new blog-data.js file
-            blog_data_file = self.content_dir.parent / "assets" / "js" / "blog-data.js"
-            with open(blog_data_file, 'w', encoding='utf-8') as f:
-                f.write(blog_data_content)
+            # Rebuild the search index over the full text of every post
+            self.search_index = BlogSearchIndex(self.search_index_file)
+            for summary in summaries:
+                self.search_index.add_scores(summary['entry'], summary['scores'])
+            self.search_index.save()
+            print(f"🔍 Search index: {len(self.search_index.postings)} terms, "
+                  f"{self.search_index_file.stat().st_size // 1024} KB")
             
-            print(f"✅ Blog explorer refreshed with {len(published_posts)} posts!")
+            print(f"✅ Blog explorer refreshed with {len(summaries)} posts!")
+            elapsed = time.time() - refresh_start
+            self.emit_event('step', step='refresh', duration=round(elapsed, 4), posts=len(summaries))
+            print(f"⏱️  Refresh took {elapsed * 1000:.0f} ms ({jobs} worker processes)")
             return True
             
         except Exception as e:
@@ -1509,8 +1570,10 @@ def main():
     
     if len(sys.argv) < 2:
         print("Usage:")
-        print("  python automated_claude_processor.py <path-to-file.md> [--auto-update]")
-        print("  python automated_claude_processor.py --refresh-blog-explorer")
+        print("  python automated_claude_processor.py <path-to-file.md> [--auto-update] [--no-cache] [--incremental]"
+              " [--backend cli|cli-stream|sdk] [--stream] [--no-local-repair]")
+        print("  python automated_claude_processor.py --refresh-blog-explorer [--jobs N]")
+        print("  python automated_claude_processor.py --rebuild-html [--jobs N]")
         print("\nExamples:")
         print("  python automated_claude_processor.py why.md                    # File in raw-input/")
         print("  python automated_claude_processor.py raw-input/why.md         # Relative path")
@@ -1520,23 +1583,57 @@ def main():
         print("\nFlags:")
         print("  --auto-update           Automatically update existing posts without prompting")
         print("  --refresh-blog-explorer Rebuild blog-data.js from all published posts")
+        print("  --rebuild-html          Re-render all blog/post-*.html from post.json (no Claude)")
+        print("  --no-cache              Always call Claude, ignoring cached responses")
+        print("  --incremental           Skip the post if its raw input and outputs are up to date")
+        print("  --events FILE           Append JSON-lines progress events (per-step timings) to FILE")
+        print("  --stream                Check Claude's response while it streams; stop and re-prompt early")
+        print("                          when the publish date or required sections are wrong")
+        print("                          (requires --no-local-repair, which otherwise fixes these issues locally)")
+        print("  --no-local-repair       Send every validation issue back to Claude instead of fixing")
+        print("                          the publish date / signature image / video sections locally")
+        print("  --backend NAME          cli (default, claude -p per call), cli-stream (warm claude session)")
+        print("                          or sdk (Anthropic API, needs ANTHROPIC_API_KEY)")
         print("\nMake sure CLAUDE_CODE_OAUTH_TOKEN environment variable is set!")
         return
     
     # Check for special modes
     if '--refresh-blog-explorer' in sys.argv:
-        processor = AutomatedClaudeProcessor(verbose=True, auto_update=False)
-        success = processor.refresh_blog_explorer()
+        processor = AutomatedClaudeProcessor(verbose=True, auto_update=False, use_cache=False,
+                                             require_token=False)
+        from batch_runner import parse_jobs_arg
+        success = processor.refresh_blog_explorer(jobs=parse_jobs_arg(sys.argv, default=os.cpu_count()))
         if success:
             print("\n✅ Blog explorer refresh complete!")
         else:
             print("\n❌ Blog explorer refresh failed!")
         return
     
+    if '--rebuild-html' in sys.argv:
+        from batch_runner import parse_jobs_arg
+        processor = AutomatedClaudeProcessor(verbose=True, use_cache=False, require_token=False)
+        success = processor.rebuild_all_html(jobs=parse_jobs_arg(sys.argv, default=os.cpu_count()))
+        if success:
+            print("\n✅ HTML rebuild complete!")
+        else:
+            print("\n❌ HTML rebuild had errors!")
+        return
+    
     # Check for auto-update flag
     auto_update = '--auto-update' in sys.argv
+    use_cache = '--no-cache' not in sys.argv
+    
+    incremental = '--incremental' in sys.argv
+    
+    stream, local_repair = parse_repair_args(sys.argv)
+    
+    events_path = parse_events_arg(sys.argv)
+    events = JsonlEventWriter(events_path) if events_path else None
     
-    processor = AutomatedClaudeProcessor(verbose=True, auto_update=auto_update)
+    processor = AutomatedClaudeProcessor(verbose=True, auto_update=auto_update, use_cache=use_cache,
+                                         incremental=incremental, events=events,
+                                         backend=parse_backend_arg(sys.argv), stream=stream,
+                                         local_repair=local_repair)
     filename = sys.argv[1]
     
     result = processor.process_file(filename)
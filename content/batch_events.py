@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Batch Event Stream
+Writes structured JSON-lines events (post start/end, per-step timings) from blog processing runs
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+class JsonlEventWriter:
+    def __init__(self, path):
+        """Open an event stream
+
+        Args:
+            path: File to append events to. Every event is written with a
+                single append so several processes can share one file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def emit(self, event, **fields):
+        """Write one event as a JSON line"""
+        record = {
+            'ts': round(time.time(), 3),
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'event': event,
+            'pid': os.getpid()
+        }
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            if self._fd is not None:
+                os.write(self._fd, line.encode('utf-8'))
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+def parse_events_arg(argv):
+    """Return the path given by `--events PATH` / `--events=PATH`, or None"""
+    for i, arg in enumerate(argv):
+        if arg == '--events' and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith('--events='):
+            return arg.split('=', 1)[1]
+    return None
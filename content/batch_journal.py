@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Batch Journal
+Append-only record of where every post in a batch run got to, so an interrupted run
+(Ctrl+C, crash, reboot) can be resumed without repeating finished work
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Progress a post makes through the pipeline, in order
+STATES = ('queued', 'calling', 'validated', 'saved', 'rendered', 'indexed')
+# States after which a resumed run leaves the post alone ('done' is written by the batch
+# runner for posts that finished without reaching 'indexed', e.g. up to date or skipped)
+FINISHED_STATES = frozenset(('indexed', 'done'))
+
+class BatchJournal:
+    def __init__(self, path):
+        """Open a journal
+
+        Args:
+            path: JSON-lines file holding the current (or last) batch run. Every
+                record is appended and fsynced, so a crash loses at most the
+                line being written.
+        """
+        self.path = Path(path)
+        self.run = None
+        self._lock = threading.Lock()
+        self._fd = None
+
+    def _open(self, truncate=False):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (os.O_TRUNC if truncate else 0)
+        self._fd = os.open(self.path, flags, 0o644)
+
+    def _write(self, record):
+        line = json.dumps({'ts': round(time.time(), 3), **record}, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._fd is not None:
+                os.write(self._fd, line.encode('utf-8'))
+                os.fsync(self._fd)
+
+    def load(self):
+        """(run_start record, {post: last state}) for the journaled run, or (None, {})"""
+        run = None
+        states = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # line cut short by a crash
+                    if record.get('event') == 'run_start':
+                        run = record
+                        states = {post: 'queued' for post in record.get('posts', [])}
+                    elif run and record.get('post') in states and record.get('state'):
+                        states[record['post']] = record['state']
+        except FileNotFoundError:
+            pass
+        return run, states
+
+    def start(self, posts):
+        """Begin a new run over `posts`, replacing the previous run's journal"""
+        self.run = uuid.uuid4().hex[:12]
+        self._open(truncate=True)
+        self._write({'event': 'run_start', 'run': self.run, 'posts': list(posts)})
+
+    def resume(self):
+        """Continue the journaled run; returns its unfinished posts in order, or None if there is no run"""
+        run, states = self.load()
+        if run is None:
+            return None
+        self.run = run['run']
+        self._open()
+        self._write({'event': 'run_resume', 'run': self.run})
+        return [post for post in run['posts'] if states[post] not in FINISHED_STATES]
+
+    def record(self, post, state, **fields):
+        """Note that `post` reached `state`"""
+        self._write({'run': self.run, 'post': post, 'state': state, **fields})
+
+    def finish(self):
+        self._write({'event': 'run_end', 'run': self.run})
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
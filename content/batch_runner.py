@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Batch Runner - Shared worker pool for the batch blog processors
+Runs AutomatedClaudeProcessor.process_file across a bounded pool of threads
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from automated_claude_processor import AutomatedClaudeProcessor, parse_repair_args
+from batch_events import JsonlEventWriter, parse_events_arg
+from batch_journal import BatchJournal
+from claude_backends import parse_backend_arg
+
+# Progress of the current (or last) batch run, read back by --resume
+JOURNAL_FILE = Path(__file__).parent / ".cache" / "batch-journal.jsonl"
+
+# All raw-input posts processed by the batch scripts
+POSTS_TO_PROCESS = [
+    "asabaal-ventures.md",
+    "by-my-hand.md",
+    "charting-the-course-for-a-more-fulfilling-future.md",
+    "collaborative-business-models-and-ethical-advertising.md",
+    "ethical-advocacy-and-the-future-of-education.md",
+    "free-as-a-bird.md",
+    "human-creativity-with-ai-and-ethical-social-platforms.md",
+    "keep-it-simple.md",
+    "logical-fallacies.md",
+    "microaggression.md",
+    "more-than-me.md",
+    "no.md",
+    "omniscient.md",
+    "power-of-pain.md",
+    "probably-right.md",
+    "respect-the-fundamental-human-right.md",
+    "send-that.md",
+    "soundclash.md",
+    "special.md",
+    "the-future-of-work-and-personal-growth.md",
+    "the-unity-of-truth.md",
+    "unveiling-the-future-of-asabaal-ventures.md",
+    "why.md",
+    "your-nature.md"
+]
+
+def parse_jobs_arg(argv, default=1):
+    """Read the worker count from `--jobs N` / `--jobs=N` (or `-j N`)"""
+    for i, arg in enumerate(argv):
+        value = None
+        if arg in ('--jobs', '-j') and i + 1 < len(argv):
+            value = argv[i + 1]
+        elif arg.startswith('--jobs='):
+            value = arg.split('=', 1)[1]
+        if value is not None:
+            try:
+                return max(1, int(value))
+            except ValueError:
+                print(f"⚠️  Invalid --jobs value '{value}', using {default}")
+                return default
+    return default
+
+def parse_timeout_arg(argv, default=None):
+    """Read the per-post time budget in seconds from `--timeout N` / `--timeout=N`
+
+    `--timeout auto` sizes each post's budget from its prompt length and past
+    Claude call latencies.
+    """
+    for i, arg in enumerate(argv):
+        value = None
+        if arg == '--timeout' and i + 1 < len(argv):
+            value = argv[i + 1]
+        elif arg.startswith('--timeout='):
+            value = arg.split('=', 1)[1]
+        if value is not None:
+            if value == 'auto':
+                return value
+            try:
+                return float(value) if float(value) > 0 else None
+            except ValueError:
+                print(f"⚠️  Invalid --timeout value '{value}', using {default}")
+                return default
+    return default
+
+def open_journal(argv, posts):
+    """Start a journaled batch run over `posts`; with --resume, continue the last run instead
+
+    Returns (journal, posts to process).
+    """
+    journal = BatchJournal(JOURNAL_FILE)
+    if '--resume' in argv:
+        remaining = journal.resume()
+        if remaining is not None:
+            print(f"♻️  Resuming the last batch run: {len(remaining)} posts left")
+            return journal, remaining
+        print("⚠️  No batch journal found - starting a new run")
+    journal.start(posts)
+    return journal, posts
+
+def make_batch_processor(argv, posts=POSTS_TO_PROCESS):
+    """Build the one warm AutomatedClaudeProcessor a batch script runs every post on
+
+    Reads --backend, --events, --resume, --no-cache, --force, --stream and
+    --no-local-repair from `argv`. Returns (processor, posts to process).
+    """
+    stream, local_repair = parse_repair_args(argv)
+
+    # Check for OAUTH token (the sdk backend uses ANTHROPIC_API_KEY instead)
+    backend = parse_backend_arg(argv)
+    if backend != 'sdk' and not os.getenv('CLAUDE_CODE_OAUTH_TOKEN'):
+        print("❌ CLAUDE_CODE_OAUTH_TOKEN environment variable not set!")
+        print("   Please set it with: export CLAUDE_CODE_OAUTH_TOKEN='your-token-here'")
+        sys.exit(1)
+
+    # Structured JSON-lines progress events (--events FILE)
+    events_path = parse_events_arg(argv)
+    events = JsonlEventWriter(events_path) if events_path else None
+
+    # Every post's progress goes to a journal that --resume picks up from
+    journal, posts_to_process = open_journal(argv, posts)
+
+    # Only changed posts are sent to Claude unless --force is given
+    # (a resumed run needs the checkpoints and cached responses of the interrupted one)
+    processor = AutomatedClaudeProcessor(verbose=True, auto_update=True,
+                                         use_cache='--no-cache' not in argv or '--resume' in argv,
+                                         incremental='--force' not in argv,
+                                         events=events, backend=backend,
+                                         stream=stream, local_repair=local_repair,
+                                         journal=journal)
+    return processor, posts_to_process
+
+def _run_one(processor, post, timeout=None):
+    """Process a single post and return a result record
+
+    Exceptions are contained here so one bad post never stops the batch.
+    """
+    post_start = time.time()
+    record = {'post': post, 'status': 'failed', 'result': None, 'error': None}
+    try:
+        result = processor.process_file(post, timeout=timeout)
+        record['result'] = result
+        if result and result.get('action') == 'up_to_date':
+            record['status'] = 'up_to_date'
+        elif result and result.get('html'):
+            record['status'] = 'success'
+        elif result and result.get('action') == 'skipped':
+            record['status'] = 'skipped'
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['duration'] = time.time() - post_start
+    budget = processor.last_post_budget()
+    if record['status'] == 'failed' and budget and record['duration'] >= budget:
+        record['status'] = 'timeout'
+    return record
+
+def run_batch(processor, posts, jobs=1, timeout=None):
+    """Run process_file for every post using up to `jobs` concurrent workers
+
+    All posts share one warm processor (token check, directories, caches and
+    templates are set up once). Claude calls overlap across workers; the
+    processor serializes its own writes to published/, blog/ and blog-data.js.
+    `timeout` is a per-post time budget in seconds (or 'auto'). Returns one result record
+    per post that ran, in the original order (Ctrl+C stops the batch early).
+    The processor's journal is closed when the batch ends, however it ends.
+    """
+    try:
+        return _run_posts(processor, posts, jobs, timeout)
+    finally:
+        if processor.journal is not None:
+            processor.journal.close()
+
+def _run_posts(processor, posts, jobs, timeout):
+    records = {}
+    print_lock = threading.Lock()
+    batch_start = time.time()
+    processor.emit_event('batch_start', posts=len(posts), jobs=jobs)
+
+    def report(record):
+        with print_lock:
+            icon = {'success': '✅', 'skipped': '⏭️ ', 'up_to_date': '💤', 'timeout': '⏰'}.get(record['status'], '❌')
+            print(f"\n{icon} [{len(records)}/{len(posts)}] {record['post']}: "
+                  f"{record['status'].upper()} (took {record['duration']:.1f} seconds)")
+            if record['error']:
+                print(f"   🚨 Error: {record['error']}")
+            if processor.journal is not None:
+                # Successful posts already recorded 'indexed' (or 'rendered' when the index update failed)
+                state = 'done' if record['status'] in ('success', 'skipped', 'up_to_date') else record['status']
+                processor.journal.record(record['post'], state, duration=round(record['duration'], 3))
+            remaining = len(posts) - len(records)
+            if remaining:
+                elapsed = time.time() - batch_start
+                eta = elapsed / len(records) * remaining
+                print(f"   📈 Progress: {len(records)}/{len(posts)} | "
+                      f"🔮 Estimated time remaining: {eta/60:.1f} minutes")
+
+    if jobs <= 1:
+        for i, post in enumerate(posts, 1):
+            print(f"\n{'#'*60}")
+            print(f"# POST {i} of {len(posts)}")
+            print(f"# File: {post}")
+            print(f"{'#'*60}\n")
+            try:
+                records[post] = _run_one(processor, post, timeout)
+            except KeyboardInterrupt:
+                print(f"\n\n⚠️  INTERRUPTED by user during: {post}")
+                print("Exiting batch processing...")
+                break
+            report(records[post])
+    else:
+        print(f"⚙️  Running {len(posts)} posts across {jobs} workers")
+        executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='blog-worker')
+        try:
+            futures = {executor.submit(_run_one, processor, post, timeout): post for post in posts}
+            for future in as_completed(futures):
+                post = futures[future]
+                records[post] = future.result()
+                report(records[post])
+        except KeyboardInterrupt:
+            print("\n\n⚠️  INTERRUPTED by user - cancelling queued posts...")
+            print("Waiting for in-flight posts to finish...")
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            executor.shutdown(wait=True)
+
+    ordered = [records[post] for post in posts if post in records]
+    if processor.journal is not None and len(ordered) == len(posts):
+        processor.journal.finish()
+    processor.emit_event('batch_end', duration=round(time.time() - batch_start, 4),
+                         attempted=len(posts), completed=len(ordered),
+                         statuses={status: sum(1 for r in ordered if r['status'] == status)
+                                   for status in sorted({r['status'] for r in ordered})})
+    return ordered
+
+def print_batch_summary(records, total_time, attempted=None):
+    """Print the final per-post summary for a batch run"""
+    attempted = attempted if attempted is not None else len(records)
+    successful = [r for r in records if r['status'] == 'success']
+    skipped = [r for r in records if r['status'] == 'skipped']
+    up_to_date = [r for r in records if r['status'] == 'up_to_date']
+    failed = [r for r in records if r['status'] not in ('success', 'skipped', 'up_to_date')]
+
+    print("\n" + "=" * 60)
+    print("🎉 BATCH PROCESSING COMPLETE!")
+    print("=" * 60)
+    print(f"⏰ Finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"⏱️  Total time: {total_time/60:.1f} minutes ({total_time:.0f} seconds)")
+    print(f"✅ Successful: {len(successful)} posts")
+    if up_to_date:
+        print(f"💤 Up to date: {len(up_to_date)} posts")
+    if skipped:
+        print(f"⏭️  Skipped: {len(skipped)} posts")
+    print(f"❌ Failed: {len(failed)} posts")
+
+    if successful:
+        print(f"\n✅ Successfully processed:")
+        for record in successful:
+            print(f"   - {record['post']} ({record['duration']:.1f}s)")
+
+    if up_to_date:
+        print(f"\n💤 Already up to date (no Claude call):")
+        for record in up_to_date:
+            print(f"   - {record['post']}")
+
+    if skipped:
+        print(f"\n⏭️  Skipped:")
+        for record in skipped:
+            print(f"   - {record['post']}")
+
+    if failed:
+        print(f"\n❌ Failed to process:")
+        for record in failed:
+            reason = 'timed out' if record['status'] == 'timeout' else record['error'] or 'see output above'
+            print(f"   - {record['post']} ({record['duration']:.1f}s, {reason})")
+
+    print(f"\n📊 Total: {attempted} posts attempted")
+    if attempted > 0:
+        print(f"🎯 Success rate: {(len(successful) + len(up_to_date))/attempted*100:.1f}%")
+
+    if failed:
+        print(f"\n💡 Tip: You can retry failed posts individually:")
+        for record in failed:
+            print(f"   python automated_claude_processor.py {record['post']}")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+JSON Extraction Benchmark
+Fuzzes and times json_extract.extract_json against the old regex extractor
+
+Responses come from the local Claude response cache (content/.cache/claude-responses) plus
+every published post.json wrapped the ways Claude answers: bare, fenced, with prose around
+it, with stray braces and quotes in the prose, with a second small object after it.
+
+Usage:
+  python benchmark_json_extract.py                  # 200 fuzz rounds
+  python benchmark_json_extract.py --rounds 1000 --seed 7
+"""
+
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from json_extract import extract_json
+
+CONTENT_DIR = Path(__file__).parent
+
+PROSE = [
+    "Here's the structured blog post:",
+    "I've kept the publish date exactly as given.",
+    "Note: I couldn't infer a {title} for the second video, so I left it out.",
+    "The \"in-love-and-unity\" image is the final section, as requested.",
+    "Let me know if you'd like any changes to the tags { or the excerpt.",
+    "Use {slug} and {date} as placeholders }",
+]
+
+def legacy_extract(response):
+    """The extractor this replaced: whole response, then three regexes in turn"""
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        for pattern in (r'```json\s*(\{.*?\})\s*```', r'```\s*(\{.*?\})\s*```', r'(\{.*?\})'):
+            match = re.search(pattern, response, re.DOTALL)
+            if match:
+                try:
+                    return json.loads(match.group(1))
+                except json.JSONDecodeError:
+                    continue
+        return None
+
+def wrappers(post):
+    """(name, response text) for one post in each shape Claude answers in"""
+    pretty = json.dumps(post, indent=2, ensure_ascii=False)
+    compact = json.dumps(post, ensure_ascii=False)
+    return [
+        ('bare', pretty),
+        ('fenced', f"{PROSE[0]}\n\n```json\n{pretty}\n```\n\n{PROSE[1]}"),
+        ('fence-no-lang', f"```\n{compact}\n```"),
+        ('prose-braces', f"{PROSE[2]}\n{pretty}\n{PROSE[3]}"),
+        ('unclosed-brace', f"{PROSE[4]}\n\n{pretty}"),
+        ('trailing-object', f"{pretty}\n\nChanges: {{\"publishDate\": \"kept\"}}"),
+        ('stray-close', f"{PROSE[5]}\n```json\n{pretty}\n```"),
+    ]
+
+def load_cases():
+    """(name, response, expected JSON or None) from the cache and the published posts"""
+    cases = []
+    cache_dir = CONTENT_DIR / ".cache" / "claude-responses"
+    for entry_file in sorted(cache_dir.glob("*.json")) if cache_dir.exists() else []:
+        try:
+            entry = json.loads(entry_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        if entry.get('response') and entry.get('parsed'):
+            cases.append(('cached', entry['response'], entry['parsed']))
+    for post_file in sorted((CONTENT_DIR / "blog" / "published").glob("*/post.json")):
+        post = json.loads(post_file.read_text(encoding='utf-8'))
+        # Braces, quotes and fences inside string values must not confuse the scan
+        post.setdefault('content', {})['subtitle'] = 'Sets {like this} and "quotes" and ```fences```'
+        for name, response in wrappers(post):
+            cases.append((name, response, post))
+    return cases
+
+def mutate(response, rng):
+    """Insert random brace/quote noise outside the JSON payload"""
+    noise = ''.join(rng.choice('{}"\\\' abc\n`') for _ in range(rng.randint(1, 40)))
+    where = rng.random()
+    if where < 0.4:
+        return noise.replace('{', '(') + '\n' + response
+    if where < 0.8:
+        return response + '\n' + noise
+    return response[:rng.randint(0, len(response))]  # truncated response
+
+def check(extractor, cases):
+    wrong = {}
+    for name, response, expected in cases:
+        if extractor(response) != expected:
+            wrong[name] = wrong.get(name, 0) + 1
+    return wrong
+
+def timed(extractor, responses, rounds=5):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for response in responses:
+            extractor(response)
+    return (time.perf_counter() - start) / (rounds * len(responses))
+
+def main():
+    rounds = 200
+    seed = 1
+    if '--rounds' in sys.argv:
+        rounds = int(sys.argv[sys.argv.index('--rounds') + 1])
+    if '--seed' in sys.argv:
+        seed = int(sys.argv[sys.argv.index('--seed') + 1])
+
+    cases = load_cases()
+    if not cases:
+        print("❌ No cached responses or published posts found!")
+        return
+    print(f"🔍 {len(cases)} responses ({sum(1 for case in cases if case[0] == 'cached')} from the response cache)")
+
+    for label, extractor in (('extract_json', extract_json), ('legacy regex', legacy_extract)):
+        wrong = check(extractor, cases)
+        summary = ', '.join(f"{name} {count}" for name, count in sorted(wrong.items())) or 'none'
+        print(f"   {label:<13} wrong: {sum(wrong.values()):3d}  ({summary})")
+
+    # Fuzz: noise outside the payload must not change the result; a truncated
+    # response gives the whole post or nothing
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(rounds):
+        name, response, expected = rng.choice(cases)
+        mutated = mutate(response, rng)
+        result = extract_json(mutated)
+        if mutated.startswith(response) or mutated.endswith(response):
+            if result != expected:
+                mismatches += 1
+                print(f"   ⚠️  {name}: noise changed the result: {mutated[:80]!r}")
+        elif result not in (None, expected):
+            # A cut-off response must not come back as one of its inner objects
+            mismatches += 1
+            print(f"   ⚠️  {name}: truncated response gave a fragment: {str(result)[:80]!r}")
+    print(f"🎲 Fuzz: {rounds} mutated responses, {mismatches} mismatches (seed {seed})")
+
+    responses = [response for _, response, _ in cases]
+    print(f"⏱️  Mean time per response: extract_json {timed(extract_json, responses) * 1e6:8.1f} µs | "
+          f"legacy {timed(legacy_extract, responses) * 1e6:8.1f} µs")
+
+    # Braces that never close: the lazy regex rescans the rest of the text from every one
+    for size in (10_000, 40_000):
+        adversarial = 'Sorry, the response was cut off: ' + '{"a": ' * (size // 7)
+        print(f"   {size // 1000:>3}k chars of unclosed braces: extract_json "
+              f"{timed(extract_json, [adversarial], 1) * 1e3:8.2f} ms | "
+              f"legacy {timed(legacy_extract, [adversarial], 1) * 1e3:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Blog Render Benchmark
+Measures HTML render throughput (posts per second) over the published corpus
+
+Usage:
+  python benchmark_render.py              # 50 rounds over every published post.json
+  python benchmark_render.py --rounds 200
+"""
+
+import copy
+import json
+import sys
+import time
+
+from automated_claude_processor import AutomatedClaudeProcessor
+
+def main():
+    rounds = 50
+    if '--rounds' in sys.argv:
+        rounds = int(sys.argv[sys.argv.index('--rounds') + 1])
+
+    processor = AutomatedClaudeProcessor(verbose=False, use_cache=False, require_token=False)
+    posts = []
+    for post_file in sorted(processor.output_dir.glob("*/post.json")):
+        with open(post_file, 'r', encoding='utf-8') as f:
+            posts.append(json.load(f))
+    if not posts:
+        print("❌ No published posts found!")
+        return
+
+    print(f"⏱️  Rendering {len(posts)} posts x {rounds} rounds...")
+
+    # generate_html_from_json removes the featured video from the sections it
+    # is given, so every render gets its own copy (copied outside the timer)
+    batches = [[copy.deepcopy(post) for post in posts] for _ in range(rounds)]
+
+    # Warm-up render loads and compiles the templates
+    processor.generate_html_from_json(copy.deepcopy(posts[0]))
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for batch in batches:
+        for post in batch:
+            total_bytes += len(processor.generate_html_from_json(post))
+    elapsed = time.perf_counter() - start
+
+    rendered = len(posts) * rounds
+    print(f"✅ Rendered {rendered} pages in {elapsed:.3f}s")
+    print(f"🚀 Throughput: {rendered / elapsed:,.0f} posts/second "
+          f"({elapsed / rendered * 1e6:.1f} µs/post, {total_bytes / rendered / 1024:.1f} KB/post)")
+
+if __name__ == "__main__":
+    main()
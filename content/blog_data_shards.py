@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Blog Data Shards
+Splits the blog explorer data into a small manifest plus fixed-size page and tag JSON shards
+that blog-listing.html fetches lazily (assets/data/blog/)
+"""
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+from atomic_write import atomic_write_text
+
+PAGE_SIZE = 12
+
+# Tags listed in the manifest for the listing's filter buttons (every tag still gets shards)
+MANIFEST_TAGS = 15
+
+# Fields the listing cards need; the rest of the entry stays in blog-data.js
+CARD_FIELDS = ('id', 'title', 'excerpt', 'image', 'imageSrcset', 'imageSources', 'date', 'slug', 'tags')
+
+def tag_slug(tag):
+    """File-name-safe, case-insensitive key for a tag ('Social Justice' -> 'social-justice')"""
+    return re.sub(r'[^a-z0-9]+', '-', tag.lower()).strip('-') or 'tag'
+
+def card(entry):
+    return {field: entry[field] for field in CARD_FIELDS if field in entry}
+
+def _pages(cards, page_size):
+    return [cards[i:i + page_size] for i in range(0, len(cards), page_size)] or [[]]
+
+def _shard_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+class BlogDataShards:
+    def __init__(self, shard_dir, page_size=PAGE_SIZE):
+        """Initialize the shard writer
+
+        Args:
+            shard_dir: Output directory (assets/data/blog)
+            page_size: Posts per page shard (the manifest inlines the first page)
+        """
+        self.shard_dir = Path(shard_dir)
+        self.page_size = page_size
+
+    def build(self, entries):
+        """Return {relative file name: JSON text} for the manifest and every shard
+
+        `entries` must already be in display order (newest first).
+        """
+        cards = [card(entry) for entry in entries]
+        pages = _pages(cards, self.page_size)
+        files = {}
+        for number, page in enumerate(pages[1:], 2):
+            files[f"pages/{number}.json"] = _shard_json({'page': number, 'posts': page})
+
+        # Group tags case-insensitively; show the most common spelling
+        tag_cards = {}
+        spellings = {}
+        for post in cards:
+            post_keys = set()
+            for tag in post.get('tags', []):
+                key = tag_slug(tag)
+                spellings.setdefault(key, Counter())[tag] += 1
+                if key not in post_keys:
+                    post_keys.add(key)
+                    tag_cards.setdefault(key, []).append(post)
+        tags = {}
+        for key in sorted(tag_cards, key=lambda key: (-len(tag_cards[key]), key)):
+            tag_pages = _pages(tag_cards[key], self.page_size)
+            for number, page in enumerate(tag_pages, 1):
+                files[f"tags/{key}/{number}.json"] = _shard_json({'tag': key, 'page': number, 'posts': page})
+            tags[key] = {
+                'name': spellings[key].most_common(1)[0][0],
+                'count': len(tag_cards[key]),
+                'pages': len(tag_pages)
+            }
+
+        manifest = {
+            'version': 1,
+            'total': len(cards),
+            'pageSize': self.page_size,
+            'pages': len(pages),
+            'tags': dict(list(tags.items())[:MANIFEST_TAGS]),
+            'firstPage': pages[0]
+        }
+        files['manifest.json'] = _shard_json(manifest)
+        return files
+
+    def write(self, entries):
+        """Write changed shards, delete stale ones; returns (written, removed) counts"""
+        files = self.build(entries)
+        written = 0
+        for relative_name, text in files.items():
+            path = self.shard_dir / relative_name
+            try:
+                if path.read_text(encoding='utf-8') == text:
+                    continue
+            except FileNotFoundError:
+                pass
+            atomic_write_text(path, text)
+            written += 1
+
+        # Remove pages and tags that no longer exist (e.g. after the post count shrinks)
+        removed = 0
+        for subdir in ('pages', 'tags'):
+            root = self.shard_dir / subdir
+            if not root.exists():
+                continue
+            for path in root.rglob('*.json'):
+                if path.relative_to(self.shard_dir).as_posix() not in files:
+                    path.unlink()
+                    removed += 1
+            for directory in sorted(root.rglob('*'), reverse=True):
+                if directory.is_dir() and not any(directory.iterdir()):
+                    directory.rmdir()
+        return written, removed
+
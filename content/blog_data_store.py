@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Blog Data Store
+Canonical blog explorer data kept as JSON keyed by slug; assets/js/blog-data.js is generated from it
+"""
+
+import json
+import re
+from pathlib import Path
+
+from atomic_write import atomic_write
+from blog_data_shards import BlogDataShards
+
+JS_HEADER = '''// Blog Posts Data Structure
+// This file contains blog posts data for the multisensory blog experience
+// Updated automatically by the Claude Blog Processor
+
+const blogPostsData = [
+'''
+
+JS_FOOTER = '''
+];
+
+// Export for use in other files
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = blogPostsData;
+}'''
+
+INTRO_LENGTH = 200
+
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_$][\w$]*$')
+
+def make_entry(post_data, entry_id=None, responsive_image=None):
+    """Build a blog explorer entry from a post.json structure
+
+    responsive_image: Optional fields (imageSrcset, imageSources) pointing at
+    resized derivatives of the cover image
+    """
+    metadata = post_data['metadata']
+    content = post_data.get('content', {})
+
+    # Get first section intro or first paragraph
+    intro = ""
+    if content.get('sections'):
+        first_section = content['sections'][0]
+        section_content = first_section.get('content', {})
+        if first_section.get('type') == 'intro':
+            intro = section_content.get('text', '')
+        elif first_section.get('type') == 'text' and section_content.get('paragraphs'):
+            intro = section_content['paragraphs'][0]
+
+    entry = {
+        'id': entry_id,
+        'title': metadata['title'],
+        'excerpt': metadata['excerpt'],
+        'image': f"assets/images/blog/{metadata['coverImage']}"
+    }
+    entry.update(responsive_image or {})
+    entry.update({
+        'date': metadata['publishDate'],
+        'slug': metadata['slug'],
+        'tags': list(metadata.get('tags', [])),
+        'content': {
+            'subtitle': metadata['excerpt'],
+            'intro': intro[:INTRO_LENGTH] + ('...' if len(intro) > INTRO_LENGTH else ''),
+            'sections': []
+        }
+    })
+    return entry
+
+def _js_value(value, indent):
+    """Serialize a value as a JavaScript literal (objects use unquoted identifier keys)"""
+    if isinstance(value, dict):
+        if not value:
+            return '{}'
+        inner = ' ' * (indent + 4)
+        items = []
+        for key, item in value.items():
+            name = key if IDENTIFIER_PATTERN.match(key) else json.dumps(key)
+            items.append(f"{inner}{name}: {_js_value(item, indent + 4)}")
+        return '{\n' + ',\n'.join(items) + '\n' + ' ' * indent + '}'
+    text = json.dumps(value, ensure_ascii=False)
+    # U+2028/2029 are valid in JSON strings but line terminators in older JavaScript
+    return text.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+
+def parse_blog_data_js(text):
+    """Read the entries out of an existing blog-data.js (for importing it into the store)"""
+    start = text.index('const blogPostsData = [') + len('const blogPostsData = ')
+    end = text.index('];', start) + 1
+    literal = text[start:end]
+    # Quote the unquoted object keys, then drop trailing commas
+    literal = re.sub(r'^(\s*)([A-Za-z_$][\w$]*):', r'\1"\2":', literal, flags=re.MULTILINE)
+    literal = re.sub(r',(\s*[\]}])', r'\1', literal)
+    return json.loads(literal)
+
+class BlogDataStore:
+    def __init__(self, index_file, js_file, shard_dir=None):
+        """Initialize the store
+
+        Args:
+            index_file: JSON file holding the canonical entries (content/blog/blog-index.json)
+            js_file: Generated assets/js/blog-data.js
+            shard_dir: Optional directory for the paginated listing shards (assets/data/blog)
+        """
+        self.index_file = Path(index_file)
+        self.js_file = Path(js_file)
+        self.shards = BlogDataShards(shard_dir) if shard_dir else None
+        self.entries = None          # slug -> entry
+        self._max_id = 0
+
+    def load(self):
+        """Load the entries, importing the existing blog-data.js the first time"""
+        if self.entries is not None:
+            return self.entries
+        entries = []
+        if self.index_file.exists():
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('posts', [])
+        elif self.js_file.exists():
+            with open(self.js_file, 'r', encoding='utf-8') as f:
+                entries = parse_blog_data_js(f.read())
+        self._set_entries(entries)
+        return self.entries
+
+    def _set_entries(self, entries):
+        self.entries = {}
+        for entry in entries:
+            self.entries[entry['slug']] = entry
+        self._max_id = max((entry.get('id') or 0 for entry in entries), default=0)
+
+    def slugs(self):
+        return list(self.load())
+
+    def get(self, slug):
+        return self.load().get(slug)
+
+    def upsert(self, entry):
+        """Insert or replace the entry with this slug
+
+        A replaced entry keeps its id; a new one gets the next free id.
+        Returns True if the entry was new.
+        """
+        self.load()
+        existing = self.entries.get(entry['slug'])
+        entry = dict(entry)
+        if existing is not None:
+            entry['id'] = existing.get('id')
+        elif entry.get('id') is None:
+            self._max_id += 1
+            entry['id'] = self._max_id
+        else:
+            self._max_id = max(self._max_id, entry['id'])
+        self.entries[entry['slug']] = entry
+        return existing is None
+
+    def replace_all(self, entries):
+        """Replace every entry (used when rebuilding from all published posts)"""
+        self._set_entries(entries)
+
+    def ordered_entries(self):
+        """Entries in display order: newest first, then by id"""
+        by_id = sorted(self.load().values(), key=lambda entry: entry.get('id') or 0)
+        return sorted(by_id, key=lambda entry: entry.get('date', ''), reverse=True)
+
+    def iter_js(self, entries=None):
+        """Yield the blog-data.js source one entry at a time"""
+        yield JS_HEADER
+        for i, entry in enumerate(self.ordered_entries() if entries is None else entries):
+            yield (',\n' if i else '') + ' ' * 4 + _js_value(entry, 4)
+        yield JS_FOOTER
+
+    def render_js(self):
+        """Serialize every entry into the blog-data.js source in one pass"""
+        return ''.join(self.iter_js())
+
+    def save(self):
+        """Atomically write the JSON index and regenerate blog-data.js and the listing shards
+
+        Both files are streamed entry by entry rather than built in memory.
+        """
+        entries = self.ordered_entries()
+
+        def write_index(f):
+            json.dump({'version': 1, 'posts': entries}, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+        atomic_write(self.index_file, write_index)
+        atomic_write(self.js_file, lambda f: f.writelines(self.iter_js(entries)))
+        if self.shards:
+            self.shards.write(entries)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Blog Search Index
+Prebuilt inverted index (tokenized, stemmed, weighted postings) over every published post,
+loaded lazily by the search box in blog-listing.html
+
+The tokenizer and stemmer are mirrored in blog-listing.html - change both together.
+"""
+
+import json
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+from atomic_write import atomic_write_text
+
+# Blog data fields a search result card is rendered from (the responsive image ones too)
+DOC_FIELDS = ('slug', 'title', 'excerpt', 'image', 'imageSrcset', 'imageSources', 'date')
+
+# Term weight per field: a match in the title counts five times a body match
+FIELD_WEIGHTS = {'title': 5, 'tags': 4, 'excerpt': 2, 'body': 1}
+
+STOPWORDS = frozenset('''
+a about after all also am an and any are as at be because been but by can could did do does
+for from had has have he her here him his how i if in into is it its just me more my no not
+of on or our out over she so some than that the their them then there these they this to
+too up us very was we were what when where which who why will with would you your
+'''.split())
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+COMBINING_MARK_PATTERN = re.compile('[\u0300-\u036f]')
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def tokenize(text):
+    """Lowercase, strip accents and split on anything that isn't a letter or digit"""
+    text = text.lower()
+    if not text.isascii():
+        text = COMBINING_MARK_PATTERN.sub('', unicodedata.normalize('NFKD', text))
+    return [token for token in TOKEN_PATTERN.findall(text)
+            if len(token) > 1 and token not in STOPWORDS]
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Light English suffix stripping (plurals, -ing, -ed, -ly), same rules as the listing page"""
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith('ies') and len(token) > 4:
+        token = token[:-3] + 'y'
+    elif token.endswith('sses'):
+        token = token[:-2]
+    elif token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        token = token[:-1]
+    for suffix in ('ingly', 'edly', 'ing', 'ed', 'ly'):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[:-len(suffix)]
+            # running -> run, hopped -> hop
+            if len(token) > 3 and token[-1] == token[-2] and token[-1] not in 'aeioulsz':
+                token = token[:-1]
+            break
+    if token.endswith('e') and len(token) > 4:
+        token = token[:-1]
+    return token
+
+def analyze(text):
+    return [stem(token) for token in tokenize(text)]
+
+def post_fields(post_data):
+    """Searchable text of a post.json, per field"""
+    metadata = post_data['metadata']
+    body = []
+    for section in post_data.get('content', {}).get('sections', []):
+        section_content = section.get('content', {})
+        body.append(section.get('title', ''))
+        for key in ('text', 'caption', 'alt', 'title', 'description'):
+            value = section_content.get(key)
+            if isinstance(value, str):
+                body.append(value)
+        body.extend(section_content.get('paragraphs', []))
+    return {
+        'title': metadata.get('title', ''),
+        'tags': ' '.join(metadata.get('tags', [])),
+        'excerpt': metadata.get('excerpt', ''),
+        'body': HTML_TAG_PATTERN.sub(' ', '\n'.join(part for part in body if part))
+    }
+
+def post_term_scores(post_data):
+    """Weighted term frequencies of a post.json ({term: score})"""
+    scores = {}
+    for field, text in post_fields(post_data).items():
+        weight = FIELD_WEIGHTS[field]
+        for term, count in Counter(analyze(text)).items():
+            scores[term] = scores.get(term, 0) + count * weight
+    return scores
+
+class BlogSearchIndex:
+    def __init__(self, index_file):
+        """Initialize the index
+
+        Args:
+            index_file: Output JSON file (assets/data/blog/search-index.json)
+        """
+        self.index_file = Path(index_file)
+        self.docs = {}        # slug -> result card (DOC_FIELDS)
+        self.postings = {}    # term -> {slug: score}
+        self._loaded = False
+
+    def load(self):
+        """Load a previously written index (once) so single posts can be updated in place"""
+        if self._loaded or not self.index_file.exists():
+            self._loaded = True
+            return self
+        self._loaded = True
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        slugs = [doc['slug'] for doc in data['docs']]
+        self.docs = {doc['slug']: doc for doc in data['docs']}
+        self.postings = {}
+        for term, flat in data['terms'].items():
+            self.postings[term] = {slugs[flat[i]]: flat[i + 1] for i in range(0, len(flat), 2)}
+        return self
+
+    def remove(self, slug):
+        if self.docs.pop(slug, None) is None:
+            return
+        for term in [term for term, docs in self.postings.items() if slug in docs]:
+            del self.postings[term][slug]
+            if not self.postings[term]:
+                del self.postings[term]
+
+    def add(self, post_data, card):
+        """Index a post.json (replacing any previous version of the same slug)"""
+        self.add_scores(card, post_term_scores(post_data))
+
+    def add_scores(self, card, scores):
+        """Index a post from precomputed post_term_scores()"""
+        slug = card['slug']
+        self.remove(slug)
+        self.docs[slug] = {key: card[key] for key in DOC_FIELDS if key in card}
+        for term, score in scores.items():
+            self.postings.setdefault(term, {})[slug] = score
+
+    def ordered_docs(self):
+        """Docs newest first (ties between equal scores are broken in this order)"""
+        return sorted(self.docs.values(), key=lambda doc: (doc.get('date', ''), doc['slug']), reverse=True)
+
+    def to_json(self):
+        """Compact form: docs newest first, each term -> flat [doc, score, doc, score, ...]"""
+        docs = self.ordered_docs()
+        positions = {doc['slug']: i for i, doc in enumerate(docs)}
+        terms = {}
+        for term in sorted(self.postings):
+            flat = []
+            for slug, score in sorted(self.postings[term].items(), key=lambda item: positions[item[0]]):
+                flat.extend((positions[slug], score))
+            terms[term] = flat
+        data = {'version': 1, 'docs': docs, 'terms': terms}
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+    def search(self, query):
+        """Slugs matching every query term (last term as a prefix), best first"""
+        terms = analyze(query)
+        if not terms:
+            return []
+        sorted_terms = None
+        totals = None
+        for i, term in enumerate(terms):
+            matches = {}
+            candidates = [term]
+            if i == len(terms) - 1:
+                sorted_terms = sorted_terms or sorted(self.postings)
+                candidates = [candidate for candidate in sorted_terms if candidate.startswith(term)]
+            for candidate in candidates:
+                for slug, score in self.postings.get(candidate, {}).items():
+                    matches[slug] = matches.get(slug, 0) + score
+            totals = matches if totals is None else {slug: totals[slug] + score
+                                                      for slug, score in matches.items() if slug in totals}
+        positions = {doc['slug']: i for i, doc in enumerate(self.ordered_docs())}
+        return [slug for slug, _ in sorted(totals.items(), key=lambda item: (-item[1], positions[item[0]]))]
+
+    def save(self):
+        """Atomically write the index"""
+        atomic_write_text(self.index_file, self.to_json())
+
+def main():
+    """Query the built index from the command line: python blog_search_index.py <query>"""
+    index_file = Path(__file__).parent.parent / "assets" / "data" / "blog" / "search-index.json"
+    index = BlogSearchIndex(index_file).load()
+    query = ' '.join(sys.argv[1:])
+    start_time = time.perf_counter()
+    results = index.search(query)
+    elapsed = time.perf_counter() - start_time
+    print(f"🔍 '{query}': {len(results)} posts ({elapsed * 1000:.2f} ms, "
+          f"{len(index.postings)} terms, {len(index.docs)} posts indexed)")
+    for slug in results[:10]:
+        print(f"   - {index.docs[slug]['title']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Blog Post Templates
+Precompiled page and section templates used by generate_html_from_json
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+TEMPLATE_DIR = Path(__file__).parent / "templates" / "blog-post"
+
+# Placeholders are written as ${name}; everything else is literal text
+PLACEHOLDER_PATTERN = re.compile(r'\$\{(\w+)\}')
+
+class CompiledTemplate:
+    def __init__(self, text, name='<string>'):
+        """Split the template once into literal chunks and placeholder slots"""
+        self.name = name
+        self._parts = []
+        self._slots = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            self._parts.append(text[position:match.start()])
+            self._slots.append((len(self._parts), match.group(1)))
+            self._parts.append('')
+            position = match.end()
+        self._parts.append(text[position:])
+        self.fields = frozenset(field for _, field in self._slots)
+
+    def render(self, **values):
+        """Fill every placeholder and join the parts in a single pass"""
+        parts = list(self._parts)
+        for index, field in self._slots:
+            try:
+                parts[index] = str(values[field])
+            except KeyError:
+                raise KeyError(f"{field} (template {self.name})") from None
+        return ''.join(parts)
+
+@lru_cache(maxsize=None)
+def get_template(name):
+    """Load and compile a template from templates/blog-post (once per process)"""
+    with open(TEMPLATE_DIR / name, 'r', encoding='utf-8') as f:
+        return CompiledTemplate(f.read(), name)
+
+def template_sources():
+    """Raw text of every blog post template, for change detection"""
+    return ''.join(path.read_text(encoding='utf-8') for path in sorted(TEMPLATE_DIR.glob('*.html')))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Blog Build Manifest
+Records content hashes of raw inputs, prompts, post.json and rendered HTML so batch runs can skip up-to-date posts
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from atomic_write import atomic_write_json
+
+def hash_text(text):
+    """SHA-256 of a string"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def hash_file(path):
+    """SHA-256 of a file's bytes, or None if it does not exist"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+class BuildManifest:
+    # Build actions, from cheapest to most expensive
+    UP_TO_DATE = 'up_to_date'
+    RENDER = 'render'
+    PROCESS = 'process'
+
+    def __init__(self, manifest_file, root_dir):
+        """Load the manifest
+
+        Args:
+            manifest_file: JSON file the manifest is stored in
+            root_dir: Repository root; output paths are stored relative to it
+        """
+        self.manifest_file = Path(manifest_file)
+        self.root_dir = Path(root_dir)
+        self._lock = threading.Lock()
+        self.entries = {}
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('posts', {})
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️  Could not read build manifest ({e}) - starting fresh")
+
+    def get(self, source_name):
+        return self.entries.get(source_name)
+
+    def check(self, source_name, source_hash, prompt_hash, template_hash):
+        """Decide what needs rebuilding for a raw-input file
+
+        Returns (action, entry): PROCESS when Claude must be called again,
+        RENDER when only the HTML is stale, UP_TO_DATE otherwise.
+        """
+        entry = self.entries.get(source_name)
+        if not entry:
+            return self.PROCESS, None
+        if entry.get('source_hash') != source_hash or entry.get('prompt_hash') != prompt_hash:
+            return self.PROCESS, entry
+
+        post_json_hash = hash_file(self.root_dir / entry['post_json'])
+        if post_json_hash is None:
+            return self.PROCESS, entry
+
+        html_hash = hash_file(self.root_dir / entry['html']) if entry.get('html') else None
+        if (post_json_hash != entry.get('post_json_hash')
+                or template_hash != entry.get('template_hash')
+                or html_hash is None
+                or html_hash != entry.get('html_hash')):
+            return self.RENDER, entry
+
+        return self.UP_TO_DATE, entry
+
+    def record(self, source_name, source_hash=None, prompt_hash=None, post_json=None,
+               html=None, template_hash=None, publish_date=None):
+        """Record the hashes of a freshly built post and save the manifest
+
+        Fields left as None keep their previous value (e.g. a render-only
+        rebuild updates the HTML without touching the source hashes).
+        `publish_date` is the date the post was published with, reused for
+        raw input that doesn't give one.
+        """
+        with self._lock:
+            entry = dict(self.entries.get(source_name, {}))
+            if source_hash is not None:
+                entry['source_hash'] = source_hash
+            if prompt_hash is not None:
+                entry['prompt_hash'] = prompt_hash
+            if post_json is not None:
+                entry['post_json'] = self.relative_path(post_json)
+                entry['post_json_hash'] = hash_file(post_json)
+            if html is not None:
+                entry['html'] = self.relative_path(html)
+                entry['html_hash'] = hash_file(html)
+            if template_hash is not None:
+                entry['template_hash'] = template_hash
+            if publish_date is not None:
+                entry['publish_date'] = publish_date
+            entry['updated'] = datetime.now().isoformat(timespec='seconds')
+            self.entries[source_name] = entry
+            self._save()
+        return entry
+
+    def relative_path(self, path):
+        """Path as stored in the manifest (relative to the repository root)"""
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.root_dir.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _save(self):
+        """Atomically write the manifest"""
+        data = {'version': 1, 'posts': dict(sorted(self.entries.items()))}
+        atomic_write_json(self.manifest_file, data, trailing_newline=True, indent=2, ensure_ascii=False)
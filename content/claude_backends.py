@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Claude Backends
+Pluggable ways of sending a prompt to Claude: one `claude -p` process per call, a long-lived
+`claude` process speaking stream-json, or the anthropic SDK with a shared HTTP client
+
+Every backend's complete() takes an optional on_text(chunk) callback that sees the response as
+it streams; returning a non-empty list of issues from it stops the response early.
+"""
+
+import atexit
+import json
+import os
+import queue
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+DEFAULT_BACKEND = 'cli'
+DEFAULT_SDK_MODEL = 'claude-sonnet-4-5'
+SDK_MAX_TOKENS = 8000
+
+# stderr/API messages that retrying won't fix
+PERMANENT_ERROR_MARKERS = ('not logged in', 'invalid api key', 'authentication', 'unauthorized',
+                           'permission', 'unknown option', 'invalid model', 'credit balance')
+
+class ClaudeBackendError(Exception):
+    """A backend could not produce a response
+
+    `transient` is False for failures a retry can't fix (bad credentials,
+    a missing package, an invalid request).
+    """
+
+    def __init__(self, message, transient=True):
+        super().__init__(message)
+        self.transient = transient
+
+def _is_transient(message):
+    message = message.lower()
+    return not any(marker in message for marker in PERMANENT_ERROR_MARKERS)
+
+class ClaudeBackendTimeout(ClaudeBackendError):
+    """No response arrived within the timeout"""
+
+class ClaudeResponseAborted(ClaudeBackendError):
+    """on_text() rejected a response while it was streaming"""
+
+    def __init__(self, issues, partial):
+        super().__init__('; '.join(issues), transient=False)
+        self.issues = issues
+        self.partial = partial
+
+def _stream_text(event):
+    """Text delta carried by a stream-json `stream_event` line (None for anything else)"""
+    if event.get('type') != 'stream_event':
+        return None
+    inner = event.get('event', {})
+    delta = inner.get('delta', {})
+    if inner.get('type') == 'content_block_delta' and delta.get('type') == 'text_delta':
+        return delta.get('text', '')
+    return None
+
+def _read_stream_json(lines, timeout, on_text, abort, errors=()):
+    """Read stream-json lines from a queue until the `result` event
+
+    Calls abort() and raises on timeout, early exit, or when on_text() returns issues.
+    `errors` holds the process's stderr lines, which say why it exited early.
+    """
+    deadline = time.monotonic() + timeout
+    parts = []
+    while True:
+        remaining = deadline - time.monotonic()
+        try:
+            line = lines.get(timeout=max(remaining, 0))
+        except queue.Empty:
+            abort()
+            raise ClaudeBackendTimeout(f"no response after {timeout:.0f}s") from None
+        if line is None:
+            abort()
+            detail = ''.join(errors).strip()
+            if not detail:
+                raise ClaudeBackendError("claude exited before answering")
+            raise ClaudeBackendError(f"claude exited before answering: {detail}",
+                                     transient=_is_transient(detail))
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if event.get('type') == 'result':
+            if event.get('is_error'):
+                message = event.get('result') or event.get('subtype', 'error')
+                raise ClaudeBackendError(message, transient=_is_transient(message))
+            return event.get('result', '')
+        text = _stream_text(event)
+        if text and on_text:
+            parts.append(text)
+            issues = on_text(text)
+            if issues:
+                abort()
+                raise ClaudeResponseAborted(list(issues), ''.join(parts))
+
+def _pump_lines(process):
+    """Queue a process's stdout lines from a reader thread (None marks EOF)
+
+    stderr is drained too, keeping its last lines; returns (lines, errors).
+    """
+    lines = queue.Queue()
+    errors = deque(maxlen=20)
+
+    def drain():
+        for line in process.stderr:
+            errors.append(line)
+
+    def pump():
+        for line in process.stdout:
+            lines.put(line)
+        # Let stderr catch up so whoever sees EOF can tell why the process exited
+        stderr_reader.join(timeout=2)
+        lines.put(None)
+
+    stderr_reader = threading.Thread(target=drain, daemon=True, name='claude-stderr-reader')
+    stderr_reader.start()
+    threading.Thread(target=pump, daemon=True, name='claude-stream-reader').start()
+    return lines, errors
+
+class SubprocessCLIBackend:
+    """A fresh `claude -p` process for every prompt (prompt sent on stdin, not argv)"""
+    name = 'cli'
+
+    def __init__(self, env=None, model=''):
+        self.env = env
+        self.model = model
+
+    def start_post(self):
+        pass
+
+    def finish_post(self):
+        pass
+
+    def complete(self, prompt, timeout, on_text=None):
+        cmd = ['claude', '-p']
+        if self.model:
+            cmd += ['--model', self.model]
+        if on_text:
+            return self._complete_streaming(cmd, prompt, timeout, on_text)
+        try:
+            result = subprocess.run(cmd, input=prompt, env=self.env, capture_output=True,
+                                    text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise ClaudeBackendTimeout(f"no response after {timeout:.0f}s") from None
+        if result.returncode != 0:
+            message = f"claude exited with {result.returncode}: {result.stderr.strip()}"
+            raise ClaudeBackendError(message, transient=_is_transient(message))
+        return result.stdout
+
+    def _complete_streaming(self, cmd, prompt, timeout, on_text):
+        cmd = cmd + ['--output-format', 'stream-json', '--include-partial-messages', '--verbose']
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, env=self.env, text=True, bufsize=1)
+        lines, errors = _pump_lines(process)
+        try:
+            process.stdin.write(prompt)
+            process.stdin.close()
+        except OSError:
+            pass  # claude exited without reading the prompt; its stderr (read below) says why
+        try:
+            return _read_stream_json(lines, timeout, on_text, abort=process.kill, errors=errors)
+        finally:
+            process.wait()
+
+    def close(self):
+        pass
+
+class StreamingCLIBackend:
+    """One long-lived `claude` process per worker, prompts sent as stream-json messages
+
+    A session keeps the conversation history, so the process is recycled
+    between posts: earlier posts never leak into a new post's context, while
+    validation-repair iterations of the same post reuse the warm process. A
+    spare process is started as soon as a session takes its first prompt, so
+    the next post finds one that has already finished starting up.
+    """
+    name = 'cli-stream'
+
+    def __init__(self, env=None, model=''):
+        self.env = env
+        self.model = model
+        self._process = None
+        self._lines = None
+        self._errors = None
+        self._spare = None
+        self._used = False
+
+    def _spawn(self):
+        cmd = ['claude', '-p', '--input-format', 'stream-json', '--output-format', 'stream-json',
+               '--include-partial-messages', '--verbose']
+        if self.model:
+            cmd += ['--model', self.model]
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, env=self.env, text=True, bufsize=1)
+        return (process, *_pump_lines(process))
+
+    def _ensure_process(self):
+        if self._process is None or self._process.poll() is not None:
+            if self._spare is not None and self._spare[0].poll() is None:
+                self._process, self._lines, self._errors = self._spare
+            else:
+                self._process, self._lines, self._errors = self._spawn()
+            # Warm up the next post's session while this one is answering
+            self._spare = self._spawn()
+            self._used = False
+
+    def start_post(self):
+        """Make sure the next prompt starts a fresh conversation"""
+        if self._used:
+            self.finish_post()
+
+    def finish_post(self):
+        """Retire the process holding this post's conversation and warm up its replacement
+
+        A post that never prompted (up to date, skipped) leaves everything as it
+        was, so an incremental batch doesn't start idle sessions.
+        """
+        if not self._used:
+            return
+        self._used = False
+        if self._process is not None:
+            self._retire(self._process)
+            self._process = None
+        if self._spare is None or self._spare[0].poll() is not None:
+            self._spare = self._spawn()
+
+    def complete(self, prompt, timeout, on_text=None):
+        self._ensure_process()
+        self._used = True
+        message = {'type': 'user', 'message': {'role': 'user', 'content': prompt}}
+        try:
+            self._process.stdin.write(json.dumps(message) + '\n')
+            self._process.stdin.flush()
+        except OSError:
+            pass  # The session has exited; reading its output reports why from stderr
+
+        # A session stopped mid-answer can't be reused, so every abort discards it
+        return _read_stream_json(self._lines, timeout, on_text, abort=self._discard, errors=self._errors)
+
+    def _discard(self):
+        if self._process is not None:
+            self._retire(self._process)
+            self._process = None
+
+    def _retire(self, process):
+        """Shut a session down in the background so the caller doesn't wait for it"""
+        threading.Thread(target=self._terminate, args=(process,), daemon=True).start()
+
+    @staticmethod
+    def _terminate(process):
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.terminate()
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def close(self):
+        if self._process is not None:
+            self._terminate(self._process)
+            self._process = None
+        if self._spare is not None:
+            self._terminate(self._spare[0])
+            self._spare = None
+
+class AnthropicSDKBackend:
+    """Messages API through one anthropic client (keeps its HTTP connections open)"""
+    name = 'sdk'
+    _clients = {}
+    _clients_lock = threading.Lock()
+
+    def __init__(self, env=None, model=''):
+        try:
+            import anthropic
+        except ImportError:
+            raise ClaudeBackendError("the sdk backend needs the anthropic package (pip install anthropic)",
+                                     transient=False) from None
+        api_key = (env or os.environ).get('ANTHROPIC_API_KEY')
+        if not api_key:
+            raise ClaudeBackendError("the sdk backend needs ANTHROPIC_API_KEY to be set", transient=False)
+        self.model = model or DEFAULT_SDK_MODEL
+        # The client is thread-safe, so every worker shares one connection pool. Retries
+        # (with backoff) happen in the processor, so the client's own are turned off
+        with self._clients_lock:
+            if api_key not in self._clients:
+                self._clients[api_key] = anthropic.Anthropic(api_key=api_key, max_retries=0)
+            self.client = self._clients[api_key]
+        self._anthropic = anthropic
+
+    def start_post(self):
+        pass
+
+    def finish_post(self):
+        pass
+
+    def complete(self, prompt, timeout, on_text=None):
+        request = dict(model=self.model, max_tokens=SDK_MAX_TOKENS,
+                       messages=[{"role": "user", "content": prompt}], timeout=timeout)
+        try:
+            if on_text:
+                return self._complete_streaming(request, on_text)
+            response = self.client.messages.create(**request)
+        except self._anthropic.APITimeoutError:
+            raise ClaudeBackendTimeout(f"no response after {timeout:.0f}s") from None
+        except self._anthropic.APIStatusError as e:
+            # Rate limits, overload and server errors pass; a bad request won't get better
+            transient = e.status_code in (408, 409, 429) or e.status_code >= 500
+            raise ClaudeBackendError(str(e), transient=transient) from None
+        except self._anthropic.APIError as e:
+            raise ClaudeBackendError(str(e)) from None
+        return ''.join(block.text for block in response.content if getattr(block, 'type', '') == 'text')
+
+    def _complete_streaming(self, request, on_text):
+        parts = []
+        # Leaving the context manager early closes the HTTP response, which stops generation
+        with self.client.messages.stream(**request) as stream:
+            for text in stream.text_stream:
+                parts.append(text)
+                issues = on_text(text)
+                if issues:
+                    raise ClaudeResponseAborted(list(issues), ''.join(parts))
+        return ''.join(parts)
+
+    def close(self):
+        pass
+
+BACKENDS = {backend.name: backend for backend in (SubprocessCLIBackend, StreamingCLIBackend, AnthropicSDKBackend)}
+
+def make_backend(name, env=None, model=''):
+    if name not in BACKENDS:
+        raise ClaudeBackendError(f"unknown backend '{name}' (choose from {', '.join(BACKENDS)})",
+                                 transient=False)
+    return BACKENDS[name](env=env, model=model)
+
+class BackendPool:
+    """Backends checked out by one post at a time (a warm session can't serve two prompts at once)"""
+
+    def __init__(self, name, env=None, model=''):
+        self.name = name
+        self.env = env
+        self.model = model
+        self._idle = []
+        self._all = []
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        backend = make_backend(self.name, env=self.env, model=self.model)
+        with self._lock:
+            self._all.append(backend)
+        return backend
+
+    def release(self, backend):
+        backend.finish_post()
+        with self._lock:
+            self._idle.append(backend)
+
+    def close(self):
+        with self._lock:
+            backends, self._all, self._idle = self._all, [], []
+        for backend in backends:
+            backend.close()
+
+def parse_backend_arg(argv, default=DEFAULT_BACKEND):
+    """Return the backend given by `--backend NAME` / `--backend=NAME` (exits on an unknown name)"""
+    name = default
+    for i, arg in enumerate(argv):
+        if arg == '--backend' and i + 1 < len(argv):
+            name = argv[i + 1]
+            break
+        if arg.startswith('--backend='):
+            name = arg.split('=', 1)[1]
+            break
+    if name not in BACKENDS:
+        print(f"❌ Unknown --backend '{name}' (choose from {', '.join(BACKENDS)})")
+        sys.exit(2)
+    return name
+
+def benchmark(names, calls=5, posts=2, prompt="Reply with the single word OK."):
+    """Time `posts` x `calls` prompts per backend (the same shape as repair iterations)"""
+    env = {**os.environ}
+    print(f"⏱️  {posts} posts x {calls} calls per backend, prompt: {prompt!r}")
+    for name in names:
+        try:
+            backend = make_backend(name, env=env, model=os.getenv('ANTHROPIC_MODEL', ''))
+        except ClaudeBackendError as e:
+            print(f"   {name:<11} skipped: {e}")
+            continue
+        latencies = []
+        total_start = time.perf_counter()
+        try:
+            for _ in range(posts):
+                backend.start_post()
+                for _ in range(calls):
+                    call_start = time.perf_counter()
+                    backend.complete(prompt, timeout=120)
+                    latencies.append(time.perf_counter() - call_start)
+                backend.finish_post()
+        except ClaudeBackendError as e:
+            print(f"   {name:<11} failed: {e}")
+            continue
+        finally:
+            backend.close()
+        total = time.perf_counter() - total_start
+        print(f"   {name:<11} first {latencies[0] * 1000:7.0f} ms | median {statistics.median(latencies) * 1000:7.0f} ms"
+              f" | total {total:6.2f}s")
+
+def main():
+    """python claude_backends.py --benchmark [--backends cli,cli-stream,sdk] [--calls N] [--posts N]"""
+    if '--benchmark' not in sys.argv:
+        print(main.__doc__)
+        return
+    names = list(BACKENDS)
+    calls = 5
+    posts = 2
+    for i, arg in enumerate(sys.argv):
+        if arg == '--backends' and i + 1 < len(sys.argv):
+            names = sys.argv[i + 1].split(',')
+        elif arg == '--calls' and i + 1 < len(sys.argv):
+            calls = int(sys.argv[i + 1])
+        elif arg == '--posts' and i + 1 < len(sys.argv):
+            posts = int(sys.argv[i + 1])
+    benchmark(names, calls=calls, posts=posts)
+
+if __name__ == "__main__":
+    main()
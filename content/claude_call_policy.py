@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Claude Call Policy
+Per-call timeouts derived from prompt length and recorded latencies, jittered exponential
+backoff for transient failures, and per-post checkpoints so a rerun skips finished steps
+"""
+
+import json
+import random
+import threading
+import time
+from pathlib import Path
+
+from atomic_write import atomic_write_json
+
+# Used until a backend has MIN_SAMPLES recorded calls
+COLD_TIMEOUT = 120            # seconds for prompts up to COLD_REFERENCE_CHARS
+COLD_REFERENCE_CHARS = 10_000
+MIN_SAMPLES = 5
+# Prompts shorter than this are timed as if they were this long (fixed per-call overhead)
+MIN_PROMPT_CHARS = 2_000
+HEADROOM = 2.5                # timeout = HEADROOM x the 90th percentile seconds per character
+MIN_TIMEOUT = 30
+MAX_TIMEOUT = 600
+# A retry after a timeout gets this much longer than the call that timed out
+TIMEOUT_GROWTH = 1.5
+# The automatic per-post budget: room for this many worst-case calls plus the local steps
+POST_BUDGET_CALLS = 3
+POST_BUDGET_OVERHEAD = 60
+
+class LatencyHistory:
+    def __init__(self, history_file, max_samples=200):
+        """Initialize the history
+
+        Args:
+            history_file: JSON file holding the most recent call latencies
+            max_samples: Samples kept per backend (older ones are dropped)
+        """
+        self.history_file = Path(history_file)
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = self._load()
+
+    def _load(self):
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                samples = json.load(f)
+            return samples if isinstance(samples, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        atomic_write_json(self.history_file, self._samples)
+
+    def record(self, backend, prompt_chars, seconds, timed_out=False):
+        """Add one call's latency (a timed-out call counts as a lower bound)"""
+        with self._lock:
+            samples = self._samples.setdefault(backend, [])
+            samples.append([prompt_chars, round(seconds, 3), timed_out])
+            del samples[:-self.max_samples]
+            try:
+                self._save()
+            except OSError as e:
+                print(f"⚠️  Could not write latency history: {e}")
+
+    def seconds_per_char(self, backend):
+        """90th percentile of the recorded seconds per prompt character (None without enough data)"""
+        with self._lock:
+            samples = list(self._samples.get(backend, []))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        rates = sorted(seconds / max(chars, MIN_PROMPT_CHARS) for chars, seconds, _ in samples)
+        return rates[min(len(rates) - 1, int(len(rates) * 0.9))]
+
+    def timeout_for(self, backend, prompt_chars):
+        """Seconds to allow a call with a prompt of this length"""
+        rate = self.seconds_per_char(backend)
+        if rate is None:
+            timeout = COLD_TIMEOUT * max(1.0, prompt_chars / COLD_REFERENCE_CHARS)
+        else:
+            timeout = HEADROOM * rate * max(prompt_chars, MIN_PROMPT_CHARS)
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, timeout))
+
+    def post_budget(self, backend, prompt_chars):
+        """Automatic time budget for a whole post whose first prompt is this long"""
+        return POST_BUDGET_CALLS * self.timeout_for(backend, prompt_chars) + POST_BUDGET_OVERHEAD
+
+class RetryPolicy:
+    def __init__(self, attempts=3, base_delay=2.0, max_delay=30.0, rng=None):
+        """Initialize the policy
+
+        Args:
+            attempts: Calls made per prompt before giving up (1 disables retries)
+            base_delay: Backoff ceiling in seconds before the first retry; doubles each retry
+            max_delay: Largest backoff ceiling
+            rng: random.Random used for the jitter
+        """
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def delay(self, retry):
+        """Seconds to wait before retry number `retry` (1-based), with full jitter"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return self.rng.uniform(0, ceiling)
+
+class PostCheckpoints:
+    """Progress of posts that have not finished yet (content/.cache/checkpoints)
+
+    A checkpoint holds the extracted data and prompt, plus the validated post
+    JSON once the Claude step is done. It is only reused while the raw input
+    and the extract/prompt code are unchanged, and removed when the post
+    finishes.
+    """
+
+    def __init__(self, checkpoint_dir):
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name):
+        return self.checkpoint_dir / f"{name}.json"
+
+    def get(self, name, source_hash, pipeline_hash):
+        """Return the checkpoint for this raw-input file, or None if it is missing or stale"""
+        try:
+            with open(self._path(name), 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if checkpoint.get('source_hash') != source_hash or checkpoint.get('pipeline_hash') != pipeline_hash:
+            return None
+        return checkpoint
+
+    def put(self, name, **fields):
+        """Replace a checkpoint atomically"""
+        checkpoint = {**fields, 'updated': time.time()}
+        atomic_write_json(self._path(name), checkpoint, ensure_ascii=False)
+
+    def clear(self, name):
+        self._path(name).unlink(missing_ok=True)
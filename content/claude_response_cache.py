@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Claude Response Cache
+Content-addressed on-disk cache for Claude Code responses, keyed by prompt + model/CLI version
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from atomic_write import atomic_write_json
+
+class ClaudeResponseCache:
+    def __init__(self, cache_dir, max_age_days=30, max_bytes=50 * 1024 * 1024):
+        """Initialize the cache
+
+        Args:
+            cache_dir: Directory holding one JSON file per cached response
+            max_age_days: Entries older than this are treated as misses and evicted
+            max_bytes: Oldest entries are evicted once the cache grows past this size
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(prompt, cli_version='', model=''):
+        """Hash the prompt together with the model and CLI version"""
+        payload = json.dumps({'prompt': prompt, 'cli_version': cli_version, 'model': model},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached entry ({'response', 'parsed', ...}) or None"""
+        entry_path = self._entry_path(key)
+        try:
+            if time.time() - entry_path.stat().st_mtime > self.max_age:
+                entry_path.unlink()
+                return None
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError):
+            # Corrupt or half-written entry - drop it and treat as a miss
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
+            return None
+
+    def put(self, key, response, parsed, cli_version='', model=''):
+        """Store the raw response and parsed JSON, then enforce size/age limits"""
+        entry = {
+            'key': key,
+            'created': time.time(),
+            'cli_version': cli_version,
+            'model': model,
+            'response': response,
+            'parsed': parsed
+        }
+        # Written atomically so concurrent readers never see partial JSON
+        atomic_write_json(self._entry_path(key), entry, ensure_ascii=False)
+        self.evict()
+
+    def evict(self):
+        """Remove expired entries, then the oldest ones until under max_bytes"""
+        now = time.time()
+        entries = []
+        for entry_path in self.cache_dir.glob('*.json'):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                entry_path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Delete every cached response"""
+        for entry_path in self.cache_dir.glob('*.json'):
+            entry_path.unlink(missing_ok=True)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Responsive Image Derivatives
+Resized, recompressed copies of blog images (several widths, WebP/AVIF when the encoder exists),
+stored under content-hashed names so they are only rebuilt when the source image changes
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from atomic_write import atomic_write, atomic_write_json
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional - without it the original images are used
+    Image = None
+
+try:
+    import fcntl
+except ImportError:  # No flock (Windows) - generation is only serialized within one process
+    fcntl = None
+
+# Widths (px) generated for every image; never upscaled past the original
+DERIVATIVE_WIDTHS = (480, 960, 1600)
+
+# Modern formats in order of preference, then the fallback format of the source
+FORMAT_MIME_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpg': 'image/jpeg',
+    'png': 'image/png'
+}
+SAVE_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality': 55, 'speed': 8},
+    'webp': {'format': 'WEBP', 'quality': 78, 'method': 4},
+    'jpg': {'format': 'JPEG', 'quality': 80, 'optimize': True, 'progressive': True},
+    'png': {'format': 'PNG', 'optimize': True}
+}
+
+SOURCE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+
+def pillow_available():
+    return Image is not None
+
+def available_formats():
+    """Modern formats whose encoders are compiled into the local Pillow"""
+    if Image is None:
+        return []
+    formats = []
+    for name, feature in (('avif', 'avif'), ('webp', 'webp')):
+        try:
+            if features.check(feature):
+                formats.append(name)
+        except ValueError:  # feature unknown to this Pillow version
+            pass
+    return formats
+
+def srcset(variants, format_name, url_prefix):
+    """`url 480w, url 960w, ...` for one format"""
+    return ', '.join(f"{url_prefix}{file_name} {width}w"
+                     for width, file_name in variants['formats'][format_name])
+
+def largest(variants, format_name, max_width=None):
+    """(width, file name) of the widest derivative, optionally no wider than max_width"""
+    files = variants['formats'][format_name]
+    candidates = [item for item in files if max_width is None or item[0] <= max_width] or files[:1]
+    return tuple(candidates[-1])
+
+class ImageDerivatives:
+    def __init__(self, output_dir, widths=DERIVATIVE_WIDTHS, formats=None):
+        """Initialize the derivative cache
+
+        Args:
+            output_dir: Directory derivatives are written to (assets/images/blog/derivatives)
+            widths: Target widths in pixels
+            formats: Modern formats to produce (default: every available encoder)
+        """
+        self.output_dir = Path(output_dir)
+        self.widths = tuple(sorted(widths))
+        self.formats = available_formats() if formats is None else list(formats)
+        self.enabled = pillow_available()
+        self._lock = threading.Lock()   # Used when there is no fcntl to lock across processes
+        self._hashes = {}       # (path, mtime_ns, size) -> sha256, to avoid rehashing unchanged files
+        self._variants = {}     # source sha256 -> variants
+
+    def _source_hash(self, source):
+        stat = source.stat()
+        key = (str(source), stat.st_mtime_ns, stat.st_size)
+        digest = self._hashes.get(key)
+        if digest is None:
+            with open(source, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            self._hashes[key] = digest
+        return digest
+
+    def _sidecar_path(self, source, digest):
+        return self.output_dir / f"{source.stem}.{digest[:10]}.json"
+
+    def _read_sidecar(self, source, digest):
+        """Variants from a finished earlier run (the sidecar is written after every derivative)"""
+        sidecar = self._sidecar_path(source, digest)
+        if not sidecar.exists():
+            return None
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            variants = json.load(f)
+        return variants if set(self.formats) <= set(variants['formats']) else None
+
+    @contextmanager
+    def _generation_lock(self, source, digest):
+        """Let one thread or process generate an image's derivatives while the others wait
+
+        Render and refresh workers are separate processes that often need the same
+        image (every post ends with the in-love-and-unity one), so a thread lock alone
+        would let each of them encode it again.
+        """
+        if fcntl is None:
+            with self._lock:
+                yield
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        lock_path = self.output_dir / f".{source.stem}.{digest[:10]}.lock"
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                # Waiters still holding the old file find the sidecar once they get the lock
+                lock_path.unlink(missing_ok=True)
+
+    def ensure(self, source):
+        """Return the derivatives of `source`, generating them if the source changed
+
+        Returns a dict with 'width', 'height', 'fallback' and 'formats'
+        (format -> [[width, file_name], ...] from narrowest to widest), or
+        None if Pillow is missing or the image can't be processed.
+        """
+        if not self.enabled:
+            return None
+        source = Path(source)
+        if source.suffix.lower() not in SOURCE_EXTENSIONS or not source.is_file():
+            return None
+        try:
+            digest = self._source_hash(source)
+            variants = self._variants.get(digest)
+            if variants is not None:
+                return variants
+
+            variants = self._read_sidecar(source, digest)
+            if variants is None:
+                with self._generation_lock(source, digest):
+                    # Another worker may have finished them while this one waited
+                    variants = self._read_sidecar(source, digest) or self._generate(source, digest)
+            self._variants[digest] = variants
+            return variants
+        except Exception as e:
+            print(f"⚠️  Could not create image derivatives for {source.name}: {e}")
+            return None
+
+    def _generate(self, source, digest):
+        """Resize and encode every width/format, then write the sidecar"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with Image.open(source) as opened:
+            image = ImageOps.exif_transpose(opened)
+            image.load()
+        # Keep PNG for images that may be transparent, JPEG for everything else
+        has_alpha = image.mode in ('RGBA', 'LA', 'P')
+        fallback = 'png' if has_alpha and source.suffix.lower() not in ('.jpg', '.jpeg') else 'jpg'
+        if fallback == 'jpg' and image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        # Widest derivative is the original width (capped); skip widths too close to it
+        widest = min(image.width, self.widths[-1])
+        widths = [width for width in self.widths if width < widest * 0.9] + [widest]
+
+        variants = {
+            'source': source.name,
+            'source_hash': digest,
+            'width': image.width,
+            'height': image.height,
+            'fallback': fallback,
+            'formats': {}
+        }
+        stem = f"{source.stem}.{digest[:10]}"
+        for format_name in self.formats + [fallback]:
+            files = []
+            for width in widths:
+                file_name = f"{stem}.{width}w.{format_name}"
+                target = self.output_dir / file_name
+                if not target.exists():
+                    height = round(image.height * width / image.width)
+                    resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                    self._save(resized, target, format_name)
+                files.append([width, file_name])
+            variants['formats'][format_name] = files
+
+        atomic_write_json(self._sidecar_path(source, digest), variants, indent=2)
+        return variants
+
+    def _save(self, image, target, format_name):
+        atomic_write(target, lambda f: image.save(f, **SAVE_OPTIONS[format_name]), binary=True)
+
+def main():
+    """Generate derivatives for every image in assets/images/blog and report the savings"""
+    images_dir = Path(__file__).parent.parent / "assets" / "images" / "blog"
+    derivatives = ImageDerivatives(images_dir / "derivatives")
+    if not derivatives.enabled:
+        print("❌ Pillow is not installed (pip install Pillow) - nothing to do")
+        sys.exit(1)
+    print(f"🖼️  Formats: {', '.join(derivatives.formats + ['jpg/png fallback'])}")
+
+    start_time = time.time()
+    original_bytes = 0
+    mobile_bytes = 0
+    for source in sorted(images_dir.iterdir()):
+        variants = derivatives.ensure(source)
+        if not variants:
+            continue
+        best_format = (derivatives.formats or [variants['fallback']])[0]
+        _, mobile_name = largest(variants, best_format, max_width=960)
+        mobile_file = derivatives.output_dir / mobile_name
+        original_bytes += source.stat().st_size
+        mobile_bytes += mobile_file.stat().st_size
+        print(f"   {source.name}: {source.stat().st_size // 1024} KB -> "
+              f"{mobile_file.stat().st_size // 1024} KB ({mobile_file.name})")
+
+    if original_bytes:
+        print(f"\n📉 Originals {original_bytes // 1024} KB -> {mobile_bytes // 1024} KB at <=960px "
+              f"({100 - mobile_bytes * 100 // original_bytes}% smaller)")
+    print(f"⏱️  {time.time() - start_time:.1f}s")
+
+if __name__ == "__main__":
+    main()
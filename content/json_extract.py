@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+JSON Extract
+Finds the JSON payload in a model response (bare, fenced in ```json, or surrounded by prose)
+in one linear, brace- and string-aware pass
+"""
+
+import json
+import re
+
+FENCE_OPEN = re.compile(r'```(?:json)?[ \t]*\r?\n')
+FENCE_CLOSE = re.compile(r'\n[ \t]*```')
+# Inside an object: a brace, or a whole JSON string (skipped in one match, braces in it ignored)
+OBJECT_TOKEN = re.compile(r'[{}]|"[^"\\]*(?:\\.[^"\\]*)*"')
+
+_decoder = json.JSONDecoder()
+
+def balanced_spans(text):
+    """(start, end) of every top-level {...} in `text`, found in one pass
+
+    Quotes only count inside an object, so apostrophes and quotes in the
+    surrounding prose can't throw the scan off; braces inside JSON strings
+    are skipped. An object that never closes is reported as running to the
+    end of the text.
+    """
+    spans = []
+    pos = 0
+    while True:
+        start = text.find('{', pos)
+        if start < 0:
+            return spans
+        depth = 0
+        for match in OBJECT_TOKEN.finditer(text, start):
+            token = match.group()
+            if token == '{':
+                depth += 1
+            elif token == '}':
+                depth -= 1
+                if depth == 0:
+                    spans.append((start, match.end()))
+                    pos = match.end()
+                    break
+        else:
+            spans.append((start, len(text)))
+            return spans
+
+def fenced_blocks(text):
+    """Contents of the ``` / ```json fenced blocks in `text`"""
+    pos = 0
+    while True:
+        opening = FENCE_OPEN.search(text, pos)
+        if not opening:
+            return
+        closing = FENCE_CLOSE.search(text, opening.end())
+        if not closing:
+            return
+        yield text[opening.end():closing.start()].rstrip('\r')
+        pos = closing.end()
+
+def _loads(candidate):
+    try:
+        return json.loads(candidate)
+    except (ValueError, RecursionError):
+        return None
+
+def raw_decode_largest(text, start=0, end=None):
+    """(value, length) of the largest object raw_decode reads from a '{' in text[start:end]
+
+    A failed attempt resumes after the point where decoding stopped, so the
+    scan stays linear and a truncated or broken object is never mined for
+    fragments (a cut-off response yields None, not its metadata object).
+    """
+    end = len(text) if end is None else end
+    best = None
+    best_length = 0
+    pos = text.find('{', start, end)
+    while pos >= 0:
+        try:
+            value, value_end = _decoder.raw_decode(text, pos)
+        except json.JSONDecodeError as e:
+            pos = text.find('{', max(e.pos, pos + 1), end)
+            continue
+        except RecursionError:
+            break
+        if value_end - pos > best_length:
+            best, best_length = value, value_end - pos
+        pos = text.find('{', value_end, end)
+    return best, best_length
+
+def extract_json(text):
+    """Return the JSON value in a model response, or None
+
+    Tried in order: the whole response, fenced ```json blocks, then the
+    balanced top-level objects, largest first. A span that doesn't parse (a
+    stray brace in the prose merged it with its surroundings, or it never
+    closes) is searched with raw_decode instead.
+    """
+    stripped = text.strip()
+    if stripped[:1] in ('{', '['):
+        value = _loads(stripped)
+        if value is not None:
+            return value
+
+    for block in fenced_blocks(text):
+        value = _loads(block)
+        if value is not None:
+            return value
+
+    best = None
+    best_length = 0
+    for start, end in sorted(balanced_spans(text), key=lambda span: span[0] - span[1]):
+        if end - start <= best_length:
+            break
+        value = _loads(text[start:end])
+        if value is not None:
+            return value
+        value, length = raw_decode_largest(text, start, end)
+        if length > best_length:
+            best, best_length = value, length
+    return best
@@ -4,7 +4,6 @@ Blog Explorer Refresh Tool
 Rebuilds blog-data.js from all published posts
 """
 
-import os
 import sys
 from pathlib import Path
 
@@ -19,9 +18,8 @@ def main():
     print("=" * 40)
     
     # No OAUTH token needed for this operation
-    # Temporarily set a dummy token to bypass the check
-    os.environ['CLAUDE_CODE_OAUTH_TOKEN'] = 'dummy-token-for-refresh'
-    processor = AutomatedClaudeProcessor(verbose=True, auto_update=False)
+    processor = AutomatedClaudeProcessor(verbose=True, auto_update=False, use_cache=False,
+                                         require_token=False)
     
     # Run the refresh
     success = processor.refresh_blog_explorer()
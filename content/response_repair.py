@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Response Repair
+Fixes mechanical validation issues in Claude's post JSON locally (publish date, the
+in-love-and-unity signature image, video sections) and applies the small JSON patches
+Claude returns for anything left over
+"""
+
+import copy
+import json
+
+UNITY_IMAGE_MARKER = 'in-love-and-unity'
+
+# Characters of section text shown in the outline sent with patch prompts
+OUTLINE_PREVIEW = 80
+
+# Members each patch operation needs besides `op` and `path`
+PATCH_OPERATION_MEMBERS = {
+    'add': ('value',), 'remove': (), 'replace': ('value',),
+    'move': ('from',), 'copy': ('from',), 'test': ('value',)
+}
+
+class JSONPatchError(Exception):
+    """A patch operation could not be applied"""
+
+def _pointer_parts(pointer):
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise JSONPatchError(f"invalid JSON pointer '{pointer}'")
+    return [part.replace('~1', '/').replace('~0', '~') for part in pointer[1:].split('/')]
+
+def _resolve(document, parts):
+    """Return (container, key) for the last pointer part"""
+    target = document
+    for part in parts[:-1]:
+        try:
+            target = target[int(part)] if isinstance(target, list) else target[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise JSONPatchError(f"path '/{'/'.join(parts)}' does not exist") from None
+    if not isinstance(target, (dict, list)):
+        raise JSONPatchError(f"path '/{'/'.join(parts)}' runs through a {type(target).__name__}, "
+                             f"not an object or array")
+    return target, parts[-1]
+
+def _list_index(container, key, allow_end=False):
+    if allow_end and key == '-':
+        return len(container)
+    try:
+        index = int(key)
+    except ValueError:
+        raise JSONPatchError(f"'{key}' is not an array index") from None
+    if not 0 <= index <= len(container) - (0 if allow_end else 1):
+        raise JSONPatchError(f"array index {index} out of range")
+    return index
+
+def _check_operation(operation):
+    """Reject a malformed operation before any of the patch is applied"""
+    if not isinstance(operation, dict):
+        raise JSONPatchError(f"patch operation {operation!r} is not an object")
+    op = operation.get('op')
+    if op not in PATCH_OPERATION_MEMBERS:
+        raise JSONPatchError(f"unsupported patch operation '{op}'")
+    for member in ('path',) + PATCH_OPERATION_MEMBERS[op]:
+        if member not in operation:
+            raise JSONPatchError(f"'{op}' operation has no '{member}'")
+    for member in ('path', 'from'):
+        if member in operation and not isinstance(operation[member], str):
+            raise JSONPatchError(f"'{op}' operation's '{member}' is not a string")
+
+def apply_json_patch(document, operations):
+    """Apply RFC 6902 add/remove/replace/move/copy/test operations to a copy of `document`"""
+    document = copy.deepcopy(document)
+    if not isinstance(operations, list):
+        raise JSONPatchError("patch must be a list of operations")
+    for operation in operations:
+        _check_operation(operation)
+    for operation in operations:
+        op = operation['op']
+        parts = _pointer_parts(operation['path'])
+        if not parts:
+            raise JSONPatchError("patching the whole document is not supported")
+        if op in ('move', 'copy'):
+            source, source_key = _resolve(document, _pointer_parts(operation['from']))
+            if isinstance(source, list):
+                index = _list_index(source, source_key)
+                value = source.pop(index) if op == 'move' else copy.deepcopy(source[index])
+            elif source_key in source:
+                value = source.pop(source_key) if op == 'move' else copy.deepcopy(source[source_key])
+            else:
+                raise JSONPatchError(f"'{operation['from']}' does not exist")
+            operation = {'op': 'add', 'path': operation['path'], 'value': value}
+            op = 'add'
+        container, key = _resolve(document, parts)
+        if op == 'add':
+            if isinstance(container, list):
+                container.insert(_list_index(container, key, allow_end=True), operation['value'])
+            else:
+                container[key] = operation['value']
+        elif op in ('remove', 'replace', 'test'):
+            if isinstance(container, list):
+                key = _list_index(container, key)
+            elif key not in container:
+                raise JSONPatchError(f"'{operation['path']}' does not exist")
+            if op == 'remove':
+                del container[key]
+            elif op == 'replace':
+                container[key] = operation['value']
+            elif container[key] != operation['value']:
+                raise JSONPatchError(f"test failed at '{operation['path']}'")
+    return document
+
+def section_outline(structured_data):
+    """Short per-section summary (index, type, order, title, text preview) for patch prompts"""
+    outline = []
+    for index, section in enumerate(structured_data.get('content', {}).get('sections', [])):
+        content = section.get('content', {})
+        text = content.get('text') or ' '.join(content.get('paragraphs', [])[:1])
+        entry = {'index': index, 'type': section.get('type'), 'order': section.get('order')}
+        if section.get('title'):
+            entry['title'] = section['title']
+        for key in ('src', 'url', 'title'):
+            if content.get(key):
+                entry[key] = content[key]
+        if text:
+            entry['preview'] = text[:OUTLINE_PREVIEW] + ('...' if len(text) > OUTLINE_PREVIEW else '')
+        outline.append(entry)
+    return outline
+
+def parse_patch(parsed):
+    """Operations from a patch response ({"patch": [...]} or a bare list)"""
+    if isinstance(parsed, dict):
+        parsed = parsed.get('patch')
+    if not isinstance(parsed, list):
+        raise JSONPatchError("response has no 'patch' list")
+    return parsed
+
+def patch_summary(operations):
+    return ', '.join(f"{operation.get('op')} {operation.get('path')}" for operation in operations)
+
+def outline_json(structured_data):
+    return json.dumps({
+        'metadata': structured_data.get('metadata', {}),
+        'sections': section_outline(structured_data)
+    }, indent=2, ensure_ascii=False)
+
+class ResponseRepairer:
+    def __init__(self, verbose=False):
+        """Initialize the repairer
+
+        Args:
+            verbose: Print each local fix as it is made
+        """
+        self.verbose = verbose
+        self.fixers = [self.fix_publish_date, self.fix_unity_image, self.fix_video_sections]
+
+    def repair(self, structured_data, extracted_data):
+        """Return (repaired copy, list of fixes made) - no Claude calls"""
+        repaired = copy.deepcopy(structured_data)
+        section_count = len(repaired.get('content', {}).get('sections', []))
+        fixes = []
+        for fixer in self.fixers:
+            fix = fixer(repaired, extracted_data)
+            if fix:
+                fixes.append(fix)
+                if self.verbose:
+                    print(f"   🔧 {fix}")
+        if len(repaired.get('content', {}).get('sections', [])) != section_count:
+            self._renumber(repaired)
+        return repaired, fixes
+
+    @staticmethod
+    def _sections(structured_data):
+        content = structured_data.setdefault('content', {})
+        return content.setdefault('sections', [])
+
+    @staticmethod
+    def _renumber(structured_data):
+        """Make section order follow list order again after insertions"""
+        sections = structured_data.get('content', {}).get('sections', [])
+        orders = [section.get('order') for section in sections if isinstance(section.get('order'), int)]
+        start = 0 if not orders else min(orders)
+        if sections and sections[0].get('type') == 'video':
+            start = 0
+        for offset, section in enumerate(sections):
+            section['order'] = start + offset
+
+    def fix_publish_date(self, structured_data, extracted_data):
+        metadata = structured_data.setdefault('metadata', {})
+        expected_date = extracted_data['publish_date']
+        if metadata.get('publishDate') == expected_date:
+            return None
+        old_date = metadata.get('publishDate')
+        metadata['publishDate'] = expected_date
+        return f"Set publishDate to {expected_date} (was {old_date})"
+
+    def fix_unity_image(self, structured_data, extracted_data):
+        images = extracted_data['assets'].get('images') or []
+        unity_images = [image for image in images if image in ('in-love-and-unity.jpg', 'in-love-and-unity.png')]
+        if not unity_images:
+            return None
+        sections = self._sections(structured_data)
+        image_sections = [section for section in sections if section.get('type') == 'image']
+        if any(UNITY_IMAGE_MARKER in section.get('content', {}).get('src', '') for section in image_sections):
+            return None
+
+        # The image is there under another field name (imageUrl/url) - rename it
+        for section in image_sections:
+            content = section.setdefault('content', {})
+            for key in ('imageUrl', 'url', 'image'):
+                if UNITY_IMAGE_MARKER in str(content.get(key, '')):
+                    content['src'] = content.pop(key)
+                    return f"Moved the in-love-and-unity image from '{key}' to 'src'"
+
+        # Otherwise add it as the final section before the conclusion
+        section = {
+            'type': 'image',
+            'content': {'src': unity_images[0], 'alt': 'In Love and Unity signature image'}
+        }
+        position = len(sections)
+        if len(sections) > 1 and sections[-1].get('type') == 'text':
+            position -= 1
+        sections.insert(position, section)
+        return f"Added the {unity_images[0]} signature image section"
+
+    def fix_video_sections(self, structured_data, extracted_data):
+        videos = extracted_data['assets'].get('videos') or []
+        sections = self._sections(structured_data)
+        if not videos or any(section.get('type') == 'video' for section in sections):
+            return None
+
+        # First video is featured at the top, the rest go before the closing sections
+        sections.insert(0, {'type': 'video', 'content': {'url': videos[0]}})
+        position = len(sections)
+        for index in range(len(sections) - 1, 0, -1):
+            if (sections[index].get('type') == 'image'
+                    and UNITY_IMAGE_MARKER in sections[index].get('content', {}).get('src', '')):
+                position = index
+                break
+        else:
+            if len(sections) > 2 and sections[-1].get('type') == 'text':
+                position -= 1
+        for url in videos[1:]:
+            sections.insert(position, {'type': 'video', 'content': {'url': url}})
+            position += 1
+        return f"Added {len(videos)} video section{'s' if len(videos) != 1 else ''} from the assets"
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Slug Index
+Persistent index of published post slugs for fast exact and similar-slug duplicate detection
+"""
+
+import json
+import random
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from atomic_write import atomic_write_json
+
+# Slugs sharing more than this fraction of their words are considered the same post
+SIMILARITY_THRESHOLD = 0.7
+
+BLOG_DATA_SLUG_PATTERN = re.compile(r'''["']?slug["']?\s*:\s*"([^"]+)"''')
+
+def normalize_slug(slug):
+    """Normalize a slug: underscores to hyphens, collapse '--', trim, lowercase"""
+    return slug.replace('_', '-').replace('--', '-').strip('-').lower()
+
+def slug_words(normalized_slug):
+    return frozenset(normalized_slug.split('-'))
+
+def slugs_similar(slug1, slug2):
+    """Check if two slugs are similar (same core words)"""
+    norm_slug1 = normalize_slug(slug1)
+    norm_slug2 = normalize_slug(slug2)
+    if norm_slug1 == norm_slug2:
+        return True
+    words1 = slug_words(norm_slug1)
+    words2 = slug_words(norm_slug2)
+    return len(words1 & words2) / max(len(words1), len(words2)) > SIMILARITY_THRESHOLD
+
+class _SlugSet:
+    """Normalized slugs with their word sets and an inverted word -> slug map"""
+
+    def __init__(self):
+        self.originals = {}                # normalized slug -> original value (slug or dir name)
+        self.words = {}                    # normalized slug -> frozenset of words
+        self.inverted = defaultdict(set)   # word -> normalized slugs containing it
+
+    def add(self, slug, original=None):
+        norm = normalize_slug(slug)
+        if norm in self.originals:
+            return
+        self.originals[norm] = original if original is not None else slug
+        self.words[norm] = slug_words(norm)
+        for word in self.words[norm]:
+            self.inverted[word].add(norm)
+
+    def find_similar(self, slug):
+        """Return the original value of the most similar slug, or None"""
+        norm = normalize_slug(slug)
+        if norm in self.originals:
+            return self.originals[norm]
+
+        query_words = slug_words(norm)
+        shared = defaultdict(int)
+        for word in query_words:
+            for candidate in self.inverted.get(word, ()):
+                shared[candidate] += 1
+
+        # Highest overlap wins; ties go to the alphabetically first slug
+        best, best_key = None, None
+        for candidate, count in shared.items():
+            score = count / max(len(query_words), len(self.words[candidate]))
+            if score > SIMILARITY_THRESHOLD:
+                key = (-score, candidate)
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+        return self.originals[best] if best is not None else None
+
+    def __len__(self):
+        return len(self.originals)
+
+class SlugIndex:
+    def __init__(self, output_dir, blog_data_file, index_file=None, blog_data_store=None):
+        """Initialize the index
+
+        Args:
+            output_dir: content/blog/published (post directories named YYYY-MM-DD_slug)
+            blog_data_file: assets/js/blog-data.js
+            index_file: Optional JSON file the index is persisted to
+            blog_data_store: Optional BlogDataStore to read explorer slugs from
+                instead of scanning blog-data.js
+        """
+        self.output_dir = Path(output_dir)
+        self.blog_data_file = Path(blog_data_file)
+        self.index_file = Path(index_file) if index_file else None
+        self.blog_data_store = blog_data_store
+        self.published = _SlugSet()
+        self.blog_data = _SlugSet()
+        self.blog_data_exact = set()
+        self._loaded = False
+
+    def _signature(self):
+        """mtimes of the published directory and blog-data.js, to detect outside edits"""
+        def stat_key(path):
+            try:
+                stat = path.stat()
+                return [stat.st_mtime_ns, stat.st_size]
+            except FileNotFoundError:
+                return None
+        return {'published': stat_key(self.output_dir), 'blog_data': stat_key(self.blog_data_file)}
+
+    def ensure_loaded(self):
+        """Load the persisted index, rebuilding it if the sources changed since it was saved"""
+        if self._loaded:
+            return
+        if self.index_file and self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('signature') == self._signature():
+                    for dir_name in data.get('post_dirs', []):
+                        self._add_post_dir(dir_name)
+                    for slug in data.get('blog_data_slugs', []):
+                        self._add_blog_data_slug(slug)
+                    self._loaded = True
+                    return
+            except (OSError, json.JSONDecodeError):
+                pass
+        self.rebuild()
+
+    def rebuild(self):
+        """Build the index from the published directories and blog-data.js"""
+        self.published = _SlugSet()
+        self.blog_data = _SlugSet()
+        self.blog_data_exact = set()
+        if self.output_dir.exists():
+            for dir_path in self.output_dir.iterdir():
+                if dir_path.is_dir():
+                    self._add_post_dir(dir_path.name)
+        if self.blog_data_store is not None:
+            for slug in self.blog_data_store.slugs():
+                self._add_blog_data_slug(slug)
+        elif self.blog_data_file.exists():
+            with open(self.blog_data_file, 'r', encoding='utf-8') as f:
+                for slug in BLOG_DATA_SLUG_PATTERN.findall(f.read()):
+                    self._add_blog_data_slug(slug)
+        self._loaded = True
+        self.save()
+
+    def _add_post_dir(self, dir_name):
+        # Directory format: YYYY-MM-DD_slug
+        if '_' in dir_name:
+            self.published.add('_'.join(dir_name.split('_')[1:]), dir_name)
+
+    def _add_blog_data_slug(self, slug):
+        self.blog_data_exact.add(slug)
+        self.blog_data.add(slug)
+
+    def add_post_dir(self, dir_name):
+        """Record a newly saved post directory and persist the index"""
+        self.ensure_loaded()
+        self._add_post_dir(dir_name)
+        self.save()
+
+    def add_blog_data_slug(self, slug):
+        """Record a slug newly written to blog-data.js and persist the index"""
+        self.ensure_loaded()
+        self._add_blog_data_slug(slug)
+        self.save()
+
+    def find(self, slug):
+        """Find an existing post matching `slug`
+
+        Returns (match_type, value) where match_type is 'similar_match' (value
+        is the post directory name), 'blog_data_exact_match' or
+        'blog_data_similar_match' (value is the slug), or (None, None).
+        """
+        self.ensure_loaded()
+        dir_name = self.published.find_similar(slug)
+        if dir_name:
+            return 'similar_match', dir_name
+        if slug in self.blog_data_exact:
+            return 'blog_data_exact_match', slug
+        existing_slug = self.blog_data.find_similar(slug)
+        if existing_slug:
+            return 'blog_data_similar_match', existing_slug
+        return None, None
+
+    def save(self):
+        """Persist the index (atomic replace) together with the source signature"""
+        if not self.index_file:
+            return
+        data = {
+            'signature': self._signature(),
+            'post_dirs': sorted(self.published.originals.values()),
+            'blog_data_slugs': sorted(self.blog_data_exact)
+        }
+        atomic_write_json(self.index_file, data)
+
+def benchmark(post_count=5000, queries=2000):
+    """Time similar-slug lookups against a synthetic archive"""
+    vocabulary = [f"word{i}" for i in range(3000)]
+    rng = random.Random(42)
+    slug_set = _SlugSet()
+    slugs = []
+    for i in range(post_count):
+        slug = '-'.join(rng.sample(vocabulary, rng.randint(3, 9)))
+        slugs.append(slug)
+        slug_set.add(slug, f"2024-01-01_{slug}")
+
+    probes = [rng.choice(slugs) + '-extra' if i % 2 else '-'.join(rng.sample(vocabulary, 5))
+              for i in range(queries)]
+    start = time.perf_counter()
+    hits = sum(1 for probe in probes if slug_set.find_similar(probe))
+    elapsed = time.perf_counter() - start
+    print(f"📚 {post_count} slugs indexed, {queries} queries ({hits} similar matches)")
+    print(f"⚡ {elapsed / queries * 1e6:.1f} µs per query")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON
+Incremental scanner that follows a JSON object as it arrives in chunks and reports completed
+values by path, so a response can be checked before it has finished streaming
+"""
+
+import json
+import re
+
+STRING_SPECIAL = re.compile(r'["\\]')
+LITERALS = {'true': True, 'false': False, 'null': None}
+
+class StreamingJSONScanner:
+    """Follow the first JSON object in a stream of text chunks
+
+    Text before the first '{' (prose, a ```json fence) and anything after the
+    object closes is ignored. Paths are tuples of object keys and array
+    indexes, e.g. ('content', 'sections', 2, 'type').
+
+    Args:
+        on_value: Called as on_value(path, value) for every completed string,
+            number, true/false/null
+        on_close: Called as on_close(path, kind) when an object ('{') or
+            array ('[') closes
+    """
+
+    def __init__(self, on_value=None, on_close=None):
+        self.on_value = on_value or (lambda path, value: None)
+        self.on_close = on_close or (lambda path, kind: None)
+        self.started = False
+        self.done = False
+        self._stack = []         # frames: [kind, key or index, expecting_key]
+        self._in_string = False
+        self._string = []
+        self._string_is_key = False
+        self._escape = False
+        self._scalar = []
+
+    def _path(self):
+        return tuple(frame[1] for frame in self._stack)
+
+    def _emit_scalar(self):
+        if not self._scalar:
+            return
+        text = ''.join(self._scalar)
+        self._scalar = []
+        if text in LITERALS:
+            value = LITERALS[text]
+        else:
+            try:
+                value = json.loads(text)
+            except ValueError:
+                value = text
+        self.on_value(self._path(), value)
+
+    def _end_string(self):
+        raw = ''.join(self._string)
+        self._string = []
+        try:
+            value = json.loads('"' + raw + '"')
+        except ValueError:
+            value = raw
+        top = self._stack[-1]
+        if self._string_is_key:
+            top[1] = value
+        else:
+            self.on_value(self._path(), value)
+
+    def feed(self, chunk):
+        """Consume the next piece of text"""
+        i = 0
+        n = len(chunk)
+        while i < n and not self.done:
+            if self._in_string:
+                if self._escape:
+                    self._string.append(chunk[i])
+                    self._escape = False
+                    i += 1
+                    continue
+                # Copy plain string content in one slice
+                match = STRING_SPECIAL.search(chunk, i)
+                if not match:
+                    self._string.append(chunk[i:])
+                    return
+                self._string.append(chunk[i:match.start()])
+                i = match.end()
+                if match.group() == '\\':
+                    self._string.append('\\')
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    self._end_string()
+                continue
+
+            c = chunk[i]
+            i += 1
+            if not self.started:
+                if c == '{':
+                    self.started = True
+                    self._stack.append(['{', None, True])
+                continue
+            if c == '"':
+                top = self._stack[-1]
+                self._in_string = True
+                self._string_is_key = top[0] == '{' and top[2]
+            elif c == '{' or c == '[':
+                self._stack.append([c, None if c == '{' else 0, c == '{'])
+            elif c == '}' or c == ']':
+                self._emit_scalar()
+                kind = self._stack.pop()[0]
+                self.on_close(self._path(), kind)
+                if not self._stack:
+                    self.done = True
+            elif c == ':':
+                self._stack[-1][2] = False
+            elif c == ',':
+                self._emit_scalar()
+                top = self._stack[-1]
+                if top[0] == '[':
+                    top[1] += 1
+                else:
+                    top[2] = True
+            elif c in ' \t\r\n':
+                self._emit_scalar()
+            else:
+                self._scalar.append(c)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for response_repair's JSON patch handling
+Run with: python -m pytest test_response_repair.py (or python -m unittest test_response_repair)
+"""
+
+import unittest
+
+from response_repair import JSONPatchError, apply_json_patch, parse_patch
+
+DOCUMENT = {
+    'metadata': {'title': 'Post', 'publishDate': '2024-01-01', 'wordCount': 900},
+    'content': {'sections': [{'type': 'paragraph', 'content': {'text': 'Hello'}}]}
+}
+
+class ApplyJSONPatchTest(unittest.TestCase):
+    def test_applies_valid_operations_to_a_copy(self):
+        patched = apply_json_patch(DOCUMENT, [
+            {'op': 'replace', 'path': '/metadata/title', 'value': 'New title'},
+            {'op': 'add', 'path': '/content/sections/-', 'value': {'type': 'quote'}},
+            {'op': 'move', 'from': '/metadata/wordCount', 'path': '/metadata/words'},
+            {'op': 'test', 'path': '/metadata/words', 'value': 900}
+        ])
+        self.assertEqual(patched['metadata'], {'title': 'New title', 'publishDate': '2024-01-01', 'words': 900})
+        self.assertEqual(len(patched['content']['sections']), 2)
+        self.assertEqual(DOCUMENT['metadata']['title'], 'Post')
+
+    def test_rejects_malformed_operations(self):
+        malformed = {
+            'not an object': ['x'],
+            'unknown op': [{'op': 'merge', 'path': '/metadata'}],
+            'missing op': [{'path': '/metadata/title', 'value': 'x'}],
+            'missing path': [{'op': 'remove'}],
+            'non-string path': [{'op': 'remove', 'path': 3}],
+            'add without value': [{'op': 'add', 'path': '/metadata/slug'}],
+            'replace without value': [{'op': 'replace', 'path': '/metadata/title'}],
+            'test without value': [{'op': 'test', 'path': '/metadata/title'}],
+            'move without from': [{'op': 'move', 'path': '/metadata/title'}],
+            'non-string from': [{'op': 'copy', 'from': ['metadata'], 'path': '/metadata/x'}],
+            'path through an int': [{'op': 'add', 'path': '/metadata/wordCount/x', 'value': 1}],
+            'path through a string': [{'op': 'replace', 'path': '/metadata/title/0', 'value': 'x'}],
+            'from through an int': [{'op': 'copy', 'from': '/metadata/wordCount/x', 'path': '/metadata/x'}],
+            'not a list': {'op': 'remove', 'path': '/metadata/title'}
+        }
+        for name, operations in malformed.items():
+            with self.subTest(name), self.assertRaises(JSONPatchError):
+                apply_json_patch(DOCUMENT, operations)
+
+    def test_malformed_operation_applies_nothing(self):
+        with self.assertRaises(JSONPatchError):
+            apply_json_patch(DOCUMENT, [{'op': 'remove', 'path': '/metadata/title'}, 'x'])
+        self.assertIn('title', DOCUMENT['metadata'])
+
+    def test_parse_patch_needs_a_list(self):
+        self.assertEqual(parse_patch({'patch': []}), [])
+        with self.assertRaises(JSONPatchError):
+            parse_patch({'patch': 'remove everything'})
+
+if __name__ == '__main__':
+    unittest.main()
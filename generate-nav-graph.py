@@ -2,20 +2,115 @@
 """
 Extract Website Navigation Graph from HTML Files
 Generates clean hierarchical Graphviz visualization with clusters
+
+Usage:
+  python3 generate-nav-graph.py            # Parse changed pages and render images, one worker per CPU
+  python3 generate-nav-graph.py --jobs 1   # Parse and render serially
+  python3 generate-nav-graph.py --benchmark   # Streaming tokenizer vs the old regex extractor
+  python3 generate-nav-graph.py --json     # Also add newly discovered pages/links to navigation-graph.json
+  python3 generate-nav-graph.py --watch    # Regenerate the outputs whenever a page changes (add --json for the JSON too)
+  python3 generate-nav-graph.py --watch --poll   # Same, polling mtimes instead of inotify
 """
 
+import codecs
+import ctypes
+import ctypes.util
+import hashlib
+import html
+import io
+import json
 import os
 import re
+import select
+import shutil
+import struct
+import subprocess
 import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from collections import defaultdict
 
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The blog pipeline's atomic-write helper, shared so the two can't drift apart
+sys.path.insert(0, os.path.join(BASE_DIR, 'content'))
+from atomic_write import atomic_write, atomic_write_json, atomic_write_text
 DOT_OUTPUT = os.path.join(BASE_DIR, 'website-nav.dot')
 IMAGE_OUTPUT = os.path.join(BASE_DIR, 'website-nav-graph.png')
 SVG_OUTPUT = os.path.join(BASE_DIR, 'website-nav-graph.svg')
+JSON_OUTPUT = os.path.join(BASE_DIR, 'navigation-graph.json')
 DPI = 120
+# Graphviz options per image format of the full graph
+RENDER_FORMATS = {
+    'png': (IMAGE_OUTPUT, ['-Tpng', f'-Gdpi={DPI}', '-Gratio=3.0', '-Gbgcolor=#1a1a2e']),
+    'svg': (SVG_OUTPUT, ['-Tsvg', '-Gratio=3.0', '-Gbgcolor=#1a1a2e'])
+}
+# One PNG per cluster (its pages, their neighbours and every link between them)
+CLUSTER_OUTPUT_DIR = os.path.join(BASE_DIR, 'website-nav-clusters')
+CLUSTER_RENDER_OPTIONS = ['-Tpng', f'-Gdpi={DPI}', '-Gbgcolor=#1a1a2e']
+RENDER_TIMEOUT = 300  # seconds allowed per dot process
+
+# Links extracted from each page, reused while the page is unchanged
+LINK_CACHE = os.path.join(BASE_DIR, '.cache', 'nav-graph-links.json')
+LINK_CACHE_VERSION = 2  # bump when extract_links changes what it returns
+SKIP_DIRS = ['node_modules', '.git', '__pycache__', 'prototypes', 'development-archive',
+             'visualizations-archive', 'blog', 'templates']
+# Rendered images by sha256 of DOT + options (<hash>.png / <hash>.svg), most recently used RENDER_CACHE_SIZE kept
+RENDER_CACHE = os.path.join(BASE_DIR, '.cache', 'nav-graph-renders')
+RENDER_STATE = os.path.join(RENDER_CACHE, 'current.json')
+RENDER_CACHE_SIZE = 200
+# Below this many pages to parse, starting worker processes costs more than it saves
+MIN_PARALLEL_PAGES = 16
+
+# Link extraction: attributes that point at another page, read READ_CHUNK bytes at a time
+LINK_ATTRIBUTES = ('href', 'src', 'action')
+READ_CHUNK = 64 * 1024
+EXTERNAL_PREFIXES = ('#', 'javascript:', 'mailto:', 'tel:', 'http:', 'https:', 'data:', '//')
+# A start tag; '>' may appear inside quoted attribute values
+START_TAG = re.compile(r'<([a-zA-Z][^\s/>]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>')
+TAG_ATTRIBUTE = re.compile(r'([^\s"\'>/=]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'=<>`]+)))?')
+# Elements whose content is text, never markup, and the pattern that ends them (or a comment)
+RAW_TEXT_ELEMENTS = ('script', 'style', 'textarea', 'title')
+END_MARKERS = {tag: re.compile('</' + tag, re.IGNORECASE) for tag in RAW_TEXT_ELEMENTS}
+END_MARKERS['!--'] = re.compile('-->')
+# Where the scanner needs to stop: a comment, a raw-text element, or a start tag with a link
+# attribute somewhere in it (everything else is skipped inside the regex engine)
+INTERESTING = re.compile(r'<!--|<(?:script|style|textarea|title)(?=[\s/>])'
+                         r'|<[a-zA-Z][^\s/>]*\s(?:[^>"\']|"[^"]*"|\'[^\']*\')*?\b(?:href|src|action)\s*=',
+                         re.IGNORECASE)
+# Longest start tag held back waiting for its '>' (anything longer isn't treated as a tag)
+MAX_TAG = 16 * 1024
+
+# Watch mode: regenerate once pages have been quiet for DEBOUNCE seconds (or MAX_DEBOUNCE
+# after the first change during a long burst of saves)
+DEBOUNCE = 0.5
+MAX_DEBOUNCE = 5.0
+POLL_INTERVAL = 1.0  # seconds between mtime scans when inotify isn't available
+IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO = 0x008, 0x040, 0x080
+IN_CREATE, IN_DELETE, IN_Q_OVERFLOW, IN_IGNORED, IN_ISDIR = 0x100, 0x200, 0x4000, 0x8000, 0x40000000
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+RESCAN = None  # reported by a watcher that lost events: every page must be re-checked
+
+# navigation-graph.json type and level for pages the scan adds, by cluster
+NODE_TYPES = {
+    'Entry': ('entry', 0),
+    'Primary Modes': ('mode', 1),
+    'Content Hubs': ('content', 2),
+    'Utility': ('utility', 1),
+    'About': ('about', 2),
+    'About Sub-pages': ('about', 3),
+    'Series': ('series', 3),
+    'Special': ('content', 2),
+    'Learn Sub-pages': ('content', 3),
+    'Business Sub-pages': ('business', 3),
+    'Interact Sub-pages': ('interactive', 2),
+    'Blog Posts': ('blog', 4),
+    'Prototypes': ('prototype', 3),
+    'Visualizations': ('visualization', 3)
+}
 
 # Define strict hierarchy
 CLUSTER_DEFINITION = {
@@ -82,6 +177,35 @@ CLUSTER_DEFINITION = {
     }
 }
 
+# Clusters drawn in the DOT, in order
+CLUSTER_ORDER = [
+    'Entry',
+    'Primary Modes',
+    'Content Hubs',
+    'Utility',
+    'About',
+    'Series',
+    'Special',
+    'Blog Posts',
+    'Prototypes',
+    'Visualizations',
+    'Other'
+]
+
+CLUSTER_COLORS = {
+    'Entry': '#FFD700',
+    'Primary Modes': '#8B5CF6',
+    'Content Hubs': '#A78BFA',
+    'Utility': '#6B7280',
+    'About': '#F472B6',
+    'Series': '#FB923C',
+    'Special': '#C084FC',
+    'Blog Posts': '#F9A8D4',
+    'Prototypes': '#818CF8',
+    'Visualizations': '#38BDF8',
+    'Other': '#E5E7EB'
+}
+
 def categorize_page(page_path):
     """Categorize a page and get its color"""
     filename = os.path.basename(page_path)
@@ -145,11 +269,108 @@ def categorize_page(page_path):
     
     return 'Other', '#E5E7EB'
 
+class TagScanner:
+    """Incremental start-tag tokenizer collecting href/src/action values from chunks of HTML
+
+    Text, comments and the bodies of <script>/<style> are skipped as they
+    arrive rather than buffered, so memory stays bounded by one chunk plus
+    one unfinished tag. Quoted and unquoted attribute values are read and
+    entity-decoded; tags inside scripts and comments are not taken for links.
+    """
+
+    def __init__(self):
+        self.links = []
+        self._tail = ''
+        self._end_marker = None  # END_MARKERS pattern while inside a comment / raw-text element
+
+    def feed(self, chunk):
+        data = self._tail + chunk
+        self._tail = ''
+        pos = 0
+        while True:
+            if self._end_marker:
+                end = self._end_marker.search(data, pos)
+                if not end:
+                    # Keep just enough to spot a marker split across two chunks
+                    self._tail = data[max(pos, len(data) - len(self._end_marker.pattern) + 1):]
+                    return
+                pos = end.end()
+                self._end_marker = None
+
+            found = INTERESTING.search(data, pos)
+            if not found:
+                break
+            lt = found.start()
+            if data.startswith('<!--', lt):
+                self._end_marker = END_MARKERS['!--']
+                pos = lt + 4
+                continue
+            match = START_TAG.match(data, lt)
+            if match:
+                self._start_tag(match.group(1).lower(), match.group(2))
+                pos = match.end()
+            elif len(data) - lt < MAX_TAG:
+                # A tag whose '>' is in the next chunk
+                self._tail = data[lt:]
+                return
+            else:
+                pos = lt + 1
+
+        # Hold back a trailing '<' that may begin a tag or comment split across chunks
+        lt = data.rfind('<', pos)
+        if lt >= 0 and len(data) - lt < MAX_TAG and not START_TAG.match(data, lt):
+            self._tail = data[lt:]
+
+    def _start_tag(self, tag, attributes):
+        for match in TAG_ATTRIBUTE.finditer(attributes):
+            if match.group(1).lower() in LINK_ATTRIBUTES:
+                value = match.group(2) or match.group(3) or match.group(4)
+                if value:
+                    self.links.append(html.unescape(value))
+        if tag in END_MARKERS:
+            self._end_marker = END_MARKERS[tag]
+
+    def close(self):
+        self._tail = ''
+
+def internal_links(links):
+    """Links to pages on this site, without their #fragment or ?query"""
+    internal = []
+    for link in links:
+        link = link.strip()
+        if not link or link.startswith(EXTERNAL_PREFIXES):
+            continue
+        link = link.split('#', 1)[0].split('?', 1)[0]
+        if link:
+            internal.append(link)
+    return internal
+
+def stream_links(html_file):
+    """(sha256, internal links) of an HTML file, read and tokenized READ_CHUNK bytes at a time"""
+    digest = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    parser = TagScanner()
+    with open(html_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK), b''):
+            digest.update(chunk)
+            parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    return digest.hexdigest(), internal_links(parser.links)
+
 def extract_links(html_file):
-    """Extract internal href links from HTML file"""
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
+    """Extract internal href/src/action links from HTML file"""
+    return stream_links(html_file)[1]
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def extract_links_regex(content):
+    """The previous extractor: <a href="..."> over the whole document (kept for --benchmark)"""
     links = re.findall(r'<a\s+[^>]*href=["\']([^"\']+)["\']', content, re.IGNORECASE)
     
     internal_links = []
@@ -166,45 +387,196 @@ def get_relative_path(full_path, base_dir):
     """Get path relative to base directory"""
     return str(Path(full_path).relative_to(base_dir))
 
-def build_navigation_graph():
-    """Scan all HTML files and build navigation graph"""
-    graph = defaultdict(set)
-    page_info = {}
-    
+def load_link_cache():
+    """{relative path: {'mtime', 'size', 'sha256', 'links'}} from the last run"""
+    try:
+        with open(LINK_CACHE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != LINK_CACHE_VERSION:
+        return {}
+    return cache.get('pages', {})
+
+def save_link_cache(pages):
+    """Write the link cache atomically (temp file + rename)"""
+    atomic_write_json(LINK_CACHE, {'version': LINK_CACHE_VERSION, 'pages': pages})
+
+def parse_page(html_path, known_hash=None):
+    """(sha256, links) for one page; links is None when the content hash equals known_hash
+
+    Runs in a worker process. A page whose mtime changed but whose bytes
+    didn't (a checkout, a touch) is hashed but not parsed again.
+    """
+    if known_hash is not None and file_sha256(html_path) == known_hash:
+        return known_hash, None
+    return stream_links(html_path)
+
+def find_html_files():
+    """Every HTML page to graph, as (absolute path, path relative to BASE_DIR)"""
+    html_files = []
     for root, dirs, files in os.walk(BASE_DIR):
-        dirs[:] = [d for d in dirs if d not in ['node_modules', '.git', '__pycache__', 'prototypes', 'development-archive', 'visualizations-archive', 'blog']]
-        
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         for file in files:
             if file.endswith('.html'):
                 html_path = os.path.join(root, file)
-                node_name = get_relative_path(html_path, BASE_DIR)
-                
-                cluster_name, color = categorize_page(html_path)
-                page_info[node_name] = {
-                    'cluster': cluster_name,
-                    'color': color,
-                    'label': os.path.basename(node_name)
-                }
-                
-                try:
-                    links = extract_links(html_path)
-                    for link in links:
-                        if link.startswith('../'):
-                            resolved = os.path.normpath(os.path.join(os.path.dirname(node_name), link))
-                            graph[node_name].add(resolved)
-                        elif link.startswith('/') or link.startswith('./'):
-                            resolved = os.path.normpath(link.lstrip('/.'))
-                            graph[node_name].add(resolved)
-                        else:
-                            graph[node_name].add(link)
-                except Exception as e:
-                    print(f"Error processing {html_path}: {e}", file=sys.stderr)
+                html_files.append((html_path, get_relative_path(html_path, BASE_DIR)))
+    return html_files
+
+def _result_or_error(future, html_path):
+    try:
+        return future.result()
+    except Exception as e:
+        print(f"Error processing {html_path}: {e}", file=sys.stderr)
+        return None
+
+def collect_links(html_files, jobs=None):
+    """{relative path: links} for every page, parsing only pages that changed since the last run
+
+    A page is reused from the cache when its (mtime, size) match, or when
+    they don't but its sha256 does. Changed pages are parsed in a process
+    pool when there are enough of them to make it worthwhile.
+    """
+    cache = load_link_cache()
+    pages = {}
+    to_parse = []
+    for html_path, node_name in html_files:
+        try:
+            stat = os.stat(html_path)
+        except OSError as e:
+            print(f"Error processing {html_path}: {e}", file=sys.stderr)
+            continue
+        entry = cache.get(node_name)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            pages[node_name] = entry
+        else:
+            to_parse.append((html_path, node_name, stat, entry))
+    
+    parse_start = time.perf_counter()
+    paths = [html_path for html_path, _, _, _ in to_parse]
+    known_hashes = [entry['sha256'] if entry else None for _, _, _, entry in to_parse]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(to_parse) >= MIN_PARALLEL_PAGES:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(parse_page, path, known) for path, known in zip(paths, known_hashes)]
+            results = [_result_or_error(future, path) for future, path in zip(futures, paths)]
+    else:
+        results = []
+        for path, known in zip(paths, known_hashes):
+            try:
+                results.append(parse_page(path, known))
+            except Exception as e:
+                print(f"Error processing {path}: {e}", file=sys.stderr)
+                results.append(None)
+    
+    reparsed = 0
+    for (html_path, node_name, stat, entry), result in zip(to_parse, results):
+        if result is None:
+            continue
+        digest, links = result
+        if links is None:
+            links = entry['links']
+        else:
+            reparsed += 1
+        pages[node_name] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest, 'links': links}
+    
+    if to_parse or set(cache) != set(pages):
+        save_link_cache(pages)
+    print(f"✓ Parsed {reparsed} changed pages ({len(pages) - reparsed} from cache) "
+          f"in {time.perf_counter() - parse_start:.2f}s")
+    return {node_name: entry['links'] for node_name, entry in pages.items()}
+
+def resolve_links(node_name, links):
+    """Targets of a page's links, as paths relative to BASE_DIR"""
+    targets = set()
+    for link in links:
+        if link.startswith('../'):
+            targets.add(os.path.normpath(os.path.join(os.path.dirname(node_name), link)))
+        elif link.startswith('/') or link.startswith('./'):
+            targets.add(os.path.normpath(link.lstrip('/.')))
+        else:
+            targets.add(link)
+    return targets
+
+def build_navigation_graph(jobs=None):
+    """Scan all HTML files and build navigation graph"""
+    graph = defaultdict(set)
+    page_info = {}
+    
+    html_files = find_html_files()
+    links_by_page = collect_links(html_files, jobs)
+    for html_path, node_name in html_files:
+        cluster_name, color = categorize_page(html_path)
+        page_info[node_name] = {
+            'cluster': cluster_name,
+            'color': color,
+            'label': os.path.basename(node_name)
+        }
+        if links_by_page.get(node_name):
+            graph[node_name] = resolve_links(node_name, links_by_page[node_name])
     
     return graph, page_info
 
-def generate_dot_file(graph, page_info):
-    """Generate clean hierarchical DOT file"""
-    dot_content = '''digraph WebsiteNavigation {
+def is_graph_page(node_name):
+    """Whether a path relative to BASE_DIR is a page build_navigation_graph would scan"""
+    parts = Path(node_name).parts
+    return node_name.endswith('.html') and not any(part in SKIP_DIRS for part in parts[:-1])
+
+def update_pages(graph, page_info, pages, changed_paths):
+    """Apply added, edited and deleted pages to graph/page_info in place
+
+    `pages` is the link cache ({relative path: entry}) and is updated and
+    saved alongside. Only the pages in changed_paths are read; one whose
+    bytes are unchanged (an editor touching it) is left alone. Returns the
+    pages that actually changed.
+    """
+    updated = []
+    for html_path in sorted(changed_paths):
+        node_name = get_relative_path(html_path, BASE_DIR)
+        if not is_graph_page(node_name):
+            continue
+        try:
+            stat = os.stat(html_path)
+            entry = pages.get(node_name)
+            digest, links = parse_page(html_path, entry['sha256'] if entry else None)
+        except FileNotFoundError:
+            if node_name in page_info:
+                page_info.pop(node_name)
+                graph.pop(node_name, None)
+                pages.pop(node_name, None)
+                updated.append(node_name)
+            continue
+        except Exception as e:
+            print(f"Error processing {html_path}: {e}", file=sys.stderr)
+            continue
+        if links is None:
+            entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+            continue
+        pages[node_name] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest, 'links': links}
+        cluster_name, color = categorize_page(html_path)
+        page_info[node_name] = {
+            'cluster': cluster_name,
+            'color': color,
+            'label': os.path.basename(node_name)
+        }
+        if links:
+            graph[node_name] = resolve_links(node_name, links)
+        else:
+            graph.pop(node_name, None)
+        updated.append(node_name)
+    if changed_paths:
+        save_link_cache(pages)
+    return updated
+
+def write_dot(graph, page_info, out, intra_cluster_edges=False):
+    """Write the clean hierarchical DOT graph to a text stream in one pass; returns the edge count
+
+    Clusters, nodes and edges are always emitted in the same order, so an
+    unchanged graph produces byte-identical output. Links between pages of
+    the same cluster are only drawn (dashed) with intra_cluster_edges.
+    """
+    write = out.write
+    write('''digraph WebsiteNavigation {
     rankdir=LR;
     bgcolor="#1a1a2e";
     fontname="Arial";
@@ -222,50 +594,21 @@ def generate_dot_file(graph, page_info):
     
     // Edge styles
     edge [fontname="Arial", fontsize=7, color="#9CA3AF", penwidth=1.0, arrowsize=0.7];
-'''
+''')
 
     # Group pages by cluster
     clusters = defaultdict(list)
     for page, info in page_info.items():
         clusters[info['cluster']].append((page, info))
     
-    # Define clusters in order
-    cluster_order = [
-        'Entry',
-        'Primary Modes',
-        'Content Hubs',
-        'Utility',
-        'About',
-        'Series',
-        'Special',
-        'Blog Posts',
-        'Prototypes',
-        'Visualizations',
-        'Other'
-    ]
-    
-    cluster_colors = {
-        'Entry': '#FFD700',
-        'Primary Modes': '#8B5CF6',
-        'Content Hubs': '#A78BFA',
-        'Utility': '#6B7280',
-        'About': '#F472B6',
-        'Series': '#FB923C',
-        'Special': '#C084FC',
-        'Blog Posts': '#F9A8D4',
-        'Prototypes': '#818CF8',
-        'Visualizations': '#38BDF8',
-        'Other': '#E5E7EB'
-    }
-    
     # Generate clusters
-    for cluster_name in cluster_order:
+    for cluster_name in CLUSTER_ORDER:
         if cluster_name in clusters:
             pages = clusters[cluster_name]
             if len(pages) > 0:
-                cluster_color = cluster_colors.get(cluster_name, '#4c1d95')
+                cluster_color = CLUSTER_COLORS.get(cluster_name, '#4c1d95')
                 
-                dot_content += f'''
+                write(f'''
     subgraph cluster_{cluster_name.replace(" ", "_")} {{
         style=filled;
         color="{cluster_color}";
@@ -276,15 +619,15 @@ def generate_dot_file(graph, page_info):
         fontcolor="white";
         label="{cluster_name}";
         rank=same;
-'''
+''')
                 
                 # Add nodes
-                for page, info in sorted(pages):
+                for page, info in sorted(pages, key=lambda item: item[0]):
                     label = info['label']
                     color = info['color']
-                    dot_content += f'        "{page}" [label="{label}", fillcolor="{color}"];\n'
+                    write(f'        "{page}" [label="{label}", fillcolor="{color}"];\n')
                 
-                dot_content += '    }\n'
+                write('    }\n')
 
     # Add edges
     edge_count = 0
@@ -319,37 +662,487 @@ def generate_dot_file(graph, page_info):
                     color = '#9CA3AF'
                     penwidth = '1.0'
                 
-                if source_cluster != target_cluster:
+                if intra_cluster_edges or source_cluster != target_cluster:
                     edge_count += 1
                     if style == 'dashed':
-                        dot_content += f'    "{source}" -> "{target}" [style={style}, color="{color}", penwidth={penwidth}];\n'
+                        write(f'    "{source}" -> "{target}" [style={style}, color="{color}", penwidth={penwidth}];\n')
                     else:
-                        dot_content += f'    "{source}" -> "{target}" [color="{color}", penwidth={penwidth}];\n'
+                        write(f'    "{source}" -> "{target}" [color="{color}", penwidth={penwidth}];\n')
+
+    write('}\n')
+
+    return edge_count
+
+def generate_dot_file(graph, page_info):
+    """(DOT text, edge count) for the graph"""
+    out = io.StringIO()
+    edge_count = write_dot(graph, page_info, out)
+    return out.getvalue(), edge_count
+
+def load_graph_json():
+    """The current navigation-graph.json, or an empty graph"""
+    try:
+        with open(JSON_OUTPUT, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {'metadata': {}, 'nodes': [], 'edges': []}
+    return data
+
+def generate_graph_json(graph, page_info, previous):
+    """navigation-graph.json contents: the previous file plus what the scan discovered
+
+    The file is curated by hand and much of the site's navigation is
+    JS-driven, which the href scan can't see, so curated nodes, edges and
+    metadata are never changed or removed. The scan only adds entries,
+    marked "discovered": pages reachable through links from pages already
+    in the file (so unlinked scratch pages stay out), and links between
+    nodes that the file doesn't have yet. Discovered entries are re-derived
+    on every run, so they go away again when their page or link does.
+    """
+    curated_nodes = [node for node in previous.get('nodes', []) if not node.get('discovered')]
+    curated_edges = [edge for edge in previous.get('edges', []) if not edge.get('discovered')]
+    node_ids = {node['id'] for node in curated_nodes}
+
+    # Pages reachable from the curated nodes through scanned links
+    discovered_pages = []
+    frontier = [page for page in sorted(node_ids) if page in graph]
+    while frontier:
+        found = sorted({target for source in frontier for target in graph.get(source, ())
+                        if target in page_info and target not in node_ids})
+        node_ids.update(found)
+        discovered_pages += found
+        frontier = found
+
+    nodes = list(curated_nodes)
+    for node_id in discovered_pages:
+        info = page_info[node_id]
+        node_type, level = NODE_TYPES.get(info['cluster'], ('content', 3))
+        nodes.append({
+            'id': node_id,
+            'label': info['label'],
+            'type': node_type,
+            'category': info['cluster'],
+            'level': level,
+            'description': '',
+            'color': info['color'],
+            'url': node_id,
+            'discovered': True
+        })
+
+    edges = list(curated_edges)
+    known_edges = {(edge['source'], edge['target']) for edge in curated_edges}
+    for source in sorted(graph):
+        if source not in node_ids:
+            continue
+        for target in sorted(graph[source]):
+            if target == source or target not in node_ids or (source, target) in known_edges:
+                continue
+            primary = page_info[source]['cluster'] in ('Entry', 'Primary Modes')
+            edges.append({
+                'source': source,
+                'target': target,
+                'label': 'Link',
+                'type': 'primary' if primary else 'secondary',
+                'weight': 2 if primary else 1,
+                'color': page_info[source]['color'],
+                'discovered': True
+            })
+
+    return {'metadata': previous.get('metadata', {}), 'nodes': nodes, 'edges': edges}
+
+def write_if_changed(path, text):
+    """Atomically write `text` unless the file already holds exactly that; returns whether it was written"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    atomic_write_text(path, text)
+    return True
+
+def copy_atomic(source, destination):
+    """Copy a file into place via a temp file + rename"""
+    with open(source, 'rb') as f:
+        atomic_write(destination, lambda out: shutil.copyfileobj(f, out), binary=True)
+
+def load_render_state():
+    """{output path relative to BASE_DIR: render key of the image currently there}"""
+    try:
+        with open(RENDER_STATE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def prune_render_cache(keep):
+    """Drop cached renders beyond the RENDER_CACHE_SIZE most recently used (except those in `keep`)"""
+    cached = [entry for entry in os.scandir(RENDER_CACHE)
+              if entry.name != os.path.basename(RENDER_STATE) and not entry.name.endswith('.tmp')]
+    cached.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in cached[RENDER_CACHE_SIZE:]:
+        if entry.name not in keep:
+            os.unlink(entry.path)
+
+def cluster_dot(cluster_name, graph, page_info):
+    """DOT for one cluster: its pages, the pages they link with, and all of those links"""
+    members = {page for page, info in page_info.items() if info['cluster'] == cluster_name}
+    sub_graph = defaultdict(set)
+    for source, targets in graph.items():
+        for target in targets:
+            if target in page_info and (source in members or target in members):
+                sub_graph[source].add(target)
+    shown = members | set(sub_graph) | {target for targets in sub_graph.values() for target in targets}
+    out = io.StringIO()
+    write_dot(sub_graph, {page: page_info[page] for page in shown}, out, intra_cluster_edges=True)
+    return out.getvalue()
+
+def render_jobs(dot_content, graph, page_info):
+    """(label, DOT text, Graphviz options, output path) for every image to render"""
+    jobs = [(fmt.upper(), dot_content, options, output) for fmt, (output, options) in RENDER_FORMATS.items()]
+    os.makedirs(CLUSTER_OUTPUT_DIR, exist_ok=True)
+    expected = set()
+    clusters = {info['cluster'] for info in page_info.values()}
+    for cluster_name in CLUSTER_ORDER:
+        if cluster_name in clusters:
+            output = os.path.join(CLUSTER_OUTPUT_DIR, cluster_name.lower().replace(' ', '-') + '.png')
+            expected.add(output)
+            jobs.append((f'{cluster_name} PNG', cluster_dot(cluster_name, graph, page_info),
+                         CLUSTER_RENDER_OPTIONS, output))
+    # Clusters that no longer have any pages
+    for entry in os.scandir(CLUSTER_OUTPUT_DIR):
+        if entry.name.endswith('.png') and entry.path not in expected:
+            os.unlink(entry.path)
+    return jobs
+
+def run_dot(dot_content, options, output):
+    """Run Graphviz on DOT text; returns (error or None, seconds taken)"""
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(['dot', *options, '-o', output], input=dot_content, text=True,
+                                capture_output=True, timeout=RENDER_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return f"timed out after {RENDER_TIMEOUT}s", time.perf_counter() - start
+    except OSError as e:
+        return str(e), time.perf_counter() - start
+    if result.returncode != 0 or not os.path.exists(output):
+        return (result.stderr.strip() or f"dot exited with status {result.returncode}"), time.perf_counter() - start
+    return None, time.perf_counter() - start
+
+def render_images(jobs, workers=None):
+    """Render images with Graphviz, one `dot` process per image run concurrently
+
+    Each image is keyed by the sha256 of its DOT and options. An image
+    already rendered from the same key is left alone, and a key seen before
+    (an edit that was undone) is served from the render cache instead of
+    running Graphviz again. Returns the number of images that failed to render.
+    """
+    os.makedirs(RENDER_CACHE, exist_ok=True)
+    state = load_render_state()
+    unchanged = failed = 0
+    keep = set()
+    pending = []
+    for label, dot_content, options, output in jobs:
+        key = hashlib.sha256('\0'.join([*options, dot_content]).encode('utf-8')).hexdigest()
+        name = get_relative_path(output, BASE_DIR)
+        cached = os.path.join(RENDER_CACHE, key + os.path.splitext(output)[1])
+        keep.add(os.path.basename(cached))
+        if state.get(name) == key and os.path.exists(output):
+            unchanged += 1
+        elif os.path.exists(cached):
+            os.utime(cached)
+            copy_atomic(cached, output)
+            state[name] = key
+            print(f"✓ {label} image: {output} (from render cache)")
+        else:
+            pending.append((label, dot_content, options, output, name, key, cached))
+
+    if pending:
+        workers = min(len(pending), workers or os.cpu_count() or 1)
+        start = time.perf_counter()
+        render_seconds = 0.0
+        rendered = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_dot, dot_content, options, f'{cached}.tmp'): (label, output, name, key, cached)
+                       for label, dot_content, options, output, name, key, cached in pending}
+            for future in as_completed(futures):
+                label, output, name, key, cached = futures[future]
+                error, seconds = future.result()
+                render_seconds += seconds
+                if error:
+                    failed += 1
+                    Path(f'{cached}.tmp').unlink(missing_ok=True)
+                    print(f"Error generating {label} ({seconds:.2f}s): {error}", file=sys.stderr)
+                    continue
+                os.replace(f'{cached}.tmp', cached)
+                copy_atomic(cached, output)
+                state[name] = key
+                rendered += 1
+                print(f"✓ {label} image: {output} (rendered in {seconds:.2f}s)")
+        if rendered:
+            print(f"✓ Rendered {rendered} images in {time.perf_counter() - start:.2f}s "
+                  f"({render_seconds:.2f}s of Graphviz time across {workers} workers)")
+        if failed:
+            print(f"❌ {failed} of {len(pending)} images failed to render", file=sys.stderr)
+    if unchanged:
+        print(f"✓ {unchanged} images unchanged")
+    atomic_write_json(RENDER_STATE, state)
+    prune_render_cache(keep)
+    return failed
+
+def write_outputs(graph, page_info, workers=None, graph_json=False):
+    """Regenerate the DOT file and the images (and navigation-graph.json with graph_json) from the graph
+
+    Outputs whose content is unchanged are not rewritten, and images are
+    only rendered when their DOT changed. Returns the number of failed renders.
+    """
+    dot_content, edge_count = generate_dot_file(graph, page_info)
+    dot_written = write_if_changed(DOT_OUTPUT, dot_content)
+
+    print(f"✓ Extracted {len(page_info)} pages with {edge_count} links")
+    print(f"✓ Organized into clusters")
+    print(f"✓ DOT file: {DOT_OUTPUT}{'' if dot_written else ' (unchanged)'}")
+    if graph_json:
+        previous = load_graph_json()
+        merged = generate_graph_json(graph, page_info, previous)
+        discovered = sum(1 for entry in merged['nodes'] + merged['edges'] if entry.get('discovered'))
+        if merged != previous:
+            atomic_write_json(JSON_OUTPUT, merged, trailing_newline=True, indent=2, ensure_ascii=False)
+        print(f"✓ JSON graph: {JSON_OUTPUT} ({len(merged['nodes'])} nodes, {len(merged['edges'])} edges, "
+              f"{discovered} discovered)")
+    return render_images(render_jobs(dot_content, graph, page_info), workers)
+
+class PollingWatcher:
+    """Finds changed pages by comparing (mtime, size) of every page each `interval` seconds"""
+
+    kind = 'polling'
+
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for html_path, _ in find_html_files():
+            try:
+                stat = os.stat(html_path)
+            except OSError:
+                continue
+            snapshot[html_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout=None):
+        """Changed page paths, waiting up to `timeout` seconds (forever if None) for the first one"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(path) != self._snapshot.get(path)}
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is None:
+                time.sleep(self.interval)
+            elif time.monotonic() >= deadline:
+                return set()
+            else:
+                time.sleep(min(self.interval, max(0, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """Linux inotify watches (through libc, no extra dependency) on every directory find_html_files walks"""
+
+    kind = 'inotify'
+    EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._dirs = {}  # watch descriptor -> directory
+        for root, dirs, _ in os.walk(BASE_DIR):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            self._add_watch(root)
+
+    def _add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), INOTIFY_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+        self._dirs[wd] = directory
+
+    def _new_directory(self, directory):
+        """Watch a directory created after startup; pages already in it count as changed"""
+        changed = set()
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            self._add_watch(root)
+            changed.update(os.path.join(root, file) for file in files if file.endswith('.html'))
+        return changed
+
+    def poll(self, timeout=None):
+        """Changed page paths, waiting up to `timeout` seconds (forever if None) for the first one
+
+        The set contains RESCAN when the kernel queue overflowed and events were lost.
+        """
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return set()
+        changed = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, name_length = self.EVENT.unpack_from(buffer, offset)
+                name = buffer[offset + self.EVENT.size:offset + self.EVENT.size + name_length].rstrip(b'\0')
+                offset += self.EVENT.size + name_length
+                if mask & IN_Q_OVERFLOW:
+                    changed.add(RESCAN)
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO) and os.path.basename(path) not in SKIP_DIRS:
+                        changed |= self._new_directory(path)
+                    elif mask & IN_MOVED_FROM:
+                        changed.add(RESCAN)  # every page under it left the graph
+                elif path.endswith('.html'):
+                    changed.add(path)
+
+    def close(self):
+        os.close(self._fd)
+
+def open_watcher(polling=False):
+    """An inotify watcher where the platform has one, otherwise a polling watcher"""
+    if not polling:
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError, TypeError) as e:
+            print(f"⚠️  inotify unavailable ({e}), polling every {POLL_INTERVAL}s instead")
+    return PollingWatcher()
+
+def wait_for_changes(watcher):
+    """Block until pages change, then keep collecting until they've been quiet for DEBOUNCE seconds"""
+    changed = watcher.poll()
+    deadline = time.monotonic() + MAX_DEBOUNCE
+    while time.monotonic() < deadline:
+        more = watcher.poll(DEBOUNCE)
+        if not more:
+            break
+        changed |= more
+    return changed
 
-    dot_content += '}\n'
+def watch(jobs=None, polling=False, graph_json=False):
+    """Keep the graph outputs up to date as pages are edited, until Ctrl+C"""
+    graph, page_info = build_navigation_graph(jobs)
+    write_outputs(graph, page_info, jobs, graph_json=graph_json)
+    pages = load_link_cache()
+    watcher = open_watcher(polling)
+    print(f"👀 Watching {len(page_info)} pages ({watcher.kind}); Ctrl+C to stop")
+    try:
+        while True:
+            changed = wait_for_changes(watcher)
+            if RESCAN in changed:
+                changed.discard(RESCAN)
+                changed |= {os.path.join(BASE_DIR, node_name) for node_name in page_info}
+                changed |= {html_path for html_path, _ in find_html_files()}
+            start = time.perf_counter()
+            updated = update_pages(graph, page_info, pages, changed)
+            if not updated:
+                continue
+            print(f"\n🔄 {len(updated)} page(s) changed: {', '.join(updated[:5])}"
+                  f"{' …' if len(updated) > 5 else ''}")
+            write_outputs(graph, page_info, jobs, graph_json=graph_json)
+            print(f"✓ Updated in {time.perf_counter() - start:.2f}s")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+def benchmark(rounds=5):
+    """Time and compare the streaming extractor with the old regex over every HTML file in the site"""
+    corpus = []
+    for root, dirs, files in os.walk(BASE_DIR):
+        dirs[:] = [d for d in dirs if d not in ('node_modules', '.git', '.cache')]
+        corpus += [os.path.join(root, file) for file in files if file.endswith('.html')]
+    corpus.sort(key=os.path.getsize, reverse=True)
+    total_bytes = sum(os.path.getsize(path) for path in corpus)
+    print(f"Benchmarking link extraction over {len(corpus)} HTML files ({total_bytes / 1024:.0f} KB)")
+    
+    def regex_extract(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return extract_links_regex(f.read())
+    
+    extractors = [('stream', extract_links), ('regex', regex_extract)]
+    for name, extract in extractors:
+        best = float('inf')
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for path in corpus:
+                extract(path)
+            best = min(best, time.perf_counter() - start)
+        tracemalloc.start()
+        extract(corpus[0])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {name:<7} {best * 1000:7.1f} ms for the corpus | peak memory on "
+              f"{os.path.basename(corpus[0])}: {peak / 1024:6.0f} KB")
     
-    return dot_content, edge_count
+    only_stream = only_regex = 0
+    for path in corpus:
+        streamed = set(extract_links(path))
+        matched = {link.split('#', 1)[0].split('?', 1)[0] for link in regex_extract(path)} - {''}
+        only_stream += len(streamed - matched)
+        only_regex += len(matched - streamed)
+        for link in sorted(matched - streamed):
+            print(f"  regex only: {get_relative_path(path, BASE_DIR)} -> {link}")
+    print(f"  Distinct links per page found only by the tokenizer: {only_stream}, only by the regex: {only_regex}")
+
+def parse_jobs_arg(argv):
+    """Worker count from `--jobs N` / `--jobs=N` / `-j N` (None: one per CPU); exits with usage on a bad value
+
+    Same syntax as content/batch_runner.parse_jobs_arg, which can't be imported
+    here without pulling in the whole blog pipeline.
+    """
+    for i, arg in enumerate(argv):
+        if arg in ('--jobs', '-j'):
+            value = argv[i + 1] if i + 1 < len(argv) else ''
+        elif arg.startswith('--jobs='):
+            value = arg.split('=', 1)[1]
+        else:
+            continue
+        if value.isdigit() and int(value) > 0:
+            return int(value)
+        print(f"❌ --jobs needs a positive whole number, got '{value}'", file=sys.stderr)
+        print(__doc__, file=sys.stderr)
+        sys.exit(2)
+    return None
 
 def main():
     """Main execution"""
-    print("Building clean hierarchical navigation graph...")
+    if '--benchmark' in sys.argv:
+        benchmark()
+        return
     
-    graph, page_info = build_navigation_graph()
-    dot_content, edge_count = generate_dot_file(graph, page_info)
-    
-    with open(DOT_OUTPUT, 'w') as f:
-        f.write(dot_content)
-    
-    print(f"✓ Extracted {len(page_info)} pages with {edge_count} links")
-    print(f"✓ Organized into clusters")
-    print(f"✓ DOT file: {DOT_OUTPUT}")
+    jobs = parse_jobs_arg(sys.argv)
+    print("Building clean hierarchical navigation graph...")
     
-    try:
-        cmd = f'dot -Tpng -Gdpi={DPI} -Gratio=3.0 -Gbgcolor="#1a1a2e" {DOT_OUTPUT} -o {IMAGE_OUTPUT}'
-        os.system(cmd)
-        print(f"✓ PNG image: {IMAGE_OUTPUT}")
-    except Exception as e:
-        print(f"Error generating PNG: {e}", file=sys.stderr)
+    if '--watch' in sys.argv:
+        watch(jobs, polling='--poll' in sys.argv, graph_json='--json' in sys.argv)
+        return
+    graph, page_info = build_navigation_graph(jobs)
+    if write_outputs(graph, page_info, jobs, graph_json='--json' in sys.argv):
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()